@@ -5,7 +5,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['hotspot_powershell', 'hotspot_python', 'hotspot_mobile', 'error_handler'],
+    hiddenimports=['hotspot_powershell', 'hotspot_python', 'hotspot_mobile', 'hotspot_simulated', 'error_handler'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
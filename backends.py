@@ -0,0 +1,62 @@
+import importlib
+import threading
+from types import ModuleType
+
+# metodo -> (modulo, descripcion). Los modulos se importan al primer uso.
+BACKENDS = {
+    "mobile": ("hotspot_mobile", "Mobile Hotspot (Windows API)"),
+    "python": ("hotspot_python", "Python (netsh)"),
+    "powershell": ("hotspot_powershell", "PowerShell (netsh)"),
+    "simulated": ("hotspot_simulated", "Simulado (desarrollo)"),
+}
+
+ORDER = ["mobile", "python", "powershell"]
+
+# Mecanismo del sistema de cada metodo: python y powershell manejan la misma Hosted Network.
+MECHANISMS = {
+    "mobile": "tethering",
+    "python": "hostednetwork",
+    "powershell": "hostednetwork",
+    "simulated": "simulated",
+}
+
+_loaded: dict[str, ModuleType] = {}
+_lock = threading.Lock()
+
+
+def get(method: str) -> ModuleType:
+    module_name = BACKENDS.get(method, BACKENDS["mobile"])[0]
+    module = _loaded.get(module_name)
+    if module is not None:
+        return module
+    with _lock:
+        if module_name not in _loaded:
+            _loaded[module_name] = importlib.import_module(module_name)
+        return _loaded[module_name]
+
+
+def description(method: str) -> str:
+    return BACKENDS.get(method, BACKENDS["mobile"])[1]
+
+
+def fallback_order(method: str) -> list[str]:
+    if method not in BACKENDS:
+        return list(ORDER)
+    if method not in ORDER:
+        # El backend simulado nunca cae a uno real.
+        return [method]
+    start = ORDER.index(method)
+    return ORDER[start:] + ORDER[:start]
+
+
+def teardown_order(method: str) -> list[str]:
+    # Un metodo por mecanismo; el seleccionado representa al suyo.
+    chosen: dict[str, str] = {}
+    for candidate in fallback_order(method):
+        chosen.setdefault(MECHANISMS[candidate], candidate)
+    return list(chosen.values())
+
+
+def loaded() -> list[str]:
+    with _lock:
+        return [method for method, (module_name, _) in BACKENDS.items() if module_name in _loaded]
@@ -0,0 +1,555 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import backends
+import environment
+import error_handler
+import fleet
+import retry_policy
+import hotspot_fallback
+import hotspot_mobile
+import hotspot_monitor
+import hotspot_simulated
+import hotspot_clients
+import hostednetwork
+import traffic_sampler
+import transcript
+
+
+class _SlowBackend:
+    def __init__(self, create_delay: float, prepare_delay: float, succeed: bool):
+        self.create_delay = create_delay
+        self.prepare_delay = prepare_delay
+        self.succeed = succeed
+        self._prepared = None
+
+    def prepare_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        time.sleep(self.prepare_delay)
+        self._prepared = (ssid, password)
+        return True, "Preparado"
+
+    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        prepared, self._prepared = self._prepared, None
+        if prepared != (ssid, password):
+            time.sleep(self.prepare_delay)
+        time.sleep(self.create_delay)
+        if self.succeed:
+            return True, f"Hotspot '{ssid}' creado"
+        return False, "ERROR: Timeout esperando activacion del hotspot"
+
+
+def bench_hedged_fallback(primary_delay: float, prepare_delay: float, hedge_delay: float, runs: int):
+    print(f"Primario lento: {primary_delay:.2f}s, preparacion del respaldo: {prepare_delay:.2f}s")
+
+    for label, delay in [("sin hedge", None), (f"hedge {hedge_delay:.2f}s", hedge_delay)]:
+        timings = []
+        for _ in range(runs):
+            backends = [
+                ("Primario", _SlowBackend(primary_delay, 0.0, succeed=False)),
+                ("Respaldo", _SlowBackend(0.05, prepare_delay, succeed=True)),
+            ]
+            start = time.perf_counter()
+            ok, _ = hotspot_fallback.create_with_fallback(backends, "Bench", "benchpass1", hedge_delay=delay)
+            timings.append(time.perf_counter() - start)
+            assert ok
+        print(f"  {label:<14} media={sum(timings) / len(timings):.3f}s  min={min(timings):.3f}s")
+
+
+class _FlakyBackend:
+    # Falla con un error transitorio las primeras veces y luego funciona.
+    def __init__(self, failures: int, attempt_time: float):
+        self.failures = failures
+        self.attempt_time = attempt_time
+        self.resets = 0
+
+    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        time.sleep(self.attempt_time)
+        if self.failures > 0:
+            self.failures -= 1
+            return False, "The group or resource is not in the correct state to perform the requested operation."
+        return True, f"Hotspot '{ssid}' creado"
+
+    def reset_hostednetwork(self) -> tuple[bool, str]:
+        self.resets += 1
+        return True, ""
+
+
+def bench_retry(failures: int, attempt_time: float, fallback_time: float):
+    print(f"Metodo con {failures} fallos transitorios ({attempt_time:.2f}s/intento), respaldo de {fallback_time:.2f}s")
+    policy = retry_policy.RetryPolicy(max_attempts=failures + 1, base_delay=0.1, max_delay=0.5)
+
+    for label, selected in [("sin reintentos", retry_policy.NO_RETRY), ("con reintentos", policy)]:
+        primary = _FlakyBackend(failures, attempt_time)
+        backends = [("Primario", primary), ("Respaldo", _SlowBackend(fallback_time, 0.0, succeed=True))]
+        start = time.perf_counter()
+        ok, mensajes = hotspot_fallback.create_with_fallback(backends, "Bench", "benchpass1", hedge_delay=None, policy=selected)
+        elapsed = time.perf_counter() - start
+        assert ok
+        used = "primario" if len(mensajes) == 2 else "respaldo"
+        print(f"  {label:<15} {elapsed:.2f}s  metodo={used}  reinicios={primary.resets}")
+        report = [line for line in mensajes[1].split("\n") if line.startswith("Reintentos:")]
+        if report:
+            print(f"    {report[0]}")
+
+
+class _QuietBackend:
+    def __init__(self, changes: int, duration: float, with_subscription: bool):
+        self.spawns = 0
+        self.changes = changes
+        self.duration = duration
+        if with_subscription:
+            self.subscribe_state = self._subscribe_state
+
+    def poll_state(self) -> dict:
+        self.spawns += 1
+        return {"state": "On", "ssid": "Bench", "clients": 0, "max_clients": 8}
+
+    def _subscribe_state(self, emit, stop_event: threading.Event) -> bool:
+        self.spawns += 1
+        step = self.duration / (self.changes + 1)
+        clients = 0
+        emit({"state": "On", "ssid": "Bench", "clients": clients, "max_clients": 8})
+        while not stop_event.wait(step):
+            if clients < self.changes:
+                clients += 1
+                emit({"state": "On", "ssid": "Bench", "clients": clients, "max_clients": 8})
+        return True
+
+
+def bench_monitor(duration: float, min_interval: float, max_interval: float):
+    for label, with_subscription in [("sondeo adaptativo", False), ("suscripcion", True)]:
+        backend = _QuietBackend(changes=3, duration=duration, with_subscription=with_subscription)
+        updates: list[dict] = []
+        monitor = hotspot_monitor.HotspotMonitor.for_backend(
+            backend, updates.append, min_interval=min_interval, max_interval=max_interval
+        )
+
+        cpu_start = time.process_time()
+        monitor.start()
+        time.sleep(duration)
+        monitor.stop()
+        cpu = time.process_time() - cpu_start
+
+        fixed_polls = int(duration / min_interval)
+        print(
+            f"  {label:<18} procesos={backend.spawns:<4} (intervalo fijo: {fixed_polls})  "
+            f"actualizaciones={len(updates):<3} cpu={cpu * 1000:.1f}ms"
+        )
+
+
+def bench_clients_diff(max_clients: int, refreshes: int):
+    pool = [
+        hotspot_clients.ClientInfo(f"02:00:00:00:{i // 256:02x}:{i % 256:02x}", f"device-{i}", f"192.168.137.{i % 254 + 1}")
+        for i in range(max_clients * 2)
+    ]
+    rows: dict = {}
+    changes = 0
+
+    start = time.perf_counter()
+    for n in range(refreshes):
+        # Un cliente entra y otro sale en cada refresco.
+        offset = n % max_clients
+        clients = pool[offset:offset + max_clients]
+        added, removed, updated = hotspot_clients.diff_clients(rows, clients)
+        for mac in removed:
+            del rows[mac]
+        for client in added + updated:
+            rows[client.mac] = client
+        changes += len(added) + len(removed) + len(updated)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"  {max_clients} clientes, {refreshes} refrescos: {elapsed * 1000:.1f}ms "
+        f"({elapsed / refreshes * 1e6:.1f}us/refresco, {changes} filas modificadas)"
+    )
+
+
+def bench_sampler(samples: int, size: int):
+    clock = [0.0]
+    source = traffic_sampler.SyntheticSource(
+        {"hotspot": traffic_sampler.sine_rate(80e6), "upstream": traffic_sampler.sine_rate(200e6)},
+        clock=lambda: clock[0],
+    )
+    sampler = traffic_sampler.TrafficSampler(source, interval=1.0, size=size)
+
+    start = time.perf_counter()
+    for _ in range(samples):
+        clock[0] += 1.0
+        sampler.sample(clock[0])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"  {samples} muestras en anillo de {size}: {elapsed / samples * 1e6:.1f}us/muestra, "
+        f"actual={sampler.current_mbps('upstream'):.1f} Mbps, media10={sampler.average_mbps('upstream'):.1f} Mbps"
+    )
+
+
+def bench_startup(runs: int, exe: str, top: int):
+    # Arranque en frio completo: proceso nuevo, ventana, primera verificacion y salida.
+    command = [exe] if exe else [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")]
+    print(f"Comando: {' '.join(command)}")
+
+    reports = []
+    for _ in range(runs):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        env = dict(os.environ, MYHOTSPOT_STARTUP_PROFILE=path, MYHOTSPOT_STARTUP_EXIT="1")
+        try:
+            result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=120)
+            with open(path, encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            print(f"  Ejecucion fallida: {e}")
+            continue
+        finally:
+            os.remove(path)
+        if result.returncode != 0 or not report["marks_ms"]:
+            print(f"  Ejecucion fallida (codigo {result.returncode}): {result.stderr.strip()[-200:]}")
+            continue
+        reports.append(report)
+
+    if not reports:
+        return
+
+    for name in ("imports", "window", "first_probe"):
+        values = [report["marks_ms"][name] for report in reports if name in report["marks_ms"]]
+        if values:
+            print(f"  {name:<12} mediana={statistics.median(values):.0f}ms  min={min(values):.0f}ms")
+
+    by_module: dict[str, list[float]] = {}
+    for report in reports:
+        for item in report["imports_ms"]:
+            by_module.setdefault(item["module"], []).append(item["ms"])
+    slowest = sorted(by_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:top]
+    print(f"  Imports mas lentos (acumulado, mediana de {len(reports)} ejecuciones):")
+    for module, values in slowest:
+        print(f"    {module:<30} {statistics.median(values):.1f}ms")
+
+
+@dataclass
+class _LegacyDebugInfo:
+    # Registro anterior: texto completo del comando y marca de tiempo formateada.
+    step: str
+    command: str
+    return_code: int
+    stdout: str
+    stderr: str
+    timestamp: str
+    success: bool
+
+
+def bench_debug_log(entries: int):
+    script = hotspot_mobile.WindowsMobileHotspot()._winrt_script(
+        "$tm = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager]::CreateFromConnectionProfile($p)"
+    )
+    stdout = "SUPPORTED\nUPSTREAM|Ethernet\nSTATE|On|2|8|MyHotspot\n"
+    print(f"Script: {len(script)} bytes, {entries} entradas (cada una con cadenas nuevas, como subprocess)")
+
+    def measure(build) -> float:
+        kept = []
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(entries):
+            # Copias nuevas: subprocess devuelve un objeto distinto en cada llamada.
+            kept.append(build("OBTENER SNAPSHOT", "".join([script, ""]).encode().decode(), 0, stdout.encode().decode(), ""))
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        return total / entries
+
+    legacy = measure(lambda step, command, code, out, err: _LegacyDebugInfo(
+        step, command, code, out, err, time.strftime("%H:%M:%S.000"), code == 0
+    ))
+    compact = measure(error_handler.DebugInfo.record)
+    print(f"  Anterior: {legacy:,.0f} bytes/entrada")
+    print(f"  Compacto: {compact:,.0f} bytes/entrada ({legacy / compact:.1f}x menos)")
+    assert compact * 10 <= legacy, "La entrada compacta deberia ocupar al menos 10 veces menos"
+
+
+def bench_simulated(cycles: int, error_rate: float, seed: int):
+    # Reloj manual: las transiciones y la rotacion de clientes no esperan.
+    now = [0.0]
+    config = hotspot_simulated.SimulationConfig(start_delay=1.0, stop_delay=0.5, churn_rate=2.0, error_rate=error_rate, seed=seed)
+    sim = hotspot_simulated.SimulatedHotspot(config, clock=lambda: now[0])
+    print(f"{cycles} ciclos crear/sondear/clientes/detener, errores={error_rate:.0%}, semilla={seed}")
+
+    latencies = []
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for operation in (
+            lambda: sim.create_hotspot("Bench", "benchpass1"),
+            sim.poll_state,
+            lambda: sim.get_clients(),
+            sim.stop_hotspot,
+        ):
+            began = time.perf_counter()
+            result = operation()
+            latencies.append(time.perf_counter() - began)
+            if isinstance(result, tuple) and not result[0]:
+                failures += 1
+            now[0] += 0.75
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"  {len(latencies) / elapsed:,.0f} ops/s  p50={p50:.0f}us  p99={p99:.0f}us  fallos={failures}")
+    print(f"  Estado final: {sim.poll_state()}")
+
+
+class _FakeNetsh:
+    # Hosted Network en memoria con la salida de netsh en ingles.
+    def __init__(self, ssid: str, key: str, started: bool):
+        self.ssid = ssid
+        self.key = key
+        self.started = started
+
+    def _run_one(self, command: str) -> str:
+        if command == "netsh wlan show drivers":
+            return "Interface name: Wi-Fi\n    Hosted network supported  : Yes\n"
+        if command == "netsh wlan show hostednetwork":
+            status = "Started" if self.started else "Not started"
+            return (
+                "Hosted network settings\n    Mode                   : Allowed\n"
+                f'    SSID name              : "{self.ssid}"\n    Max number of clients  : 100\n'
+                f"Hosted network status\n    Status                 : {status}\n"
+            )
+        if command == "netsh wlan show hostednetwork setting=security":
+            return (
+                "Hosted network security settings\n"
+                f"    User security key      : {self.key}\n    User security key usage: Persistent\n"
+            )
+        if command.startswith("netsh wlan set hostednetwork mode=allow"):
+            self.ssid = command.split('ssid="', 1)[1].split('"', 1)[0]
+            self.key = command.split('key="', 1)[1].split('"', 1)[0]
+            return "The hosted network mode has been set to allow.\n"
+        if command == "netsh wlan start hostednetwork":
+            self.started = True
+            return "The hosted network started.\n"
+        if command == "netsh wlan stop hostednetwork":
+            self.started = False
+            return "The hosted network stopped.\n"
+        raise ValueError(f"comando no simulado: {command}")
+
+    def execute(self, kind: str, command: str) -> subprocess.CompletedProcess:
+        output = "".join(self._run_one(part.strip()) for part in command.split(" & "))
+        return subprocess.CompletedProcess(command, 0, output, "")
+
+
+def check_replay_plans() -> bool:
+    # Graba crear con netsh simulado y lo reproduce: la ruta (sin cambios, solo iniciar,
+    # reconfigurar) y el resultado deben coincidir sin comandos no grabados.
+    import hotspot_python
+
+    workdir = tempfile.mkdtemp(prefix="myhotspot_replay_")
+    os.environ["MYHOTSPOT_STATE_FILE"] = os.path.join(workdir, "state.jsonl")
+    scenarios = [
+        (hostednetwork.PLAN_NOOP, _FakeNetsh("Bench", "benchpass1", True)),
+        (hostednetwork.PLAN_START, _FakeNetsh("Bench", "benchpass1", False)),
+        (hostednetwork.PLAN_RECONFIGURE, _FakeNetsh("Bench", "otraclave1", True)),
+    ]
+    print("Grabar y reproducir 'crear' (python, netsh simulado):")
+    all_ok = True
+    for plan, netsh in scenarios:
+        path = os.path.join(workdir, f"{plan}.jsonl")
+        environment.set_override(environment.EnvironmentInfo(True, True, "Windows 10", 19045, True, "5.1", ("Wi-Fi",)))
+        transcript.start_recording(path, netsh.execute)
+        live = hotspot_python.create_hotspot("Bench", "benchpass1")
+        player = transcript.start_replay(path)
+        replayed = hotspot_python.create_hotspot("Bench", "benchpass1")
+        transcript.stop()
+        environment.set_override(None)
+
+        expected = f"Ruta: {hostednetwork.PLAN_DESCRIPTIONS[plan]}"
+        ok = live == replayed and live[0] and expected in live[1] and player.misses == 0
+        all_ok = all_ok and ok
+        print(f"  {plan:<12} {'OK' if ok else 'DISTINTO'}  (no grabados: {player.misses})")
+        if not ok:
+            print(f"    en vivo:     {live[1].splitlines()[0] if live[1] else ''}")
+            print(f"    reproducido: {replayed[1].splitlines()[0] if replayed[1] else ''}")
+    return all_ok
+
+
+def bench_replay(path: str, method: str, runs: int, speed: float):
+    # Mismo codigo de parseo y formato de errores, con las respuestas grabadas.
+    player = transcript.start_replay(path, speed)
+    module = backends.get(method)
+    operations = [
+        ("check_support", module.check_support),
+        ("get_status", module.get_status),
+        ("poll_state", module.poll_state),
+        ("get_clients", lambda: module.get_clients(force=True)),
+    ]
+    print(f"Reproduciendo {path} con el metodo {method}, {runs} vueltas, velocidad={speed:g}")
+
+    timings: dict[str, list[float]] = {name: [] for name, _ in operations}
+    for _ in range(runs):
+        player.rewind()
+        for name, operation in operations:
+            start = time.perf_counter()
+            operation()
+            timings[name].append(time.perf_counter() - start)
+    transcript.stop()
+
+    for name, values in timings.items():
+        print(f"  {name:<14} media {statistics.mean(values) * 1000:.3f} ms  max {max(values) * 1000:.3f} ms")
+    print(f"  Respuestas servidas: {player.served}, comandos no grabados: {player.misses}")
+
+
+def bench_fleet(agents: int, parallel: int, latency: float):
+    # Agentes locales con el backend simulado, cada uno en su propio proceso.
+    secret = "bench-" + os.urandom(16).hex()
+    env = dict(os.environ, MYHOTSPOT_FLEET_SECRET=secret, MYHOTSPOT_LOG="0", MYHOTSPOT_SIM_LATENCY=str(latency))
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fleet.py")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, script, "agent", "--bind", "127.0.0.1", "--port", "0", "--method", "simulated"],
+            env=env, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(agents)
+    ]
+    try:
+        hosts = [f"127.0.0.1:{process.stdout.readline().split()[1]}" for process in processes]
+        print(f"{agents} agentes locales, latencia simulada {latency * 1000:.0f} ms por comando")
+        for label, workers in [("secuencial", 1), (f"paralelo x{parallel}", parallel)]:
+            controller = fleet.Controller(hosts, secret.encode("utf-8"), workers, deadline=30.0)
+            print(f"  {label}:")
+            for op in ("create", "status", "stop"):
+                result = controller.run(op, {"ssid": "Bench", "password": "benchpass1"})
+                print("    " + result.report().replace("\n", "\n    "))
+        wrong = fleet.Controller(hosts[:1], b"secreto-incorrecto-0000").run("status")
+        print(f"  Secreto incorrecto: {wrong.results[0].message}")
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+
+
+def bench_teardown(latency: float, active: int, runs: int):
+    # Tres mecanismos simulados con la misma latencia por comando; 'active' quedan encendidos.
+    def make_backends() -> list:
+        config = hotspot_simulated.SimulationConfig(start_delay=0.0, stop_delay=0.0, command_latency=0.0)
+        managers = [hotspot_simulated.SimulatedHotspot(config) for _ in range(3)]
+        for manager in managers[:active]:
+            manager.create_hotspot("Bench", "benchpass1")
+        config.command_latency = latency
+        return [(f"Simulado {i + 1}", manager) for i, manager in enumerate(managers)]
+
+    print(f"Detener con 3 mecanismos ({active} activos), latencia {latency * 1000:.0f} ms por comando, {runs} vueltas")
+    sequential, parallel = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        # Lo que hacia el operador: probar cada metodo hasta apagarlo todo.
+        for _, manager in make_backends():
+            manager.stop_hotspot()
+        sequential.append(time.perf_counter() - start)
+
+        metodos = make_backends()
+        start = time.perf_counter()
+        ok, _ = hotspot_fallback.stop_all(
+            [(descripcion, lambda manager=manager: manager) for descripcion, manager in metodos], retry_policy.NO_RETRY
+        )
+        parallel.append(time.perf_counter() - start)
+        assert ok and all(manager.poll_state()["state"] != "On" for _, manager in metodos)
+
+    print(f"  secuencial: mediana {statistics.median(sequential) * 1000:.0f} ms")
+    print(f"  paralelo:   mediana {statistics.median(parallel) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de MyHotspot")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    hedge = sub.add_parser("hedge", help="Fallback con preparacion en paralelo")
+    hedge.add_argument("--primary-delay", type=float, default=1.5)
+    hedge.add_argument("--prepare-delay", type=float, default=1.0)
+    hedge.add_argument("--hedge-delay", type=float, default=0.3)
+    hedge.add_argument("--runs", type=int, default=3)
+
+    monitor = sub.add_parser("monitor", help="Procesos y CPU del monitor en reposo")
+    monitor.add_argument("--duration", type=float, default=5.0)
+    monitor.add_argument("--min-interval", type=float, default=0.05)
+    monitor.add_argument("--max-interval", type=float, default=1.0)
+
+    clients = sub.add_parser("clients", help="Coste del diff incremental de clientes")
+    clients.add_argument("--max-clients", type=int, default=128)
+    clients.add_argument("--refreshes", type=int, default=10000)
+
+    sampler = sub.add_parser("sampler", help="Coste por muestra del muestreador de trafico")
+    sampler.add_argument("--samples", type=int, default=100000)
+    sampler.add_argument("--size", type=int, default=traffic_sampler.RING_SIZE)
+
+    startup = sub.add_parser("startup", help="Arranque en frio: imports, ventana y primera verificacion")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--exe", default="", help="Ejecutable a medir (por ejemplo dist/MyHotspot.exe)")
+    startup.add_argument("--top", type=int, default=10)
+
+    debuglog = sub.add_parser("debuglog", help="Memoria por entrada de DebugInfo (tracemalloc)")
+    debuglog.add_argument("--entries", type=int, default=2000)
+
+    retry = sub.add_parser("retry", help="Reintento de errores transitorios frente a cambiar de metodo")
+    retry.add_argument("--failures", type=int, default=2)
+    retry.add_argument("--attempt-time", type=float, default=0.2)
+    retry.add_argument("--fallback-time", type=float, default=3.0)
+
+    simulated = sub.add_parser("simulated", help="Operaciones por segundo del backend simulado")
+    simulated.add_argument("--cycles", type=int, default=5000)
+    simulated.add_argument("--error-rate", type=float, default=0.0)
+    simulated.add_argument("--seed", type=int, default=0)
+
+    replay = sub.add_parser("replay", help="Reproduce una transcripcion grabada sin tocar el sistema")
+    replay.add_argument("transcript", nargs="?", help="Sin transcripcion solo se comprueba grabar y reproducir")
+    replay.add_argument("--method", choices=["mobile", "python", "powershell"], default="python")
+    replay.add_argument("--runs", type=int, default=1000)
+    replay.add_argument("--speed", type=float, default=0.0, help="1 = duracion original, 0 = sin esperas")
+
+    fleet_parser = sub.add_parser("fleet", help="Controlador contra muchos agentes locales simulados")
+    fleet_parser.add_argument("--agents", type=int, default=20)
+    fleet_parser.add_argument("--parallel", type=int, default=fleet.PARALLELISM)
+    fleet_parser.add_argument("--latency", type=float, default=0.2)
+
+    teardown = sub.add_parser("teardown", help="Detener todos los metodos en paralelo frente a uno tras otro")
+    teardown.add_argument("--latency", type=float, default=0.3)
+    teardown.add_argument("--active", type=int, default=2)
+    teardown.add_argument("--runs", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.bench == "hedge":
+        bench_hedged_fallback(args.primary_delay, args.prepare_delay, args.hedge_delay, args.runs)
+    elif args.bench == "monitor":
+        bench_monitor(args.duration, args.min_interval, args.max_interval)
+    elif args.bench == "clients":
+        bench_clients_diff(args.max_clients, args.refreshes)
+    elif args.bench == "sampler":
+        bench_sampler(args.samples, args.size)
+    elif args.bench == "startup":
+        bench_startup(args.runs, args.exe, args.top)
+    elif args.bench == "debuglog":
+        bench_debug_log(args.entries)
+    elif args.bench == "retry":
+        bench_retry(args.failures, args.attempt_time, args.fallback_time)
+    elif args.bench == "simulated":
+        bench_simulated(args.cycles, args.error_rate, args.seed)
+    elif args.bench == "replay":
+        if not check_replay_plans():
+            sys.exit(1)
+        if args.transcript:
+            bench_replay(args.transcript, args.method, args.runs, args.speed)
+    elif args.bench == "fleet":
+        bench_fleet(args.agents, args.parallel, args.latency)
+    elif args.bench == "teardown":
+        bench_teardown(args.latency, args.active, args.runs)
+
+
+if __name__ == "__main__":
+    main()
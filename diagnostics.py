@@ -0,0 +1,286 @@
+import contextvars
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import environment
+import error_handler
+import hostednetwork
+import transcript
+
+OK = 0
+INFO = 1
+WARNING = 2
+ERROR = 3
+
+SEVERITY_LABELS = {OK: "OK", INFO: "INFO", WARNING: "AVISO", ERROR: "ERROR"}
+
+PROBE_TIMEOUT = 5.0
+CACHE_TTL = 10.0
+
+UPSTREAM_HOST = ("www.msftconnecttest.com", 80)
+
+
+@dataclass(frozen=True)
+class Finding:
+    probe: str
+    severity: int
+    message: str
+    remedy: str = ""
+
+
+@dataclass(frozen=True)
+class Probe:
+    name: str
+    check: Callable[[str], list[Finding]]
+    timeout: float = PROBE_TIMEOUT
+    windows_only: bool = True
+
+
+_registry: dict[str, Probe] = {}
+_cache: dict[tuple[str, str], tuple[float, list[Finding]]] = {}
+_cache_lock = threading.Lock()
+
+
+def probe(name: str, timeout: float = PROBE_TIMEOUT, windows_only: bool = True):
+    def decorator(check: Callable[[str], list[Finding]]):
+        _registry[name] = Probe(name, check, timeout, windows_only)
+        return check
+    return decorator
+
+
+def probes() -> list[Probe]:
+    return list(_registry.values())
+
+
+def run_command(cmd: str, step: str, timeout: float) -> tuple[int, str]:
+    # Cada sonda tiene su propio limite: el proceso se termina si lo supera.
+    start = time.perf_counter()
+    try:
+        result = transcript.run(transcript.KIND_COMMAND, cmd, lambda: subprocess.run(
+            cmd,
+            shell=True,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        ))
+        error_handler.DebugLogger.log(step, cmd, result.returncode, result.stdout, result.stderr, duration=time.perf_counter() - start)
+        return result.returncode, result.stdout
+    except subprocess.TimeoutExpired:
+        error_handler.DebugLogger.log(step, cmd, -1, "", f"Timeout tras {timeout:.0f}s", duration=time.perf_counter() - start)
+        return -1, ""
+    except Exception as e:
+        error_handler.DebugLogger.log(step, cmd, -1, "", str(e), duration=time.perf_counter() - start)
+        return -1, ""
+
+
+def _service_state(name: str, timeout: float) -> tuple[Optional[str], Optional[str]]:
+    # (STATE, START_TYPE) de 'sc query' + 'sc qc' en un solo proceso.
+    code, out = run_command(f"sc query {name} & sc qc {name}", f"DIAGNOSTICO SERVICIO {name}", timeout)
+    state = start_type = None
+    for line in out.split("\n"):
+        key, _, value = line.partition(":")
+        key = key.strip().upper()
+        fields = value.split()
+        if key == "STATE" and len(fields) > 1:
+            state = fields[1].upper()
+        elif key == "START_TYPE" and len(fields) > 1:
+            start_type = fields[1].upper()
+    return state, start_type
+
+
+@probe("admin", windows_only=False)
+def _probe_admin(method: str) -> list[Finding]:
+    if environment.get_environment().is_admin is False:
+        return [Finding("admin", ERROR, "No se esta ejecutando como Administrador", "Clic derecho > Ejecutar como administrador")]
+    return []
+
+
+@probe("adaptador", windows_only=False)
+def _probe_adapter(method: str) -> list[Finding]:
+    env = environment.get_environment()
+    if not env.is_windows:
+        return []
+    findings = []
+    if env.wireless_adapters is None:
+        findings.append(Finding(
+            "adaptador", WARNING, "No se pudieron enumerar los adaptadores WiFi",
+            "Comprueba que el servicio WLAN AutoConfig (WlanSvc) este iniciado"
+        ))
+    elif not env.wireless_adapters:
+        findings.append(Finding(
+            "adaptador", ERROR, "No se detecto adaptador WiFi",
+            "Revisa Administrador de dispositivos > Adaptadores de red"
+        ))
+    if method == "mobile" and not env.mobile_hotspot_available:
+        findings.append(Finding(
+            "adaptador", ERROR, f"Windows build {env.os_build} no soporta Mobile Hotspot",
+            "Usa un metodo netsh o actualiza Windows"
+        ))
+    return findings
+
+
+@probe("driver")
+def _probe_driver(method: str) -> list[Finding]:
+    timeout = _registry["driver"].timeout
+    code, out = run_command("netsh wlan show drivers", "DIAGNOSTICO DRIVER", timeout)
+    if code != 0:
+        return [Finding("driver", WARNING, "No se pudo consultar el driver WiFi")]
+    supported, adapter = hostednetwork.parse_drivers(out)
+    if supported is False:
+        # Mobile Hotspot no depende de Hosted Network.
+        severity = INFO if method == "mobile" else ERROR
+        adapter_text = f" {adapter}" if adapter else ""
+        return [Finding(
+            "driver", severity, f"El adaptador{adapter_text} no soporta Hosted Network",
+            "Usa Mobile Hotspot o un adaptador USB compatible"
+        )]
+    return []
+
+
+@probe("radio")
+def _probe_radio(method: str) -> list[Finding]:
+    code, out = run_command("netsh wlan show interfaces", "DIAGNOSTICO RADIO", _registry["radio"].timeout)
+    if code != 0:
+        return []
+    lower = out.lower()
+    if "hardware off" in lower or "software off" in lower or "apagado" in lower:
+        return [Finding("radio", ERROR, "El WiFi esta apagado", "Activa el WiFi o desactiva el modo avion")]
+    if not hostednetwork.parse_interfaces(out)["connected"]:
+        return [Finding("radio", INFO, "El WiFi no esta conectado a ninguna red")]
+    return []
+
+
+@probe("wlansvc")
+def _probe_wlan_service(method: str) -> list[Finding]:
+    state, start_type = _service_state("WlanSvc", _registry["wlansvc"].timeout)
+    if state is None:
+        return [Finding("wlansvc", WARNING, "No se pudo consultar el servicio WLAN AutoConfig")]
+    if state != "RUNNING":
+        return [Finding(
+            "wlansvc", ERROR, f"El servicio WLAN AutoConfig no esta en ejecucion ({state})",
+            "services.msc > Configuracion automatica de WLAN > Iniciar"
+        )]
+    return []
+
+
+@probe("icssvc")
+def _probe_mobile_hotspot_service(method: str) -> list[Finding]:
+    # Se inicia bajo demanda: detenido es normal, deshabilitado no.
+    state, start_type = _service_state("icssvc", _registry["icssvc"].timeout)
+    if start_type == "DISABLED":
+        severity = ERROR if method == "mobile" else INFO
+        return [Finding(
+            "icssvc", severity, "El Servicio de Zona con cobertura inalambrica movil esta deshabilitado",
+            "services.msc > Servicio de Zona con cobertura inalambrica movil > Manual"
+        )]
+    return []
+
+
+@probe("ics")
+def _probe_ics_service(method: str) -> list[Finding]:
+    state, start_type = _service_state("SharedAccess", _registry["ics"].timeout)
+    if start_type == "DISABLED":
+        return [Finding(
+            "ics", WARNING, "Conexion compartida a Internet (ICS) esta deshabilitada: los clientes no tendran internet",
+            "services.msc > Conexion compartida a Internet (ICS) > Manual"
+        )]
+    return []
+
+
+@probe("hostednetwork")
+def _probe_conflicting_hosted_network(method: str) -> list[Finding]:
+    code, out = run_command("netsh wlan show hostednetwork", "DIAGNOSTICO HOSTED NETWORK", _registry["hostednetwork"].timeout)
+    if code != 0:
+        return []
+    info = hostednetwork.parse_hostednetwork(out)
+    if method == "mobile" and info["started"]:
+        return [Finding(
+            "hostednetwork", WARNING, f"Hay una Hosted Network (netsh) activa: {info['ssid'] or 'sin nombre'}",
+            "Detenla con 'netsh wlan stop hostednetwork' antes de usar Mobile Hotspot"
+        )]
+    return []
+
+
+@probe("internet", timeout=4.0, windows_only=False)
+def _probe_upstream(method: str) -> list[Finding]:
+    try:
+        with socket.create_connection(UPSTREAM_HOST, timeout=_registry["internet"].timeout - 0.5):
+            return []
+    except OSError:
+        return [Finding(
+            "internet", WARNING, "Sin conexion a Internet: el hotspot funcionara pero sin salida",
+            "Conecta el equipo a Internet por cable, WiFi o datos moviles"
+        )]
+
+
+def _run_probe(item: Probe, method: str) -> list[Finding]:
+    try:
+        return item.check(method)
+    except Exception as e:
+        return [Finding(item.name, WARNING, f"La comprobacion fallo: {e}")]
+
+
+def run_all(method: str = "", names: Optional[list[str]] = None, refresh: bool = False) -> list[Finding]:
+    selected = [item for item in probes() if names is None or item.name in names]
+    if not environment.get_environment().is_windows:
+        selected = [item for item in selected if not item.windows_only]
+
+    findings: list[Finding] = []
+    pending: dict = {}
+    now = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, len(selected)), thread_name_prefix="myhotspot-diag")
+    try:
+        for item in selected:
+            with _cache_lock:
+                cached = _cache.get((item.name, method))
+            if cached is not None and not refresh and now - cached[0] < CACHE_TTL:
+                findings.extend(cached[1])
+                continue
+            # Cada sonda en su hilo, registrando en la operacion del llamador.
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, _run_probe, item, method)] = item
+
+        # El tiempo total es el de la sonda mas lenta, no la suma.
+        deadline = time.monotonic() + max((item.timeout for item in pending.values()), default=0.0) + 0.5
+        done, _ = wait(pending, timeout=max(0.0, deadline - time.monotonic()))
+        for future, item in pending.items():
+            if future in done:
+                result = future.result()
+                with _cache_lock:
+                    _cache[(item.name, method)] = (time.monotonic(), result)
+                findings.extend(result)
+            else:
+                findings.append(Finding(item.name, WARNING, f"La comprobacion '{item.name}' no respondio en {item.timeout:g}s"))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    findings.sort(key=lambda finding: finding.severity, reverse=True)
+    return findings
+
+
+def format_findings(findings: list[Finding], min_severity: int = WARNING) -> str:
+    relevant = [finding for finding in findings if finding.severity >= min_severity]
+    if not relevant:
+        return ""
+    lines = ["Problemas detectados:"]
+    for finding in relevant:
+        lines.append(f"- [{SEVERITY_LABELS[finding.severity]}] {finding.message}")
+        if finding.remedy:
+            lines.append(f"    Solucion: {finding.remedy}")
+    notes = [finding for finding in findings if finding.severity < min_severity]
+    if notes:
+        lines.append("")
+        lines.append("Notas:")
+        for finding in notes:
+            lines.append(f"- {finding.message}")
+    return "\n".join(lines)
+
+
+def diagnose(method: str = "", refresh: bool = False) -> str:
+    return format_findings(run_all(method, refresh=refresh))
@@ -0,0 +1,188 @@
+import ctypes
+import os
+import platform
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+# Windows 10 1607: primera version con NetworkOperatorTetheringManager.
+MOBILE_HOTSPOT_MIN_BUILD = 14393
+
+_POWERSHELL_KEYS = [
+    r"SOFTWARE\Microsoft\PowerShell\3\PowerShellEngine",
+    r"SOFTWARE\Microsoft\PowerShell\1\PowerShellEngine",
+]
+
+
+@dataclass(frozen=True)
+class EnvironmentInfo:
+    is_windows: bool
+    is_admin: Optional[bool]
+    os_version: str
+    os_build: int
+    mobile_hotspot_available: bool
+    powershell_version: str
+    # None = no se pudieron enumerar (WlanSvc detenido, wlanapi ausente...).
+    wireless_adapters: Optional[tuple[str, ...]]
+
+    def describe(self) -> str:
+        if self.is_admin is None:
+            admin = "desconocido"
+        else:
+            admin = "si" if self.is_admin else "no"
+        if self.wireless_adapters is None:
+            adapters = "no se pudieron consultar"
+        else:
+            adapters = ", ".join(self.wireless_adapters) if self.wireless_adapters else "ninguno detectado"
+        return "\n".join([
+            "Entorno:",
+            f"  Sistema: {self.os_version} (build {self.os_build})",
+            f"  Administrador: {admin}",
+            f"  Mobile Hotspot disponible: {'si' if self.mobile_hotspot_available else 'no'}",
+            f"  PowerShell: {self.powershell_version or 'no detectado'}",
+            f"  Adaptadores WiFi: {adapters}",
+        ])
+
+    def available(self, mechanism: str) -> Optional[bool]:
+        # None = solo se sabe consultando al propio mecanismo (soporte del controlador).
+        if not self.is_windows:
+            return False
+        if mechanism == "tethering":
+            return self.mobile_hotspot_available
+        if mechanism == "hostednetwork" and self.wireless_adapters == ():
+            return False
+        return None
+
+
+def _detect_admin() -> Optional[bool]:
+    try:
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except:
+        return None
+
+
+def _detect_os() -> tuple[str, int]:
+    if sys.platform == "win32":
+        build = sys.getwindowsversion().build
+        return f"Windows {platform.release()} {platform.version()}", build
+    return platform.platform(), 0
+
+
+def _detect_powershell_version() -> str:
+    # Registro en lugar de lanzar powershell.exe.
+    try:
+        import winreg
+    except ImportError:
+        return ""
+    for key_path in _POWERSHELL_KEYS:
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                return str(winreg.QueryValueEx(key, "PowerShellVersion")[0])
+        except OSError:
+            continue
+    return ""
+
+
+class _GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", ctypes.c_uint32),
+        ("Data2", ctypes.c_uint16),
+        ("Data3", ctypes.c_uint16),
+        ("Data4", ctypes.c_ubyte * 8),
+    ]
+
+
+class _WLAN_INTERFACE_INFO(ctypes.Structure):
+    _fields_ = [
+        ("InterfaceGuid", _GUID),
+        ("strInterfaceDescription", ctypes.c_wchar * 256),
+        ("isState", ctypes.c_uint32),
+    ]
+
+
+def _wlan_adapters() -> Optional[tuple[str, ...]]:
+    # WlanEnumInterfaces: en proceso, sin 'netsh wlan show interfaces'.
+    wlanapi = ctypes.windll.wlanapi
+    handle = ctypes.c_void_p()
+    negotiated = ctypes.c_uint32()
+    if wlanapi.WlanOpenHandle(2, None, ctypes.byref(negotiated), ctypes.byref(handle)) != 0:
+        return None
+
+    interfaces = ctypes.c_void_p()
+    try:
+        if wlanapi.WlanEnumInterfaces(handle, None, ctypes.byref(interfaces)) != 0:
+            return None
+        count = ctypes.c_uint32.from_address(interfaces.value).value
+        # WLAN_INTERFACE_INFO_LIST: dwNumberOfItems, dwIndex, InterfaceInfo[]
+        offset = interfaces.value + 2 * ctypes.sizeof(ctypes.c_uint32)
+        return tuple(
+            _WLAN_INTERFACE_INFO.from_address(offset + i * ctypes.sizeof(_WLAN_INTERFACE_INFO)).strInterfaceDescription
+            for i in range(count)
+        )
+    finally:
+        if interfaces.value:
+            wlanapi.WlanFreeMemory(interfaces)
+        wlanapi.WlanCloseHandle(handle, None)
+
+
+def _sysfs_adapters() -> Optional[tuple[str, ...]]:
+    try:
+        names = os.listdir("/sys/class/net")
+    except OSError:
+        return None
+    return tuple(sorted(name for name in names if os.path.isdir(os.path.join("/sys/class/net", name, "wireless"))))
+
+
+def _detect_wireless_adapters() -> Optional[tuple[str, ...]]:
+    # Un fallo al enumerar no es "sin adaptadores": netsh o WinRT daran el error real.
+    try:
+        if sys.platform == "win32":
+            return _wlan_adapters()
+        return _sysfs_adapters()
+    except Exception:
+        return None
+
+
+def detect() -> EnvironmentInfo:
+    is_windows = sys.platform == "win32"
+    os_version, os_build = _detect_os()
+    return EnvironmentInfo(
+        is_windows=is_windows,
+        is_admin=_detect_admin(),
+        os_version=os_version,
+        os_build=os_build,
+        mobile_hotspot_available=is_windows and os_build >= MOBILE_HOTSPOT_MIN_BUILD,
+        powershell_version=_detect_powershell_version(),
+        wireless_adapters=_detect_wireless_adapters(),
+    )
+
+
+_environment: Optional[EnvironmentInfo] = None
+_override: Optional[EnvironmentInfo] = None
+_environment_lock = threading.Lock()
+
+
+def get_environment(refresh: bool = False) -> EnvironmentInfo:
+    global _environment
+    with _environment_lock:
+        if _override is not None:
+            return _override
+        if _environment is None or refresh:
+            _environment = detect()
+        return _environment
+
+
+def set_override(info: Optional[EnvironmentInfo]):
+    # Fija el entorno (por ejemplo el de una transcripcion grabada en otro equipo).
+    global _override
+    with _environment_lock:
+        _override = info
+
+
+def is_admin() -> bool:
+    return bool(get_environment().is_admin)
+
+
+def available(mechanism: str) -> Optional[bool]:
+    return get_environment().available(mechanism)
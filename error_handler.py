@@ -1,18 +1,139 @@
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Optional, List
-import subprocess
-import ctypes
+from typing import Callable, Optional, List
+import functools
+import hashlib
+import os
+import sys
 import datetime
+import tempfile
+import threading
+import time
+import environment
 
-@dataclass
+# Salidas mas largas se recortan en memoria y se guardan completas en disco (0 = sin limite).
+OUTPUT_LIMIT = int(os.environ.get("MYHOTSPOT_LOG_OUTPUT_LIMIT", "8192"))
+SPILL_DIR = os.path.join(tempfile.gettempdir(), "myhotspot", "output")
+# Archivos de salida que se conservan; los mas antiguos se borran.
+SPILL_KEEP = int(os.environ.get("MYHOTSPOT_SPILL_KEEP", "50"))
+
+# Los scripts (p. ej. el envoltorio WinRT completo) se guardan una sola vez, por hash.
+# Solo los mas recientes: contienen contrasenas y no deben acumularse.
+SCRIPT_CACHE_SIZE = 128
+_scripts: "OrderedDict[str, str]" = OrderedDict()
+_script_ids: "OrderedDict[str, str]" = OrderedDict()
+_scripts_lock = threading.Lock()
+
+_MONOTONIC_ANCHOR = time.monotonic()
+_WALL_ANCHOR = time.time()
+
+
+def _content_id(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()[:16]
+
+
+def intern_script(command: str) -> str:
+    with _scripts_lock:
+        script_id = _script_ids.get(command)
+        if script_id is not None:
+            _script_ids.move_to_end(command)
+            _scripts.move_to_end(script_id)
+            return script_id
+    script_id = sys.intern(_content_id(command))
+    with _scripts_lock:
+        _scripts.setdefault(script_id, command)
+        _script_ids.setdefault(command, script_id)
+        while len(_scripts) > SCRIPT_CACHE_SIZE:
+            _, evicted = _scripts.popitem(last=False)
+            _script_ids.pop(evicted, None)
+    return script_id
+
+
+def script_body(script_id: str) -> str:
+    with _scripts_lock:
+        return _scripts.get(script_id, "(script ya descartado)")
+
+
+def _prune_spill():
+    try:
+        entries = [os.path.join(SPILL_DIR, name) for name in os.listdir(SPILL_DIR)]
+    except OSError:
+        return
+    files = sorted((path for path in entries if os.path.isfile(path)), key=os.path.getmtime)
+    for path in files[:max(0, len(files) - SPILL_KEEP)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _compact_output(text: str) -> tuple[str, Optional[str]]:
+    if not text:
+        return "", None
+    if OUTPUT_LIMIT <= 0 or len(text) <= OUTPUT_LIMIT // 4:
+        return sys.intern(text), None
+    data = text.encode("utf-8", "replace")
+    if len(data) <= OUTPUT_LIMIT:
+        return sys.intern(text), None
+    
+    path = os.path.join(SPILL_DIR, f"{_content_id(text)}.txt")
+    try:
+        if not os.path.exists(path):
+            os.makedirs(SPILL_DIR, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            _prune_spill()
+    except OSError:
+        path = None
+    head = data[:OUTPUT_LIMIT].decode("utf-8", "ignore")
+    where = f" en {path}" if path else ""
+    return f"{head}\n... [{len(data) - OUTPUT_LIMIT} bytes mas{where}]", path
+
+
+@dataclass(slots=True)
 class DebugInfo:
     step: str
-    command: str
+    script_id: str
     return_code: int
     stdout: str
     stderr: str
-    timestamp: str
-    success: bool
+    created: float
+    spill_paths: Optional[tuple[str, ...]] = None
+    method: str = ""
+    operation: str = ""
+    # Segundos que tardo el comando (0 si no se midio).
+    duration: float = 0.0
+    
+    @classmethod
+    def record(
+        cls, step: str, command: str, return_code: int, stdout: str, stderr: str,
+        method: str = "", operation: str = "", duration: float = 0.0
+    ) -> "DebugInfo":
+        stdout, stdout_path = _compact_output(stdout)
+        stderr, stderr_path = _compact_output(stderr)
+        spill_paths = tuple(path for path in (stdout_path, stderr_path) if path) or None
+        return cls(
+            sys.intern(step), intern_script(command), return_code, stdout, stderr,
+            time.monotonic(), spill_paths, sys.intern(method), sys.intern(operation), duration
+        )
+    
+    @property
+    def command(self) -> str:
+        return script_body(self.script_id)
+    
+    @property
+    def success(self) -> bool:
+        return self.return_code == 0
+    
+    @property
+    def wall_time(self) -> float:
+        return _WALL_ANCHOR + (self.created - _MONOTONIC_ANCHOR)
+    
+    @property
+    def timestamp(self) -> str:
+        return datetime.datetime.fromtimestamp(self.wall_time).strftime("%H:%M:%S.%f")[:-3]
     
     def to_string(self) -> str:
         status = "OK" if self.success else "FALLO"
@@ -37,10 +158,180 @@ class DebugInfo:
         return "\n".join(lines)
 
 
+class Operation:
+    def __init__(self, name: str, parent: Optional["Operation"] = None):
+        self.name = name
+        self.parent = parent
+        self._logs: List[DebugInfo] = []
+        self._notes: List[str] = []
+        # Notas que se calculan al pedir el reporte (p. ej. el perfil en curso).
+        self._reporters: List[Callable[[], str]] = []
+        self._lock = threading.Lock()
+    
+    def add(self, info: DebugInfo):
+        # Los logs de una operacion anidada tambien cuentan para las que la contienen.
+        operation = self
+        while operation is not None:
+            with operation._lock:
+                operation._logs.append(info)
+            operation = operation.parent
+    
+    def add_note(self, note: str):
+        # Igual que los logs: la nota tambien llega a las operaciones que la contienen.
+        operation = self
+        while operation is not None:
+            with operation._lock:
+                operation._notes.append(note)
+            operation = operation.parent
+    
+    def add_reporter(self, reporter: Callable[[], str]):
+        with self._lock:
+            self._reporters.append(reporter)
+    
+    def remove_reporter(self, reporter: Callable[[], str]):
+        with self._lock:
+            self._reporters = [item for item in self._reporters if item is not reporter]
+    
+    @property
+    def logs(self) -> List[DebugInfo]:
+        with self._lock:
+            return list(self._logs)
+    
+    @property
+    def notes(self) -> List[str]:
+        with self._lock:
+            return list(self._notes)
+    
+    def clear(self):
+        with self._lock:
+            self._logs = []
+            self._notes = []
+    
+    def report(self) -> str:
+        with self._lock:
+            reporters = list(self._reporters)
+        notes = self.notes
+        for reporter in reporters:
+            try:
+                note = reporter()
+            except Exception:
+                continue
+            if note:
+                notes.append(note)
+        return _format_report(self.logs, notes)
+
+
+_current_operation: ContextVar[Optional[Operation]] = ContextVar("myhotspot_operation", default=None)
+
+
+def current_operation() -> Optional[Operation]:
+    return _current_operation.get()
+
+
+@contextmanager
+def operation(name: str):
+    op = Operation(name, _current_operation.get())
+    token = _current_operation.set(op)
+    try:
+        yield op
+    finally:
+        _current_operation.reset(token)
+
+
+# Envoltorio opcional de cada operacion trazada (p. ej. profiling). None = sin coste.
+_profiler: Optional[Callable[[str, Callable[[], object]], object]] = None
+
+
+# Receptores de (operacion, modulo, segundos, exito) al terminar cada operacion trazada.
+_operation_listeners: List[Callable[[str, str, float, bool], None]] = []
+
+
+def set_profiler(profiler: Optional[Callable[[str, Callable[[], object]], object]]):
+    global _profiler
+    _profiler = profiler
+
+
+def add_operation_listener(listener: Callable[[str, str, float, bool], None]):
+    global _operation_listeners
+    _operation_listeners = _operation_listeners + [listener]
+
+
+def remove_operation_listener(listener: Callable[[str, str, float, bool], None]):
+    global _operation_listeners
+    _operation_listeners = [item for item in _operation_listeners if item is not listener]
+
+
+def _run_traced(name: str, func, args, kwargs, profiler, listeners):
+    def run():
+        return func(*args, **kwargs)
+    
+    start = time.perf_counter()
+    ok = False
+    try:
+        # El perfilador corre dentro de la operacion: su nota queda en ella.
+        with operation(name):
+            result = profiler(name, run) if profiler is not None else run()
+        ok = not (isinstance(result, tuple) and result and result[0] is False)
+        return result
+    finally:
+        elapsed = time.perf_counter() - start
+        for listener in listeners:
+            try:
+                listener(name, func.__module__, elapsed, ok)
+            except Exception:
+                pass
+
+
+def traced(name: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            listeners = _operation_listeners
+            if profiler is None and not listeners:
+                with operation(name):
+                    return func(*args, **kwargs)
+            return _run_traced(name, func, args, kwargs, profiler, listeners)
+        return wrapper
+    return decorator
+
+
+def _format_report(logs: List[DebugInfo], notes: List[str] = ()) -> str:
+    if not logs and not notes:
+        return "No hay logs disponibles."
+    
+    lines = ["=" * 60, "REPORTE DE DEBUG - MODO DESARROLLADOR", "=" * 60, ""]
+    
+    for i, log in enumerate(logs, 1):
+        lines.append(f"--- LOG #{i} ---")
+        lines.append(log.to_string())
+        lines.append("")
+    
+    failed_logs = [log for log in logs if not log.success]
+    if failed_logs:
+        lines.append("=" * 60)
+        lines.append("RESUMEN DE ERRORES:")
+        lines.append("=" * 60)
+        for log in failed_logs:
+            lines.append(f"- Paso '{log.step}' fallo con codigo {log.return_code}")
+            if log.stderr.strip():
+                lines.append(f"  Error: {log.stderr.strip()[:100]}")
+    
+    for note in notes:
+        lines.append("")
+        lines.append(note)
+    
+    return "\n".join(lines)
+
+
 class DebugLogger:
     _instance = None
     _enabled = False
+    # Logs registrados fuera de cualquier operacion.
     _logs: List[DebugInfo] = []
+    _notes: deque = deque(maxlen=5)
+    # Receptores de cada entrada, aunque el modo desarrollador este apagado (p. ej. log_sink).
+    _listeners: List[Callable[[DebugInfo], None]] = []
     
     @classmethod
     def enable(cls):
@@ -55,160 +346,234 @@ class DebugLogger:
         return cls._enabled
     
     @classmethod
-    def log(cls, step: str, command: str, return_code: int, stdout: str, stderr: str) -> DebugInfo:
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        success = return_code == 0
-        info = DebugInfo(step, command, return_code, stdout, stderr, timestamp, success)
+    def add_listener(cls, listener: Callable[[DebugInfo], None]):
+        cls._listeners = cls._listeners + [listener]
+    
+    @classmethod
+    def remove_listener(cls, listener: Callable[[DebugInfo], None]):
+        cls._listeners = [item for item in cls._listeners if item is not listener]
+    
+    @classmethod
+    def log(
+        cls, step: str, command: str, return_code: int, stdout: str, stderr: str,
+        method: str = "", duration: float = 0.0
+    ) -> DebugInfo:
+        op = _current_operation.get()
+        info = DebugInfo.record(step, command, return_code, stdout, stderr, method, op.name if op is not None else "", duration)
         
         if cls._enabled:
-            cls._logs.append(info)
+            if op is not None:
+                op.add(info)
+            else:
+                cls._logs.append(info)
+        
+        for listener in cls._listeners:
+            try:
+                listener(info)
+            except Exception:
+                pass
         
         return info
     
+    @classmethod
+    def add_note(cls, note: str):
+        # Texto adicional para el reporte de la operacion actual (p. ej. un perfil).
+        op = _current_operation.get()
+        if op is not None:
+            op.add_note(note)
+        else:
+            cls._notes.append(note)
+    
     @classmethod
     def get_full_report(cls) -> str:
-        if not cls._logs:
-            return "No hay logs disponibles."
-        
-        lines = ["=" * 60, "REPORTE DE DEBUG - MODO DESARROLLADOR", "=" * 60, ""]
-        
-        for i, log in enumerate(cls._logs, 1):
-            lines.append(f"--- LOG #{i} ---")
-            lines.append(log.to_string())
-            lines.append("")
-        
-        failed_logs = [log for log in cls._logs if not log.success]
-        if failed_logs:
-            lines.append("=" * 60)
-            lines.append("RESUMEN DE ERRORES:")
-            lines.append("=" * 60)
-            for log in failed_logs:
-                lines.append(f"- Paso '{log.step}' fallo con codigo {log.return_code}")
-                if log.stderr.strip():
-                    lines.append(f"  Error: {log.stderr.strip()[:100]}")
-        
-        return "\n".join(lines)
+        op = _current_operation.get()
+        if op is not None:
+            return op.report()
+        return _format_report(list(cls._logs), list(cls._notes))
     
     @classmethod
     def clear(cls):
-        cls._logs = []
-
-
-ERROR_SOLUTIONS = {
-    "hosted network couldn't be started": {
-        "error": "No se pudo iniciar el punto de acceso.",
-        "solutions": [
-            "1. Asegurate de ejecutar la aplicacion como Administrador",
-            "2. Verifica que el WiFi este encendido",
-            "3. Desactiva cualquier VPN o firewall temporalmente",
-            "4. Reinicia el adaptador de red desde Administrador de dispositivos",
-            "5. Cierra otras aplicaciones que puedan usar el WiFi (como Mobile Hotspot de Windows)"
-        ]
-    },
-    "group or resource is not in the correct state": {
-        "error": "El adaptador de red no esta en el estado correcto.",
-        "solutions": [
-            "1. Ve a Configuracion > Red e Internet > Configuracion avanzada de red",
-            "2. Desactiva y reactiva el adaptador WiFi",
-            "3. Ejecuta como Administrador: netsh wlan set hostednetwork mode=disallow",
-            "4. Reinicia el comando netsh wlan set hostednetwork mode=allow",
-            "5. Si persiste, reinicia la computadora"
-        ]
-    },
-    "access is denied": {
-        "error": "Acceso denegado.",
-        "solutions": [
-            "1. Ejecuta la aplicacion como Administrador",
-            "2. Clic derecho en el .exe > Ejecutar como administrador"
-        ]
-    },
-    "wireless local area network interface is powered down": {
-        "error": "El adaptador WiFi esta apagado.",
-        "solutions": [
-            "1. Enciende el WiFi desde la barra de tareas o Configuracion",
-            "2. Verifica que no este en modo avion",
-            "3. Revisa el interruptor fisico de WiFi (si tu laptop tiene uno)"
-        ]
-    },
-    "the device is not ready": {
-        "error": "El dispositivo de red no esta listo.",
-        "solutions": [
-            "1. Espera unos segundos e intenta de nuevo",
-            "2. Reinicia el adaptador WiFi desde Administrador de dispositivos",
-            "3. Desconecta y reconecta el adaptador USB WiFi (si aplica)"
-        ]
-    },
-    "element not found": {
-        "error": "No se encontro el elemento de red.",
-        "solutions": [
-            "1. El hotspot puede no estar configurado. Crea uno nuevo.",
-            "2. Ejecuta: netsh wlan set hostednetwork mode=allow primero"
-        ]
-    },
-    "the parameter is incorrect": {
-        "error": "Parametro incorrecto.",
-        "solutions": [
-            "1. Verifica que el SSID no tenga caracteres especiales",
-            "2. Usa solo letras y numeros en la contrasena",
-            "3. El SSID debe tener maximo 32 caracteres"
-        ]
-    },
-    "the requested operation requires elevation": {
-        "error": "Se requieren permisos de administrador.",
-        "solutions": [
-            "1. Ejecuta la aplicacion como Administrador",
-            "2. Clic derecho > Ejecutar como administrador"
-        ]
-    },
-    "the hosted network couldn't be started": {
-        "error": "El hosted network no pudo iniciarse.",
-        "solutions": [
-            "1. Verifica que el adaptador WiFi no este en uso por otra aplicacion",
-            "2. El 'Mobile Hotspot' de Windows puede estar ocupando el adaptador",
-            "3. Desactiva el hotspot de Windows en Configuracion > Red e Internet > Hotspot movil",
-            "4. Reinicia el servicio WLAN AutoConfig (services.msc)"
-        ]
+        # Solo afecta a la operacion actual; las demas conservan sus logs.
+        op = _current_operation.get()
+        if op is not None:
+            op.clear()
+        else:
+            cls._logs = []
+            cls._notes.clear()
+
+
+def _build_error_tables() -> tuple[dict, dict]:
+    error_solutions = {
+        "hosted network couldn't be started": {
+            "error": "No se pudo iniciar el punto de acceso.",
+            "solutions": [
+                "1. Asegurate de ejecutar la aplicacion como Administrador",
+                "2. Verifica que el WiFi este encendido",
+                "3. Desactiva cualquier VPN o firewall temporalmente",
+                "4. Reinicia el adaptador de red desde Administrador de dispositivos",
+                "5. Cierra otras aplicaciones que puedan usar el WiFi (como Mobile Hotspot de Windows)"
+            ],
+            "retryable": True,
+            "corrective": "reset_hostednetwork"
+        },
+        "group or resource is not in the correct state": {
+            "error": "El adaptador de red no esta en el estado correcto.",
+            "solutions": [
+                "1. Ve a Configuracion > Red e Internet > Configuracion avanzada de red",
+                "2. Desactiva y reactiva el adaptador WiFi",
+                "3. Ejecuta como Administrador: netsh wlan set hostednetwork mode=disallow",
+                "4. Reinicia el comando netsh wlan set hostednetwork mode=allow",
+                "5. Si persiste, reinicia la computadora"
+            ],
+            "retryable": True,
+            "corrective": "reset_hostednetwork"
+        },
+        "access is denied": {
+            "error": "Acceso denegado.",
+            "solutions": [
+                "1. Ejecuta la aplicacion como Administrador",
+                "2. Clic derecho en el .exe > Ejecutar como administrador"
+            ],
+            "retryable": False
+        },
+        "wireless local area network interface is powered down": {
+            "error": "El adaptador WiFi esta apagado.",
+            "solutions": [
+                "1. Enciende el WiFi desde la barra de tareas o Configuracion",
+                "2. Verifica que no este en modo avion",
+                "3. Revisa el interruptor fisico de WiFi (si tu laptop tiene uno)"
+            ],
+            "retryable": False
+        },
+        "the device is not ready": {
+            "error": "El dispositivo de red no esta listo.",
+            "solutions": [
+                "1. Espera unos segundos e intenta de nuevo",
+                "2. Reinicia el adaptador WiFi desde Administrador de dispositivos",
+                "3. Desconecta y reconecta el adaptador USB WiFi (si aplica)"
+            ],
+            "retryable": True
+        },
+        "element not found": {
+            "error": "No se encontro el elemento de red.",
+            "solutions": [
+                "1. El hotspot puede no estar configurado. Crea uno nuevo.",
+                "2. Ejecuta: netsh wlan set hostednetwork mode=allow primero"
+            ],
+            "retryable": False
+        },
+        "the parameter is incorrect": {
+            "error": "Parametro incorrecto.",
+            "solutions": [
+                "1. Verifica que el SSID no tenga caracteres especiales",
+                "2. Usa solo letras y numeros en la contrasena",
+                "3. El SSID debe tener maximo 32 caracteres"
+            ],
+            "retryable": False
+        },
+        "the requested operation requires elevation": {
+            "error": "Se requieren permisos de administrador.",
+            "solutions": [
+                "1. Ejecuta la aplicacion como Administrador",
+                "2. Clic derecho > Ejecutar como administrador"
+            ],
+            "retryable": False
+        },
+        "the hosted network couldn't be started": {
+            "error": "El hosted network no pudo iniciarse.",
+            "solutions": [
+                "1. Verifica que el adaptador WiFi no este en uso por otra aplicacion",
+                "2. El 'Mobile Hotspot' de Windows puede estar ocupando el adaptador",
+                "3. Desactiva el hotspot de Windows en Configuracion > Red e Internet > Hotspot movil",
+                "4. Reinicia el servicio WLAN AutoConfig (services.msc)"
+            ],
+            "retryable": True,
+            "corrective": "reset_hostednetwork"
+        }
     }
-}
-
-GENERIC_ERRORS = {
-    "no_wifi_adapter": {
-        "error": "No se detecto adaptador WiFi.",
-        "solutions": [
-            "1. Verifica que tengas un adaptador WiFi instalado",
-            "2. Revisa en Administrador de dispositivos > Adaptadores de red",
-            "3. Instala los drivers del adaptador WiFi"
-        ]
-    },
-    "not_supported": {
-        "error": "Tu adaptador WiFi no soporta Hosted Network.",
-        "solutions": [
-            "SOLUCIONES ALTERNATIVAS:",
-            "",
-            "1. Usar Mobile Hotspot de Windows:",
-            "   - Ve a Configuracion > Red e Internet > Hotspot movil",
-            "   - Este metodo puede funcionar aunque netsh no lo soporte",
-            "",
-            "2. Usar un adaptador USB WiFi compatible:",
-            "   - TP-Link TL-WN722N (version 1)",
-            "   - Alfa AWUS036NHA",
-            "   - Panda PAU09",
-            "",
-            "3. Actualizar drivers del adaptador:",
-            "   - Busca drivers actualizados del fabricante",
-            "   - A veces versiones nuevas habilitan esta funcion"
-        ]
-    },
-    "unknown": {
-        "error": "Error desconocido.",
-        "solutions": [
-            "1. Ejecuta como Administrador",
-            "2. Verifica que el WiFi este activo",
-            "3. Reinicia la aplicacion",
-            "4. Consulta el log de Windows para mas detalles"
-        ]
+
+    generic_errors = {
+        "no_wifi_adapter": {
+            "error": "No se detecto adaptador WiFi.",
+            "solutions": [
+                "1. Verifica que tengas un adaptador WiFi instalado",
+                "2. Revisa en Administrador de dispositivos > Adaptadores de red",
+                "3. Instala los drivers del adaptador WiFi"
+            ]
+        },
+        "not_supported": {
+            "error": "Tu adaptador WiFi no soporta Hosted Network.",
+            "solutions": [
+                "SOLUCIONES ALTERNATIVAS:",
+                "",
+                "1. Usar Mobile Hotspot de Windows:",
+                "   - Ve a Configuracion > Red e Internet > Hotspot movil",
+                "   - Este metodo puede funcionar aunque netsh no lo soporte",
+                "",
+                "2. Usar un adaptador USB WiFi compatible:",
+                "   - TP-Link TL-WN722N (version 1)",
+                "   - Alfa AWUS036NHA",
+                "   - Panda PAU09",
+                "",
+                "3. Actualizar drivers del adaptador:",
+                "   - Busca drivers actualizados del fabricante",
+                "   - A veces versiones nuevas habilitan esta funcion"
+            ]
+        },
+        "unknown": {
+            "error": "Error desconocido.",
+            "solutions": [
+                "1. Ejecuta como Administrador",
+                "2. Verifica que el WiFi este activo",
+                "3. Reinicia la aplicacion",
+                "4. Consulta el log de Windows para mas detalles"
+            ]
+        }
     }
-}
+    return error_solutions, generic_errors
+
+
+_error_tables: Optional[tuple[dict, dict]] = None
+
+
+def _get_error_tables() -> tuple[dict, dict]:
+    # Las tablas de soluciones solo se construyen cuando hay un error que mostrar.
+    global _error_tables
+    if _error_tables is None:
+        _error_tables = _build_error_tables()
+    return _error_tables
+
+
+def __getattr__(name: str):
+    if name == "ERROR_SOLUTIONS":
+        return _get_error_tables()[0]
+    if name == "GENERIC_ERRORS":
+        return _get_error_tables()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def classify_error(message: str) -> tuple[bool, Optional[str]]:
+    # (reintentable, accion correctiva). Reconoce el texto original de Windows
+    # y tambien el mensaje ya traducido que devuelven los metodos.
+    error_solutions, _ = _get_error_tables()
+    lower = message.lower()
+    for key, info in error_solutions.items():
+        if key in lower or info["error"].lower() in lower:
+            return info.get("retryable", False), info.get("corrective")
+    return False, None
+
+
+def error_category(message: str) -> str:
+    # Clave de ERROR_SOLUTIONS o GENERIC_ERRORS que explica el mensaje ("unknown" si ninguna).
+    error_solutions, generic_errors = _get_error_tables()
+    lower = message.lower()
+    for key, info in error_solutions.items():
+        if key in lower or info["error"].lower() in lower:
+            return key
+    for key, info in generic_errors.items():
+        if key in lower or info["error"].lower() in lower:
+            return key
+    return "unknown"
 
 
 def format_error(raw_error: str, debug_info: Optional[DebugInfo] = None) -> str:
@@ -219,23 +584,24 @@ def format_error(raw_error: str, debug_info: Optional[DebugInfo] = None) -> str:
 
 
 def format_user_error(raw_error: str) -> str:
+    error_solutions, generic_errors = _get_error_tables()
     raw_lower = raw_error.lower()
     
-    for key, info in ERROR_SOLUTIONS.items():
+    for key, info in error_solutions.items():
         if key in raw_lower:
             solutions_text = "\n".join(info["solutions"])
             return f"{info['error']}\n\nPosibles soluciones:\n{solutions_text}"
     
-    for key, info in GENERIC_ERRORS.items():
+    for key, info in generic_errors.items():
         if key in raw_lower:
             solutions_text = "\n".join(info["solutions"])
             return f"{info['error']}\n\nPosibles soluciones:\n{solutions_text}"
     
     if raw_error.strip():
-        solutions_text = "\n".join(GENERIC_ERRORS["unknown"]["solutions"])
+        solutions_text = "\n".join(generic_errors["unknown"]["solutions"])
         return f"Error: {raw_error}\n\nPosibles soluciones:\n{solutions_text}"
     
-    solutions_text = "\n".join(GENERIC_ERRORS["unknown"]["solutions"])
+    solutions_text = "\n".join(generic_errors["unknown"]["solutions"])
     return f"Error inesperado.\n\nPosibles soluciones:\n{solutions_text}"
 
 
@@ -281,56 +647,17 @@ def format_developer_error(raw_error: str, debug_info: DebugInfo) -> str:
 
 
 def check_admin_error() -> str:
-    try:
-        if not ctypes.windll.shell32.IsUserAnAdmin():
-            return "ADVERTENCIA: No estas ejecutando como Administrador.\nAlgunas funciones pueden fallar.\n\nClic derecho > Ejecutar como administrador"
-    except:
-        pass
+    if environment.get_environment().is_admin is False:
+        return "ADVERTENCIA: No estas ejecutando como Administrador.\nAlgunas funciones pueden fallar.\n\nClic derecho > Ejecutar como administrador"
     return ""
 
 
-def diagnose_network() -> str:
-    issues = []
-    
-    try:
-        result = subprocess.run(
-            "netsh wlan show drivers",
-            shell=True,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        output = result.stdout.lower()
-        
-        if "hosted network supported" in output:
-            if "yes" not in output.split("hosted network supported")[1][:30]:
-                issues.append("- Tu adaptador NO soporta Hosted Network")
-        
-        if "not found" in output or "no wireless" in output:
-            issues.append("- No se detecto adaptador WiFi")
-    
-    except:
-        pass
-    
-    try:
-        result = subprocess.run(
-            "netsh wlan show interfaces",
-            shell=True,
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        output = result.stdout.lower()
-        
-        if "disconnected" in output or "sin conexion" in output:
-            issues.append("- El WiFi esta desconectado")
-        
-        if "hardware off" in output or "apagado" in output:
-            issues.append("- El WiFi esta apagado")
-    
-    except:
-        pass
-    
-    if issues:
-        return "Problemas detectados:\n" + "\n".join(issues)
+def check_environment_error(mobile_hotspot: bool = False) -> str:
+    env = environment.get_environment()
+    if not env.is_windows:
+        return ""
+    if mobile_hotspot and not env.mobile_hotspot_available:
+        return f"Mobile Hotspot requiere Windows 10 version 1607 o superior.\nSistema detectado: {env.os_version} (build {env.os_build})"
+    if env.wireless_adapters == ():
+        return "No se detecto adaptador WiFi.\n\nVerifica que el WiFi este encendido y el controlador instalado."
     return ""
@@ -0,0 +1,270 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+import backends
+
+DEFAULT_PORT = 8765
+PARALLELISM = 16
+DEADLINE = 30.0
+MAX_LINE = 64 * 1024
+
+# Operaciones que acepta el agente -> argumentos que se pasan al backend.
+OPERATIONS = {
+    "create": ("create_hotspot", ("ssid", "password")),
+    "stop": ("stop_hotspot", ()),
+    "delete": ("delete_hotspot", ()),
+    "status": ("get_status", ()),
+    "support": ("check_support", ()),
+    "poll": ("poll_state", ()),
+}
+
+
+class FleetError(Exception):
+    pass
+
+
+def load_secret(path: Optional[str] = None) -> bytes:
+    # MYHOTSPOT_FLEET_SECRET o un archivo; sin secreto no se acepta ninguna orden.
+    if path:
+        with open(path, "rb") as f:
+            secret = f.read().strip()
+    else:
+        secret = os.environ.get("MYHOTSPOT_FLEET_SECRET", "").encode("utf-8")
+    if len(secret) < 16:
+        raise FleetError("Se necesita un secreto compartido de al menos 16 caracteres (MYHOTSPOT_FLEET_SECRET)")
+    return secret
+
+
+def sign(secret: bytes, nonce: str, request: dict) -> str:
+    body = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hmac.new(secret, f"{nonce}\n{body}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _send(sock_file, message: dict):
+    sock_file.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+    sock_file.flush()
+
+
+def _receive(sock_file) -> dict:
+    line = sock_file.readline(MAX_LINE + 1)
+    if not line:
+        raise FleetError("Conexion cerrada")
+    if len(line) > MAX_LINE:
+        raise FleetError("Mensaje demasiado largo")
+    return json.loads(line)
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    server: "AgentServer"
+
+    def handle(self):
+        # Un nonce nuevo por conexion: una orden capturada no se puede repetir.
+        nonce = secrets.token_hex(16)
+        try:
+            _send(self.wfile, {"nonce": nonce, "method": self.server.method})
+            message = _receive(self.rfile)
+            request = message.get("request", {})
+            if not hmac.compare_digest(sign(self.server.secret, nonce, request), str(message.get("mac", ""))):
+                self._reply(nonce, {"ok": False, "message": "Autenticacion fallida"})
+                return
+            self._reply(nonce, self.server.execute(request))
+        except (OSError, ValueError, FleetError):
+            pass
+
+    def _reply(self, nonce: str, response: dict):
+        # La respuesta tambien va firmada (con otro prefijo para no confundirla con una orden).
+        _send(self.wfile, {"response": response, "mac": sign(self.server.secret, f"{nonce}:respuesta", response)})
+
+
+class AgentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], secret: bytes, method: str):
+        super().__init__(address, _AgentHandler)
+        self.secret = secret
+        self.method = method
+        # Un solo adaptador: las ordenes de este equipo se ejecutan de una en una.
+        self._lock = threading.Lock()
+
+    def execute(self, request: dict) -> dict:
+        op = request.get("op")
+        if op not in OPERATIONS:
+            return {"ok": False, "message": f"Operacion desconocida: {op}"}
+        function_name, arg_names = OPERATIONS[op]
+        args = [str(request.get("args", {}).get(name, "")) for name in arg_names]
+        module = backends.get(self.method)
+
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                result = getattr(module, function_name)(*args)
+            except Exception as e:
+                result = (False, f"Error inesperado: {str(e)}")
+        elapsed = time.perf_counter() - start
+
+        if isinstance(result, tuple):
+            ok, message = result
+        else:
+            ok, message = result is not None, json.dumps(result)
+        return {"ok": ok, "message": message, "elapsed": elapsed, "method": self.method}
+
+
+@dataclass
+class HostResult:
+    host: str
+    ok: bool
+    message: str
+    elapsed: float
+    agent_time: float = 0.0
+
+
+@dataclass
+class FleetResult:
+    op: str
+    results: list[HostResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> list[HostResult]:
+        return [result for result in self.results if not result.ok]
+
+    def report(self, details: bool = False) -> str:
+        timings = sorted(result.elapsed for result in self.results)
+        lines = [f"{self.op}: {len(self.results) - len(self.failed)}/{len(self.results)} equipos OK en {self.wall_time:.2f}s"]
+        if timings:
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            lines.append(
+                f"  Por equipo: mediana {statistics.median(timings) * 1000:.0f} ms, "
+                f"p95 {p95 * 1000:.0f} ms, max {timings[-1] * 1000:.0f} ms"
+            )
+        for result in self.results if details else self.failed:
+            status = "OK" if result.ok else "FALLO"
+            first_line = result.message.strip().splitlines()[0] if result.message.strip() else ""
+            lines.append(f"  [{status}] {result.host} ({result.elapsed * 1000:.0f} ms): {first_line[:120]}")
+        return "\n".join(lines)
+
+
+def parse_host(text: str) -> tuple[str, int]:
+    host, _, port = text.strip().rpartition(":")
+    if not host:
+        return text.strip(), DEFAULT_PORT
+    return host, int(port)
+
+
+class Controller:
+    def __init__(self, hosts: list[str], secret: bytes, parallelism: int = PARALLELISM, deadline: float = DEADLINE):
+        self.hosts = hosts
+        self.secret = secret
+        self.parallelism = parallelism
+        self.deadline = deadline
+
+    def call(self, host: str, op: str, args: Optional[dict] = None, deadline: Optional[float] = None) -> HostResult:
+        deadline = deadline if deadline is not None else time.monotonic() + self.deadline
+        start = time.perf_counter()
+        # Para el mensaje: el limite que se aplico de verdad, no el configurado.
+        budget = deadline - time.monotonic()
+        try:
+            address = parse_host(host)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("sin tiempo")
+            with socket.create_connection(address, timeout=remaining) as sock:
+                with sock.makefile("rwb") as sock_file:
+                    sock.settimeout(max(0.001, deadline - time.monotonic()))
+                    hello = _receive(sock_file)
+                    request = {"op": op, "args": args or {}}
+                    _send(sock_file, {"request": request, "mac": sign(self.secret, hello["nonce"], request)})
+                    sock.settimeout(max(0.001, deadline - time.monotonic()))
+                    reply = _receive(sock_file)
+            response = reply.get("response", {})
+            if not hmac.compare_digest(sign(self.secret, f"{hello['nonce']}:respuesta", response), str(reply.get("mac", ""))):
+                raise FleetError("respuesta sin firma valida")
+            return HostResult(host, bool(response.get("ok")), str(response.get("message", "")),
+                              time.perf_counter() - start, float(response.get("elapsed", 0.0)))
+        except socket.timeout:
+            return HostResult(host, False, f"Sin respuesta antes del limite de {max(0.0, budget):.3g}s", time.perf_counter() - start)
+        except (OSError, ValueError, KeyError, FleetError) as e:
+            return HostResult(host, False, f"Error de conexion: {e}", time.perf_counter() - start)
+
+    def run(self, op: str, args: Optional[dict] = None) -> FleetResult:
+        # Todos los equipos a la vez (hasta 'parallelism'), con el mismo limite por equipo.
+        if op not in OPERATIONS:
+            raise FleetError(f"Operacion desconocida: {op}")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.parallelism, len(self.hosts))), thread_name_prefix="myhotspot-fleet") as executor:
+            futures = [
+                executor.submit(lambda host: self.call(host, op, args, time.monotonic() + self.deadline), host)
+                for host in self.hosts
+            ]
+            results = [future.result() for future in futures]
+        return FleetResult(op, results, time.perf_counter() - start)
+
+
+def _read_hosts(value: str) -> list[str]:
+    if os.path.exists(value):
+        with open(value, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return [item for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control de hotspots en varios equipos")
+    parser.add_argument("--secret-file", default=None, help="Por defecto MYHOTSPOT_FLEET_SECRET")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    agent = sub.add_parser("agent", help="Atiende ordenes en este equipo")
+    agent.add_argument("--bind", default="127.0.0.1", help="Solo este equipo por defecto; 0.0.0.0 o la IP de la red para atender a otros")
+    agent.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 = puerto libre (se imprime al arrancar)")
+    agent.add_argument("--method", choices=list(backends.BACKENDS), default="mobile")
+
+    run = sub.add_parser("run", help="Ejecuta una operacion en todos los equipos")
+    run.add_argument("op", choices=list(OPERATIONS))
+    run.add_argument("--hosts", required=True, help="Archivo con un equipo por linea o lista host:puerto separada por comas")
+    run.add_argument("--ssid", default="")
+    run.add_argument("--password", default="")
+    run.add_argument("--parallel", type=int, default=PARALLELISM)
+    run.add_argument("--deadline", type=float, default=DEADLINE, help="Segundos por equipo")
+    run.add_argument("--details", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        secret = load_secret(args.secret_file)
+    except (FleetError, OSError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+
+    if args.command == "agent":
+        server = AgentServer((args.bind, args.port), secret, args.method)
+        print(f"LISTENING {server.server_address[1]}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    controller = Controller(_read_hosts(args.hosts), secret, args.parallel, args.deadline)
+    result = controller.run(args.op, {"ssid": args.ssid, "password": args.password})
+    print(result.report(args.details))
+    sys.exit(0 if result.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
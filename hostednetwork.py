@@ -0,0 +1,162 @@
+import hashlib
+import hmac
+import re
+from typing import Optional
+
+PLAN_NOOP = "noop"
+PLAN_START = "start"
+PLAN_RECONFIGURE = "reconfigure"
+
+PLAN_DESCRIPTIONS = {
+    PLAN_NOOP: "sin cambios (ya estaba activo con la misma configuracion)",
+    PLAN_START: "solo iniciar (la configuracion ya coincidia)",
+    PLAN_RECONFIGURE: "reconfigurar e iniciar",
+}
+
+READ_COMMANDS = ["netsh wlan show hostednetwork", "netsh wlan show hostednetwork setting=security"]
+
+# Las transcripciones guardan la clave como "pbkdf2:<sal>:<resumen>" en lugar de "***",
+# para que la reproduccion compare la contrasena y siga la misma ruta que en vivo.
+KEY_DIGEST_PREFIX = "pbkdf2:"
+KEY_DIGEST_ITERATIONS = 100_000
+
+_MAC_RE = re.compile(r"([0-9a-f]{2}(?:[:-][0-9a-f]{2}){5})", re.IGNORECASE)
+
+
+def _value(line: str) -> str:
+    return line.split(":", 1)[1].strip().strip('"') if ":" in line else ""
+
+
+def parse_hostednetwork(output: str) -> dict:
+    info = {
+        "mode": "",
+        "ssid": "",
+        "status": "",
+        "started": False,
+        "clients": 0,
+        "max_clients": 0,
+        "key": None,
+        "peers": [],
+    }
+
+    for line in output.split("\n"):
+        lower = line.strip().lower()
+        if not lower:
+            continue
+
+        if lower.startswith("mode") or lower.startswith("modo"):
+            info["mode"] = _value(line)
+        elif lower.startswith("ssid name") or lower.startswith("nombre de ssid"):
+            info["ssid"] = _value(line)
+        elif lower.startswith("status") or lower.startswith("estado"):
+            info["status"] = _value(line)
+            info["started"] = info["status"].lower() in ("started", "iniciado")
+        elif "clients" in lower or "clientes" in lower:
+            digits = re.sub(r"\D", "", _value(line))
+            count = int(digits) if digits else 0
+            if lower.startswith("max") or "ximo" in lower:
+                info["max_clients"] = count
+            else:
+                info["clients"] = count
+        elif lower.startswith("user security key") and "usage" not in lower:
+            info["key"] = _value(line)
+        elif lower.startswith("clave de seguridad de usuario") and "uso" not in lower:
+            info["key"] = _value(line)
+        else:
+            match = _MAC_RE.match(line.strip())
+            if match:
+                info["peers"].append(match.group(1).lower().replace("-", ":"))
+
+    return info
+
+
+def key_digest(key: str, salt: str) -> str:
+    digest = hashlib.pbkdf2_hmac("sha256", key.encode("utf-8"), salt.encode("ascii"), KEY_DIGEST_ITERATIONS)
+    return f"{KEY_DIGEST_PREFIX}{salt}:{digest.hex()[:32]}"
+
+
+def key_matches(key: Optional[str], password: str) -> bool:
+    if key is None:
+        return False
+    if key == password:
+        return True
+    if key.startswith(KEY_DIGEST_PREFIX):
+        salt = key[len(KEY_DIGEST_PREFIX):].split(":", 1)[0]
+        return hmac.compare_digest(key, key_digest(password, salt))
+    return False
+
+
+def is_allowed(info: dict) -> bool:
+    return info.get("mode", "").lower() in ("allowed", "permitido")
+
+
+def plan_apply(current: Optional[dict], ssid: str, password: str) -> str:
+    if current is None or not is_allowed(current):
+        return PLAN_RECONFIGURE
+
+    if current.get("ssid") != ssid or not key_matches(current.get("key"), password):
+        return PLAN_RECONFIGURE
+
+    if current.get("started"):
+        return PLAN_NOOP
+    return PLAN_START
+
+
+SNAPSHOT_SECTIONS = [
+    ("drivers", "netsh wlan show drivers"),
+    ("hostednetwork", "netsh wlan show hostednetwork"),
+    ("interfaces", "netsh wlan show interfaces"),
+    ("arp", "arp -a"),
+]
+
+
+def snapshot_command(separator: str) -> str:
+    # Una sola invocacion con marcadores para separar la salida de cada comando.
+    parts = []
+    for name, command in SNAPSHOT_SECTIONS:
+        parts.append(f"echo ==={name}===")
+        parts.append(command)
+    return separator.join(parts)
+
+
+def split_sections(output: str) -> dict[str, str]:
+    sections: dict[str, list[str]] = {}
+    current = None
+    for line in output.split("\n"):
+        marker = line.strip()
+        if marker.startswith("===") and marker.endswith("===") and len(marker) > 6:
+            current = marker.strip("=")
+            sections[current] = []
+        elif current is not None:
+            sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def parse_drivers(output: str) -> tuple[Optional[bool], str]:
+    adapter_name = ""
+    for line in output.split("\n"):
+        if "Interface name" in line or "Nombre de interfaz" in line:
+            adapter_name = line.split(":")[-1].strip() if ":" in line else ""
+            break
+
+    output_lower = output.lower()
+    if "hosted network supported" not in output_lower:
+        return None, adapter_name
+    after_supported = output_lower.split("hosted network supported")[1][:30]
+    return "yes" in after_supported, adapter_name
+
+
+def parse_interfaces(output: str) -> dict:
+    info = {"connected": False, "profile": "", "channel": 0, "band": ""}
+    for line in output.split("\n"):
+        lower = line.strip().lower()
+        if lower.startswith("state") or lower.startswith("estado"):
+            info["connected"] = _value(line).lower() in ("connected", "conectado")
+        elif lower.startswith("profile") or lower.startswith("perfil"):
+            info["profile"] = _value(line)
+        elif lower.startswith("channel") or lower.startswith("canal"):
+            digits = re.sub(r"\D", "", _value(line))
+            info["channel"] = int(digits) if digits else 0
+        elif lower.startswith("band") or lower.startswith("banda"):
+            info["band"] = _value(line)
+    return info
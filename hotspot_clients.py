@@ -0,0 +1,138 @@
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import hostednetwork
+
+CLIENTS_TTL = 3.0
+
+# Nombres resueltos por DNS inverso: caducan (las IP del hotspot se reasignan) y la cache
+# se limita a las mas recientes.
+HOSTNAME_TTL = 300.0
+HOSTNAME_CACHE_SIZE = 256
+RESOLVE_TIMEOUT = 1.0
+RESOLVE_WORKERS = 4
+
+_ARP_RE = re.compile(r"^\s*(\d{1,3}(?:\.\d{1,3}){3})\s+([0-9a-f]{2}(?:[:-][0-9a-f]{2}){5})\s", re.IGNORECASE)
+
+# ip -> (nombre, instante de la resolucion), de la menos a la mas usada.
+_hostnames: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+_pending: dict[str, Future] = {}
+_hostnames_lock = threading.Lock()
+_resolver = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="myhotspot-resolve")
+
+
+@dataclass(frozen=True)
+class ClientInfo:
+    mac: str
+    hostname: str = ""
+    ip: str = ""
+
+
+def normalize_mac(mac: str) -> str:
+    return mac.strip().lower().replace("-", ":")
+
+
+def parse_arp_table(output: str) -> dict[str, str]:
+    table: dict[str, str] = {}
+    for line in output.split("\n"):
+        match = _ARP_RE.match(line)
+        if match:
+            table[normalize_mac(match.group(2))] = match.group(1)
+    return table
+
+
+def _lookup(ip: str) -> str:
+    try:
+        name = socket.gethostbyaddr(ip)[0]
+    except Exception:
+        name = ""
+    with _hostnames_lock:
+        _pending.pop(ip, None)
+        _hostnames[ip] = (name, time.monotonic())
+        _hostnames.move_to_end(ip)
+        while len(_hostnames) > HOSTNAME_CACHE_SIZE:
+            _hostnames.popitem(last=False)
+    return name
+
+
+def resolve_hostnames(ips: Iterable[str], timeout: float = 0.0) -> dict[str, str]:
+    # Las IP sin nombre vigente se resuelven en paralelo en segundo plano; se espera como
+    # mucho 'timeout' (0 = nada) y las que falten apareceran en el siguiente refresco.
+    names: dict[str, str] = {}
+    waiting: dict[str, Future] = {}
+    now = time.monotonic()
+    with _hostnames_lock:
+        for ip in set(ips):
+            if not ip:
+                continue
+            cached = _hostnames.get(ip)
+            if cached is not None:
+                names[ip] = cached[0]
+                if now - cached[1] <= HOSTNAME_TTL:
+                    _hostnames.move_to_end(ip)
+                    continue
+            future = _pending.get(ip)
+            if future is None:
+                future = _pending[ip] = _resolver.submit(_lookup, ip)
+            waiting[ip] = future
+
+    if waiting and timeout > 0:
+        done, _ = wait(waiting.values(), timeout)
+        for ip, future in waiting.items():
+            if future in done:
+                names[ip] = future.result()
+    return names
+
+
+def resolve_hostname(ip: str, timeout: float = RESOLVE_TIMEOUT) -> str:
+    return resolve_hostnames([ip], timeout).get(ip, "")
+
+
+def clients_from_netsh(output: str, timeout: float = 0.0) -> list[ClientInfo]:
+    # 'netsh wlan show hostednetwork' y 'arp -a' en la misma salida.
+    arp = parse_arp_table(output)
+    peers = hostednetwork.parse_hostednetwork(output)["peers"]
+    names = resolve_hostnames((arp.get(mac, "") for mac in peers), timeout)
+    clients = []
+    for mac in peers:
+        ip = arp.get(mac, "")
+        clients.append(ClientInfo(mac, names.get(ip, ""), ip))
+    return clients
+
+
+def diff_clients(current: dict[str, ClientInfo], clients: list[ClientInfo]) -> tuple[list[ClientInfo], list[str], list[ClientInfo]]:
+    incoming = {client.mac: client for client in clients}
+    added = [client for mac, client in incoming.items() if mac not in current]
+    removed = [mac for mac in current if mac not in incoming]
+    updated = [
+        client for mac, client in incoming.items()
+        if mac in current and current[mac] != client
+    ]
+    return added, removed, updated
+
+
+class ClientCache:
+    def __init__(self, fetch: Callable[[], tuple[bool, list[ClientInfo]]], ttl: float = CLIENTS_TTL):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._value: tuple[bool, list[ClientInfo]] = (False, [])
+        self._fetched_at = 0.0
+
+    def get(self, force: bool = False) -> tuple[bool, list[ClientInfo]]:
+        with self._lock:
+            if force or time.monotonic() - self._fetched_at > self._ttl:
+                self._value = self._fetch()
+                self._fetched_at = time.monotonic()
+            ok, clients = self._value
+            return ok, list(clients)
+
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = 0.0
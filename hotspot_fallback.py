@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import retry_policy
+
+# Segundos que se espera al metodo actual antes de preparar el siguiente en paralelo.
+HEDGE_DELAY = float(os.environ.get("MYHOTSPOT_HEDGE_DELAY", "5"))
+# Segundos durante los que create_hotspot reutiliza la verificacion de prepare_hotspot.
+PREPARE_TTL = 60.0
+
+
+class PreparedPreflight:
+    # Resultado de prepare_hotspot guardado para el create_hotspot siguiente (mismo SSID y
+    # contrasena, y dentro de PREPARE_TTL). Se consume una sola vez.
+    def __init__(self, ttl: float = PREPARE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Optional[tuple] = None
+
+    def store(self, ssid: str, password: str, ok: bool, msg: str):
+        with self._lock:
+            self._value = (ssid, password, time.monotonic(), ok, msg)
+
+    def take(self, ssid: str, password: str) -> Optional[tuple[bool, str]]:
+        with self._lock:
+            prepared, self._value = self._value, None
+        if prepared is None:
+            return None
+        p_ssid, p_password, prepared_at, ok, msg = prepared
+        if (p_ssid, p_password) != (ssid, password) or time.monotonic() - prepared_at > self.ttl:
+            return None
+        return ok, msg
+
+    def clear(self):
+        with self._lock:
+            self._value = None
+
+
+def _start_prepare(manager, ssid: str, password: str) -> Optional[threading.Thread]:
+    prepare = getattr(manager, "prepare_hotspot", None)
+    if prepare is None:
+        return None
+
+    def run():
+        try:
+            prepare(ssid, password)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _discard_prepared(manager, prepare_thread: threading.Thread):
+    # El primario funciono: la preparacion del siguiente ya no sirve y no debe
+    # aprovecharla un create_hotspot posterior.
+    discard = getattr(manager, "discard_prepared", None)
+    if discard is None:
+        return
+
+    def run():
+        prepare_thread.join()
+        discard()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _run_hedged(manager, next_manager, ssid: str, password: str, hedge_delay: Optional[float], policy: retry_policy.RetryPolicy) -> tuple[tuple[bool, str], Optional[threading.Thread]]:
+    result: list[tuple[bool, str]] = []
+    done = threading.Event()
+
+    def run():
+        try:
+            # Un error transitorio se reintenta antes de pasar a otro metodo.
+            result.append(retry_policy.call(lambda: manager.create_hotspot(ssid, password), manager, policy))
+        except Exception as e:
+            result.append((False, f"Error inesperado: {str(e)}"))
+        finally:
+            done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+
+    prepare_thread = None
+    if next_manager is not None and hedge_delay is not None:
+        if not done.wait(hedge_delay):
+            # Solo pasos de lectura: los pasos que modifican el adaptador
+            # siguen siendo estrictamente secuenciales.
+            prepare_thread = _start_prepare(next_manager, ssid, password)
+
+    done.wait()
+    return result[0], prepare_thread
+
+
+def create_with_fallback(
+    backends: list,
+    ssid: str,
+    password: str,
+    hedge_delay: Optional[float] = HEDGE_DELAY,
+    policy: retry_policy.RetryPolicy = retry_policy.DEFAULT_POLICY
+) -> tuple[bool, list[str]]:
+    mensajes: list[str] = []
+    prepare_thread: Optional[threading.Thread] = None
+
+    for i, (descripcion, manager) in enumerate(backends):
+        if prepare_thread is not None:
+            prepare_thread.join()
+
+        next_manager = backends[i + 1][1] if i + 1 < len(backends) else None
+
+        mensajes.append(f"[METODO: {descripcion}]")
+        (ok, msg), prepare_thread = _run_hedged(manager, next_manager, ssid, password, hedge_delay, policy)
+        mensajes.append(msg)
+
+        if ok:
+            if prepare_thread is not None:
+                _discard_prepared(next_manager, prepare_thread)
+            return True, mensajes
+        mensajes.append("\n--- Intentando siguiente metodo...\n")
+
+    return False, mensajes
+
+
+@dataclass
+class TeardownResult:
+    descripcion: str
+    ok: bool
+    message: str
+    elapsed: float
+    # None = no se pudo consultar el estado.
+    active: Optional[bool]
+
+
+def _teardown_one(action: str, descripcion: str, load, required: bool, policy: retry_policy.RetryPolicy) -> TeardownResult:
+    start = time.perf_counter()
+    # El modulo se importa aqui, en el hilo del metodo, y no en el de la interfaz.
+    manager = load()
+    run = getattr(manager, f"{action}_hotspot")
+
+    if required:
+        # El metodo seleccionado se detiene o elimina siempre, con reintentos.
+        ok, msg = retry_policy.call(run, manager, policy)
+        return TeardownResult(descripcion, ok, msg, time.perf_counter() - start, None)
+
+    available = manager.is_available() if hasattr(manager, "is_available") else None
+    if available is False:
+        return TeardownResult(descripcion, True, "No disponible en este equipo, se omite.", time.perf_counter() - start, None)
+
+    # Los demas solo si estan encendidos: un 'stop' sobre una Hosted Network parada falla
+    # con un error reintentable y su accion correctiva tocaria un adaptador inactivo.
+    try:
+        state = manager.poll_state()
+    except Exception:
+        state = None
+    if state is None:
+        # Sin poder consultarlo (sin WinRT, sin adaptador) no puede estar activo.
+        return TeardownResult(descripcion, True, "No disponible en este equipo, se omite.", time.perf_counter() - start, None)
+    if state.get("state") == "Off":
+        return TeardownResult(descripcion, True, "No estaba activo.", time.perf_counter() - start, False)
+
+    ok, msg = retry_policy.call(run, manager, retry_policy.NO_RETRY)
+    return TeardownResult(descripcion, ok, msg, time.perf_counter() - start, True)
+
+
+def teardown_all(
+    backends: list,
+    action: str,
+    policy: retry_policy.RetryPolicy = retry_policy.DEFAULT_POLICY
+) -> tuple[bool, list[str]]:
+    # backends: (descripcion, cargador) con un cargador sin argumentos que devuelve el backend.
+    # Cada mecanismo se consulta y se apaga en su propio hilo: el tiempo total es el del mas
+    # lento, no la suma. El primero (el metodo seleccionado) siempre se intenta; los demas
+    # solo si estan encendidos, asi que uno inactivo nunca hace fallar el conjunto.
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(backends)), thread_name_prefix="myhotspot-teardown") as executor:
+        futures = [
+            executor.submit(_teardown_one, action, descripcion, load, i == 0, policy)
+            for i, (descripcion, load) in enumerate(backends)
+        ]
+        results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - start
+
+    mensajes: list[str] = []
+    for result in results:
+        mensajes.append(f"[METODO: {result.descripcion}] ({result.elapsed:.2f} s)")
+        mensajes.append(result.message)
+    mensajes.append(f"Tiempo total: {wall_time:.2f} s en paralelo (suma por metodo: {sum(r.elapsed for r in results):.2f} s)")
+    return all(result.ok for result in results), mensajes
+
+
+def stop_all(backends: list, policy: retry_policy.RetryPolicy = retry_policy.DEFAULT_POLICY) -> tuple[bool, list[str]]:
+    return teardown_all(backends, "stop", policy)
+
+
+def delete_all(backends: list, policy: retry_policy.RetryPolicy = retry_policy.DEFAULT_POLICY) -> tuple[bool, list[str]]:
+    return teardown_all(backends, "delete", policy)
@@ -1,21 +1,86 @@
 import subprocess
-import ctypes
+import threading
+import time
 import error_handler
+import diagnostics
+import environment
+import powershell_pool
+import powershell_launcher
+import hostednetwork
+import hotspot_fallback
+import hotspot_clients
+import hotspot_snapshot
+import state_journal
+import transcript
+import wifi_band
 from typing import Optional
 
+# Bandas que admite el adaptador (IsBandSupported solo existe desde Windows 11).
+_BANDS_SCRIPT = '''
+$bands = @()
+foreach ($name in @("TwoPointFourGigahertz", "FiveGigahertz", "SixGigahertz")) {
+    try {
+        if ($config.IsBandSupported([Windows.Networking.NetworkOperators.TetheringWiFiBand]::$name)) {
+            $bands += $name
+        }
+    } catch {
+        # IsBandSupported no existe antes de Windows 11
+    }
+}
+Write-Output "BANDS|$($bands -join ',')"
+'''
+
+# Banda y canal de la subida Wi-Fi (si la hay), dentro del mismo proceso.
+_UPSTREAM_BAND_SCRIPT = '''
+$upstreamBand = ""
+$upstreamChannel = ""
+if ($profile.IsWlanConnectionProfile) {
+    foreach ($line in (netsh wlan show interfaces)) {
+        if (-not $upstreamBand -and $line -match '^\s*(Band|Banda)\s*:\s*([0-9]+([.,][0-9]+)?)') {
+            $upstreamBand = $matches[2].Replace(",", ".")
+        } elseif (-not $upstreamChannel -and $line -match '^\s*(Channel|Canal)\s*:\s*([0-9]+)\s*$') {
+            $upstreamChannel = $matches[2]
+        }
+    }
+    # Sin linea de banda (Windows 10): por el numero de canal, como wifi_band.band_for_channel.
+    if (-not $upstreamBand -and $upstreamChannel) {
+        $channel = [int]$upstreamChannel
+        if ($channel -ge 1 -and $channel -le 14) {
+            $upstreamBand = "2.4"
+        } elseif ($channel -ge 32 -and $channel -le 177) {
+            $upstreamBand = "5"
+        }
+    }
+}
+Write-Output "UPSTREAM_BAND|$upstreamBand|$upstreamChannel"
+'''
+
+# Clientes conectados, una linea CLIENT por cada uno (requiere $tethering).
+_CLIENTS_SCRIPT = '''
+Write-Output "CLIENTS"
+foreach ($client in $tethering.GetTetheringClients()) {
+    $hostname = ""
+    $ip = ""
+    foreach ($name in $client.HostNames) {
+        $type = "$($name.Type)"
+        if ($type -eq "Ipv4" -and -not $ip) {
+            $ip = $name.CanonicalName
+        } elseif ($type -eq "DomainName" -and -not $hostname) {
+            $hostname = $name.DisplayName
+        }
+    }
+    Write-Output "CLIENT|$($client.MacAddress)|$ip|$hostname"
+}
+'''
+
 def is_admin() -> bool:
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
+    return environment.is_admin()
 
 def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handler.DebugInfo]:
+    start = time.perf_counter()
     try:
-        result = subprocess.run(
-            ["powershell", "-Command", command],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
+        result = transcript.run(
+            transcript.KIND_POWERSHELL, command, lambda: powershell_pool.run(powershell_pool.winrt_pool, command)
         )
         
         debug_info = error_handler.DebugLogger.log(
@@ -23,7 +88,9 @@ def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handl
             command=command,
             return_code=result.returncode,
             stdout=result.stdout,
-            stderr=result.stderr
+            stderr=result.stderr,
+            method="mobile",
+            duration=time.perf_counter() - start
         )
         
         if result.returncode == 0:
@@ -38,7 +105,9 @@ def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handl
             command=command,
             return_code=-1,
             stdout="",
-            stderr=str(e)
+            stderr=str(e),
+            method="mobile",
+            duration=time.perf_counter() - start
         )
         return False, str(e), debug_info
 
@@ -48,9 +117,34 @@ class WindowsMobileHotspot:
         self._ssid: Optional[str] = None
         self._password: Optional[str] = None
         self._is_running: bool = False
+        self._prepared = hotspot_fallback.PreparedPreflight()
+        self._band = wifi_band.BAND_AUTO
+        # Adaptadores WiFi -> bandas admitidas; no cambian, se vuelven a leer en "Diagnosticar".
+        self._supported_bands: dict = {}
+        self._band_choice: Optional[wifi_band.BandChoice] = None
+        self._clients = hotspot_clients.ClientCache(self._fetch_clients)
     
-    def _run_winrt_ps(self, inner_script: str, step: str) -> tuple[bool, str, error_handler.DebugInfo]:
-        full_script = f'''
+    def restore(self, ssid: str, password: Optional[str], running: bool):
+        # Estado provisional del diario hasta que la primera consulta lo confirme.
+        self._ssid = ssid
+        self._password = password
+        self._is_running = running
+    
+    def set_band(self, band: str):
+        if band not in wifi_band.BANDS:
+            band = wifi_band.BAND_AUTO
+        self._band = band
+    
+    def _bands_key(self):
+        return environment.get_environment().wireless_adapters
+    
+    def _store_bands(self, msg: str):
+        for line in msg.split("\n"):
+            if line.strip().startswith("BANDS|"):
+                self._supported_bands[self._bands_key()] = wifi_band.parse_bands(line.strip().split("|", 1)[1])
+    
+    def _winrt_script(self, inner_script: str) -> str:
+        return f'''
 [Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime] > $null
 [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime] > $null
 [Windows.Foundation.AsyncStatus,Windows,ContentType=WindowsRuntime] > $null
@@ -90,11 +184,13 @@ try {{
     Write-Output "ERROR: $($_.Exception.Message)"
 }}
 '''
-        return run_powershell(full_script, step)
     
-    def check_support(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
+    def _run_winrt_ps(self, inner_script: str, step: str) -> tuple[bool, str, error_handler.DebugInfo]:
+        return run_powershell(self._winrt_script(inner_script), step)
+    
+    @error_handler.traced("SNAPSHOT")
+    def snapshot(self) -> hotspot_snapshot.HotspotSnapshot:
+        # Soporte, configuracion, estado, clientes y conexion de subida en un solo proceso.
         script = '''
 $profile = [Windows.Networking.Connectivity.NetworkInformation]::GetInternetConnectionProfile()
 
@@ -107,32 +203,66 @@ $tethering = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManage
 $config = $tethering.GetCurrentAccessPointConfiguration()
 
 Write-Output "SUPPORTED"
-Write-Output "State: $($tethering.TetheringOperationalState)"
-Write-Output "MaxClients: $($tethering.MaxClientCount)"
-Write-Output "CurrentSSID: $($config.Ssid)"
-'''
+Write-Output "UPSTREAM|$($profile.ProfileName)"
+Write-Output "STATE|$($tethering.TetheringOperationalState)|$($tethering.ClientCount)|$($tethering.MaxClientCount)|$($config.Ssid)"
+try {
+    Write-Output "BAND|$($config.Band)"
+} catch {
+    # Band no existe antes de Windows 10 2004
+}
+''' + _CLIENTS_SCRIPT
+        if self._bands_key() not in self._supported_bands:
+            script += _BANDS_SCRIPT
         
-        success, msg, debug_info = self._run_winrt_ps(script, "CHECK_SUPPORT")
+        success, msg, debug_info = self._run_winrt_ps(script, "SNAPSHOT")
+        lines = [line.strip() for line in msg.split("\n")]
+        
+        if "SUPPORTED" not in lines:
+            return hotspot_snapshot.HotspotSnapshot(
+                "mobile", None, error=msg if msg else "No se pudo verificar soporte", debug_info=debug_info
+            )
+        
+        snap = hotspot_snapshot.HotspotSnapshot("mobile", True, debug_info=debug_info)
+        self._store_bands(msg)
+        if "CLIENTS" in lines:
+            snap.peers = _parse_clients(msg)
+        for line in lines:
+            state = _parse_state_line(line)
+            if state is not None:
+                snap.state = state["state"]
+                snap.clients = state["clients"]
+                snap.max_clients = state["max_clients"]
+                snap.ssid = state["ssid"]
+            elif line.startswith("UPSTREAM|"):
+                snap.upstream = line.split("|", 1)[1]
+            elif line.startswith("BAND|"):
+                snap.band = wifi_band.from_winrt(line.split("|", 1)[1])
+        
+        snap.detail = (
+            "Estado Mobile Hotspot:\n"
+            "======================\n"
+            f"SSID: {snap.ssid}\n"
+            f"Estado: {snap.state}\n"
+            f"Clientes: {snap.clients} / {snap.max_clients}\n"
+            f"Internet: {snap.upstream}"
+        )
+        choice = self._band_choice
+        if choice is not None and choice.band in (snap.band, wifi_band.BAND_AUTO):
+            snap.detail += f"\nBanda: {choice.describe()}"
+        elif snap.band:
+            snap.detail += f"\nBanda: {wifi_band.LABELS[snap.band]}"
+        return snap
+    
+    def format_support(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        msg = snap.error
         
         if error_handler.DebugLogger.is_enabled():
             full_report = error_handler.DebugLogger.get_full_report()
         else:
             full_report = ""
         
-        if "SUPPORTED" in msg:
-            state = "Unknown"
-            max_clients = "?"
-            ssid = ""
-            
-            for line in msg.split("\n"):
-                if "State:" in line:
-                    state = line.replace("State:", "").strip()
-                if "MaxClients:" in line:
-                    max_clients = line.replace("MaxClients:", "").strip()
-                if "CurrentSSID:" in line:
-                    ssid = line.replace("CurrentSSID:", "").strip()
-            
-            result_msg = f"Mobile Hotspot: COMPATIBLE\nEstado: {state}\nSSID actual: {ssid}\nClientes max: {max_clients}"
+        if snap.ok:
+            result_msg = f"Mobile Hotspot: COMPATIBLE\nEstado: {snap.state}\nSSID actual: {snap.ssid}\nClientes max: {snap.max_clients}"
             if full_report:
                 result_msg += f"\n\n{full_report}"
             return True, result_msg
@@ -164,16 +294,61 @@ Write-Output "CurrentSSID: $($config.Ssid)"
             result_msg += f"\n\n{full_report}"
         return False, result_msg
     
-    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
+    @error_handler.traced("VERIFICAR SOPORTE")
+    def check_support(self) -> tuple[bool, str]:
+        env_error = error_handler.check_environment_error(mobile_hotspot=True)
+        if env_error:
+            return False, env_error
+        return self.format_support(self.snapshot())
+    
+    def _preflight(self, password: str) -> tuple[bool, str]:
         admin_warning = error_handler.check_admin_error()
         if admin_warning:
             return False, admin_warning
         
+        env_error = error_handler.check_environment_error(mobile_hotspot=True)
+        if env_error:
+            return False, env_error
+        
         if len(password) < 8:
             return False, "La contrasena debe tener al menos 8 caracteres"
         
+        return True, "Preparado"
+    
+    @error_handler.traced("PREPARAR HOTSPOT")
+    def prepare_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        ok, msg = self._preflight(password)
+        if ok:
+            # Carga PowerShell y los tipos WinRT para que el arranque real sea en caliente.
+            self._run_winrt_ps('Write-Output "READY"', "PREPARAR")
+        self._prepared.store(ssid, password, ok, msg)
+        return ok, msg
+    
+    def discard_prepared(self):
+        self._prepared.clear()
+    
+    @error_handler.traced("CREAR HOTSPOT")
+    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        preflight = self._prepared.take(ssid, password)
+        if preflight is None:
+            preflight = self._preflight(password)
+        ready, ready_msg = preflight
+        if not ready:
+            return False, ready_msg
+        
+        # La banda depende de la subida Wi-Fi, que se lee dentro del script: se pasa la
+        # eleccion para cada banda de subida posible y el script aplica la que toca.
+        supported = self._supported_bands.get(self._bands_key(), [])
+        band_choice = wifi_band.choose_band(self._band, supported)
+        if not band_choice.ok:
+            return False, f"No se pudo iniciar Mobile Hotspot.\n\nBanda {band_choice.describe()}"
+        band_names = "; ".join(
+            f'"{upstream}" = "{"" if choice.band == wifi_band.BAND_AUTO else wifi_band.WINRT_NAMES[choice.band]}"'
+            for upstream, choice in (
+                (upstream, wifi_band.choose_band(self._band, supported, upstream)) for upstream in wifi_band.UPSTREAM_BANDS
+            )
+        )
+        
         self._ssid = ssid
         self._password = password
         
@@ -188,14 +363,58 @@ if ($profile -eq $null) {{
 $tethering = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager]::CreateFromConnectionProfile($profile)
 
 $config = $tethering.GetCurrentAccessPointConfiguration()
-$config.Ssid = "{ssid}"
-$config.Passphrase = "{password}"
+$state = "$($tethering.TetheringOperationalState)"
+{_BANDS_SCRIPT}
+{_UPSTREAM_BAND_SCRIPT}
+$bandNames = @{{ {band_names} }}
+$bandName = $bandNames[$upstreamBand]
+$band = $null
+if ($bandName) {{
+    try {{
+        $band = [Windows.Networking.NetworkOperators.TetheringWiFiBand]::$bandName
+    }} catch {{
+        # TetheringWiFiBand no existe: se deja la banda que elija Windows
+        $band = $null
+    }}
+}}
+$sameBand = ($band -eq $null) -or ($config.Band -eq $band)
+$sameConfig = ($config.Ssid -ceq "{ssid}") -and ($config.Passphrase -ceq "{password}") -and $sameBand
 
-try {{
-    $configOp = $tethering.ConfigureAccessPointAsync($config)
-    $null = Await-AsyncOperation $configOp
-}} catch {{
-    # Continuar aunque falle la configuracion
+if ($sameConfig -and $state -eq "On") {{
+    Write-Output "PATH: noop"
+    Write-Output "SUCCESS: Hotspot '{ssid}' ya estaba activo"
+    return
+}}
+
+if ($sameConfig) {{
+    Write-Output "PATH: start"
+}} else {{
+    Write-Output "PATH: reconfigure"
+
+    if ($state -eq "On") {{
+        try {{
+            $null = Await-AsyncOperation $tethering.StopTetheringAsync()
+        }} catch {{
+            # La nueva configuracion se aplicara en el siguiente arranque
+        }}
+    }}
+
+    $config.Ssid = "{ssid}"
+    $config.Passphrase = "{password}"
+    if ($band -ne $null) {{
+        try {{
+            $config.Band = $band
+        }} catch {{
+            # Banda rechazada por el adaptador: Windows usa la anterior
+        }}
+    }}
+
+    try {{
+        $configOp = $tethering.ConfigureAccessPointAsync($config)
+        $null = Await-AsyncOperation $configOp
+    }} catch {{
+        # Continuar aunque falle la configuracion
+    }}
 }}
 
 $startOp = $tethering.StartTetheringAsync()
@@ -233,9 +452,27 @@ Write-Output "ERROR: Timeout esperando activacion del hotspot"
         else:
             full_report = ""
         
+        plan = hostednetwork.PLAN_RECONFIGURE
+        for line in msg.split("\n"):
+            if line.startswith("PATH:"):
+                plan = line.replace("PATH:", "").strip()
+        for line in msg.split("\n"):
+            parts = line.strip().split("|")
+            if len(parts) == 3 and parts[0] == "UPSTREAM_BAND":
+                upstream_band = parts[1] if parts[1] in wifi_band.UPSTREAM_BANDS else ""
+                upstream_channel = int(parts[2]) if parts[2].isdigit() else None
+                band_choice = wifi_band.choose_band(self._band, supported, upstream_band, upstream_channel)
+        self._store_bands(msg)
+        path_note = f"Ruta: {hostednetwork.PLAN_DESCRIPTIONS.get(plan, plan)}\nBanda: {band_choice.describe()}"
+        
         if "SUCCESS" in msg:
             self._is_running = True
-            result_msg = f"Mobile Hotspot '{ssid}' creado exitosamente!\n\nLa conexion a internet se compartira automaticamente."
+            self._band_choice = band_choice
+            state_journal.record_applied("mobile", ssid, password)
+            if plan == hostednetwork.PLAN_NOOP:
+                result_msg = f"Mobile Hotspot '{ssid}' ya estaba activo.\n{path_note}"
+            else:
+                result_msg = f"Mobile Hotspot '{ssid}' creado exitosamente!\n{path_note}\n\nLa conexion a internet se compartira automaticamente."
             if full_report:
                 result_msg += f"\n\n{full_report}"
             return True, result_msg
@@ -255,14 +492,14 @@ Write-Output "ERROR: Timeout esperando activacion del hotspot"
             error_msg += f"\n\n{full_report}"
         return False, error_msg
     
+    @error_handler.traced("DETENER HOTSPOT")
     def stop_hotspot(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
         script = '''
 $profile = [Windows.Networking.Connectivity.NetworkInformation]::GetInternetConnectionProfile()
 
 if ($profile -eq $null) {
-    Write-Output "ERROR: No hay conexion a internet"
+    # Sin conexion que compartir Windows ya apago el hotspot.
+    Write-Output "SUCCESS: Hotspot detenido (sin conexion a internet)"
     return
 }
 
@@ -305,6 +542,7 @@ Write-Output "ERROR: Timeout esperando apagado del hotspot"
         
         if "SUCCESS" in msg:
             self._is_running = False
+            state_journal.record_state("mobile", "Off")
             result_msg = "Mobile Hotspot detenido."
             if full_report:
                 result_msg += f"\n\n{full_report}"
@@ -315,10 +553,40 @@ Write-Output "ERROR: Timeout esperando apagado del hotspot"
             error_msg += f"\n\n{full_report}"
         return False, error_msg
     
-    def get_status(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
+    def format_status(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        if error_handler.DebugLogger.is_enabled():
+            full_report = error_handler.DebugLogger.get_full_report()
+        else:
+            full_report = ""
         
-        script = '''
+        if snap.ok:
+            msg = snap.detail
+        elif "NO_INTERNET" in snap.error:
+            msg = "ERROR: No hay conexion a internet"
+        else:
+            msg = snap.error
+        
+        if full_report:
+            return snap.ok, f"{msg}\n\n{full_report}"
+        return snap.ok, msg
+    
+    @error_handler.traced("ESTADO")
+    def get_status(self) -> tuple[bool, str]:
+        return self.format_status(self.snapshot())
+    
+    def is_available(self) -> Optional[bool]:
+        return environment.available("tethering")
+    
+    @error_handler.traced("SONDEO")
+    def poll_state(self) -> Optional[dict]:
+        snap = self.snapshot()
+        if not snap.ok:
+            return None
+        return snap.to_monitor_state()
+    
+    def subscribe_state(self, emit, stop_event: threading.Event) -> bool:
+        # Un solo proceso de PowerShell que solo escribe cuando cambia el estado.
+        script = self._winrt_script('''
 $profile = [Windows.Networking.Connectivity.NetworkInformation]::GetInternetConnectionProfile()
 
 if ($profile -eq $null) {
@@ -327,33 +595,142 @@ if ($profile -eq $null) {
 }
 
 $tethering = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager]::CreateFromConnectionProfile($profile)
-$config = $tethering.GetCurrentAccessPointConfiguration()
-
-Write-Output "Estado Mobile Hotspot:"
-Write-Output "======================"
-Write-Output "SSID: $($config.Ssid)"
-Write-Output "Estado: $($tethering.TetheringOperationalState)"
-Write-Output "Clientes: $($tethering.ClientCount) / $($tethering.MaxClientCount)"
-'''
+# WinRT no publica un evento de cambio de tethering: se consulta al cambiar la red
+# (NetworkStatusChanged) y, sin eventos, cada vez mas espaciado (2 s a 30 s) para los clientes.
+$subscribed = $true
+try {
+    Register-ObjectEvent -InputObject ([Windows.Networking.Connectivity.NetworkInformation]) -EventName NetworkStatusChanged -SourceIdentifier MyHotspotNetwork | Out-Null
+} catch {
+    $subscribed = $false
+}
+$last = ""
+$interval = 2
+while ($true) {
+    $config = $tethering.GetCurrentAccessPointConfiguration()
+    # Las lineas CLIENT van antes de la linea STATE a la que pertenecen.
+    $lines = @()
+    foreach ($client in $tethering.GetTetheringClients()) {
+        $hostname = ""
+        $ip = ""
+        foreach ($name in $client.HostNames) {
+            $type = "$($name.Type)"
+            if ($type -eq "Ipv4" -and -not $ip) {
+                $ip = $name.CanonicalName
+            } elseif ($type -eq "DomainName" -and -not $hostname) {
+                $hostname = $name.DisplayName
+            }
+        }
+        $lines += "CLIENT|$($client.MacAddress)|$ip|$hostname"
+    }
+    $lines += "STATE|$($tethering.TetheringOperationalState)|$($tethering.ClientCount)|$($tethering.MaxClientCount)|$($config.Ssid)"
+    $text = $lines -join "`n"
+    if ($text -ne $last) {
+        [Console]::Out.WriteLine($text)
+        [Console]::Out.Flush()
+        $last = $text
+        $interval = 2
+    } else {
+        $interval = [Math]::Min($interval * 2, 30)
+    }
+    if ($subscribed) {
+        if (Wait-Event -SourceIdentifier MyHotspotNetwork -Timeout $interval) {
+            # Una rafaga de eventos cuenta como un solo cambio.
+            Start-Sleep -Milliseconds 300
+            Remove-Event -SourceIdentifier MyHotspotNetwork -ErrorAction SilentlyContinue
+            $interval = 2
+        }
+    } else {
+        Start-Sleep -Seconds $interval
+    }
+}
+''')
+        if transcript.replaying():
+            # Un proceso continuo no se puede reproducir: el monitor sondea.
+            return False
+        try:
+            process = powershell_launcher.launcher.popen(
+                script,
+                requires_winrt=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        except Exception:
+            return False
         
-        success, msg, debug_info = self._run_winrt_ps(script, "GET_STATUS")
+        def watch_stop():
+            stop_event.wait()
+            process.kill()
         
-        if error_handler.DebugLogger.is_enabled():
-            full_report = error_handler.DebugLogger.get_full_report()
-        else:
-            full_report = ""
+        threading.Thread(target=watch_stop, daemon=True).start()
         
-        if "Estado Mobile Hotspot" in msg:
-            if full_report:
-                return True, f"{msg}\n\n{full_report}"
-            return True, msg
+        received = False
+        peers = []
+        for line in process.stdout:
+            client = _parse_client_line(line)
+            if client is not None:
+                peers.append(client)
+                continue
+            state = _parse_state_line(line)
+            if state is not None:
+                received = True
+                state["peers"] = peers
+                peers = []
+                emit(state)
         
-        if full_report:
-            return False, f"{msg}\n\n{full_report}"
-        return False, msg
+        process.wait()
+        return received and stop_event.is_set()
+    
+    def _fetch_clients(self) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+        script = '''
+$profile = [Windows.Networking.Connectivity.NetworkInformation]::GetInternetConnectionProfile()
+
+if ($profile -eq $null) {
+    Write-Output "ERROR: No hay conexion a internet"
+    return
+}
+
+$tethering = [Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager]::CreateFromConnectionProfile($profile)
+''' + _CLIENTS_SCRIPT
+        success, msg, debug_info = self._run_winrt_ps(script, "OBTENER CLIENTES")
+        if "CLIENTS" not in msg:
+            return False, []
+        return True, _parse_clients(msg)
+    
+    @error_handler.traced("CLIENTES")
+    def get_clients(self, force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+        return self._clients.get(force)
     
     def diagnose(self) -> str:
-        return error_handler.diagnose_network()
+        self._supported_bands.clear()
+        return diagnostics.diagnose("mobile")
+
+
+def _parse_client_line(line: str) -> Optional[hotspot_clients.ClientInfo]:
+    parts = line.strip().split("|", 3)
+    if len(parts) != 4 or parts[0] != "CLIENT":
+        return None
+    return hotspot_clients.ClientInfo(hotspot_clients.normalize_mac(parts[1]), parts[3], parts[2])
+
+
+def _parse_clients(msg: str) -> list[hotspot_clients.ClientInfo]:
+    return [client for client in map(_parse_client_line, msg.split("\n")) if client is not None]
+
+
+def _parse_state_line(line: str) -> Optional[dict]:
+    parts = line.strip().split("|", 4)
+    if len(parts) != 5 or parts[0] != "STATE":
+        return None
+    
+    def to_int(value: str) -> int:
+        return int(value) if value.strip().isdigit() else 0
+    
+    return {
+        "state": parts[1],
+        "clients": to_int(parts[2]),
+        "max_clients": to_int(parts[3]),
+        "ssid": parts[4],
+    }
 
 
 _manager = WindowsMobileHotspot()
@@ -361,17 +738,56 @@ _manager = WindowsMobileHotspot()
 def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
     return _manager.create_hotspot(ssid, password)
 
+def prepare_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    return _manager.prepare_hotspot(ssid, password)
+
+def discard_prepared():
+    _manager.discard_prepared()
+
 def stop_hotspot() -> tuple[bool, str]:
     return _manager.stop_hotspot()
 
 def delete_hotspot() -> tuple[bool, str]:
-    return _manager.stop_hotspot()
+    ok, msg = _manager.stop_hotspot()
+    if ok:
+        state_journal.forget("mobile")
+    return ok, msg
+
+def restore(ssid: str, password: Optional[str], running: bool):
+    _manager.restore(ssid, password, running)
+
+def set_band(band: str):
+    _manager.set_band(band)
 
 def get_status() -> tuple[bool, str]:
     return _manager.get_status()
 
+def snapshot() -> hotspot_snapshot.HotspotSnapshot:
+    return _manager.snapshot()
+
+def format_status(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_status(snap)
+
+def format_support(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_support(snap)
+
 def check_support() -> tuple[bool, str]:
     return _manager.check_support()
 
+def is_available() -> Optional[bool]:
+    return _manager.is_available()
+
+def poll_state() -> Optional[dict]:
+    return _manager.poll_state()
+
+def subscribe_state(emit, stop_event: threading.Event) -> bool:
+    return _manager.subscribe_state(emit, stop_event)
+
+def get_clients(force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+    return _manager.get_clients(force)
+
+def warm_up():
+    powershell_pool.winrt_pool.warm_up()
+
 def diagnose() -> str:
     return _manager.diagnose()
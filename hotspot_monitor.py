@@ -0,0 +1,100 @@
+import threading
+from typing import Callable, Optional
+
+MIN_INTERVAL = 2.0
+MAX_INTERVAL = 30.0
+BACKOFF = 1.5
+
+MONITOR_FIELDS = ("state", "ssid", "clients", "max_clients", "peers")
+
+
+class HotspotMonitor:
+    def __init__(
+        self,
+        poll: Callable[[], Optional[dict]],
+        on_change: Callable[[dict], None],
+        subscribe: Optional[Callable[[Callable[[dict], None], threading.Event], bool]] = None,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+    ):
+        self._poll = poll
+        self._on_change = on_change
+        self._subscribe = subscribe
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._last: dict = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.interval = min_interval
+        self.polls = 0
+
+    @classmethod
+    def for_backend(cls, manager, on_change: Callable[[dict], None], **kwargs) -> "HotspotMonitor":
+        return cls(
+            manager.poll_state,
+            on_change,
+            subscribe=getattr(manager, "subscribe_state", None),
+            **kwargs,
+        )
+
+    @property
+    def last_state(self) -> dict:
+        with self._lock:
+            return dict(self._last)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _emit(self, state: dict) -> bool:
+        with self._lock:
+            changed = {
+                key: state[key]
+                for key in MONITOR_FIELDS
+                if key in state and self._last.get(key) != state[key]
+            }
+            self._last.update(changed)
+
+        if changed:
+            self._on_change(changed)
+        return bool(changed)
+
+    def _run(self):
+        if self._subscribe is not None:
+            try:
+                # Devuelve False si las notificaciones no estan disponibles.
+                if self._subscribe(self._emit, self._stop_event):
+                    return
+            except Exception:
+                pass
+
+        self._poll_loop()
+
+    def _poll_loop(self):
+        self.interval = self._min_interval
+        while not self._stop_event.is_set():
+            try:
+                state = self._poll()
+            except Exception:
+                state = None
+            self.polls += 1
+
+            if state is not None and self._emit(state):
+                self.interval = self._min_interval
+            else:
+                self.interval = min(self.interval * BACKOFF, self._max_interval)
+
+            self._stop_event.wait(self.interval)
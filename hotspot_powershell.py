@@ -1,20 +1,26 @@
-import subprocess
-import ctypes
+import time
+from typing import Optional
 import error_handler
+import diagnostics
+import environment
+import powershell_pool
+import hostednetwork
+import hotspot_clients
+import hotspot_fallback
+import hotspot_snapshot
+import state_journal
+import transcript
+
+_prepared = hotspot_fallback.PreparedPreflight()
 
 def is_admin() -> bool:
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
+    return environment.is_admin()
 
 def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handler.DebugInfo]:
+    start = time.perf_counter()
     try:
-        result = subprocess.run(
-            ["powershell", "-Command", command],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
+        result = transcript.run(
+            transcript.KIND_POWERSHELL, command, lambda: powershell_pool.run(powershell_pool.plain_pool, command)
         )
         
         debug_info = error_handler.DebugLogger.log(
@@ -22,7 +28,9 @@ def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handl
             command=command,
             return_code=result.returncode,
             stdout=result.stdout,
-            stderr=result.stderr
+            stderr=result.stderr,
+            method="powershell",
+            duration=time.perf_counter() - start
         )
         
         if result.returncode == 0:
@@ -37,7 +45,9 @@ def run_powershell(command: str, step: str = "") -> tuple[bool, str, error_handl
             command=command,
             return_code=-1,
             stdout="",
-            stderr=str(e)
+            stderr=str(e),
+            method="powershell",
+            duration=time.perf_counter() - start
         )
         return False, str(e), debug_info
 
@@ -72,13 +82,15 @@ Usa el Mobile Hotspot de Windows:
   2. Activa "Compartir mi conexion a Internet"
 """
 
-def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
-    error_handler.DebugLogger.clear()
-    
+def _preflight(password: str) -> tuple[bool, str]:
     admin_warning = error_handler.check_admin_error()
     if admin_warning:
         return False, admin_warning
     
+    env_error = error_handler.check_environment_error()
+    if env_error:
+        return False, env_error
+    
     supported, support_msg = _check_hosted_network_support()
     if not supported:
         if error_handler.DebugLogger.is_enabled():
@@ -88,71 +100,139 @@ def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "La contrasena debe tener al menos 8 caracteres"
     
-    set_cmd = f'netsh wlan set hostednetwork mode=allow ssid="{ssid}" key="{password}"'
-    success, msg, debug_info = run_powershell(set_cmd, "CONFIGURAR HOTSPOT")
-    
+    return True, "Preparado"
+
+@error_handler.traced("PREPARAR HOTSPOT")
+def prepare_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    ok, msg = _preflight(password)
+    _prepared.store(ssid, password, ok, msg)
+    return ok, msg
+
+def discard_prepared():
+    _prepared.clear()
+
+def _read_current() -> Optional[dict]:
+    success, msg, _ = run_powershell("; ".join(hostednetwork.READ_COMMANDS), "LEER CONFIGURACION")
     if not success:
-        return False, f"Error al configurar el hotspot.\n\n{error_handler.format_error(msg, debug_info)}"
+        return None
+    return hostednetwork.parse_hostednetwork(msg)
+
+@error_handler.traced("CREAR HOTSPOT")
+def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    current = _read_current()
+    plan = hostednetwork.plan_apply(current, ssid, password)
+    path_note = f"Ruta: {hostednetwork.PLAN_DESCRIPTIONS[plan]}"
+    
+    if plan == hostednetwork.PLAN_NOOP:
+        state_journal.record_applied("powershell", ssid, password)
+        if error_handler.DebugLogger.is_enabled():
+            return True, f"Hotspot '{ssid}' ya estaba activo.\n{path_note}\n\n{error_handler.DebugLogger.get_full_report()}"
+        return True, f"Hotspot '{ssid}' ya estaba activo.\n{path_note}"
+    
+    preflight = _prepared.take(ssid, password)
+    if preflight is None:
+        preflight = _preflight(password)
+    ready, ready_msg = preflight
+    if not ready:
+        return False, ready_msg
+    
+    if plan == hostednetwork.PLAN_RECONFIGURE:
+        if current is not None and current["started"]:
+            run_powershell("netsh wlan stop hostednetwork", "DETENER PARA RECONFIGURAR")
+        
+        set_cmd = f'netsh wlan set hostednetwork mode=allow ssid="{ssid}" key="{password}"'
+        success, msg, debug_info = run_powershell(set_cmd, "CONFIGURAR HOTSPOT")
+        
+        if not success:
+            return False, f"Error al configurar el hotspot.\n\n{error_handler.format_error(msg, debug_info)}"
     
     start_cmd = "netsh wlan start hostednetwork"
     success, msg, debug_info = run_powershell(start_cmd, "INICIAR HOTSPOT")
     
     if success:
+        state_journal.record_applied("powershell", ssid, password)
         if error_handler.DebugLogger.is_enabled():
-            return True, f"Hotspot '{ssid}' creado exitosamente.\n\n{error_handler.DebugLogger.get_full_report()}"
-        return True, f"Hotspot '{ssid}' creado exitosamente.\n\nNOTA: Para compartir internet:\n1. Centro de redes > Cambiar configuracion del adaptador\n2. Propiedades del adaptador con internet > Comargar\n3. Selecciona 'Conexion de area local*'"
+            return True, f"Hotspot '{ssid}' creado exitosamente.\n{path_note}\n\n{error_handler.DebugLogger.get_full_report()}"
+        return True, f"Hotspot '{ssid}' creado exitosamente.\n{path_note}\n\nNOTA: Para compartir internet:\n1. Centro de redes > Cambiar configuracion del adaptador\n2. Propiedades del adaptador con internet > Comargar\n3. Selecciona 'Conexion de area local*'"
     
     return False, f"No se pudo iniciar el hotspot.\n\n{error_handler.format_error(msg, debug_info)}"
 
+@error_handler.traced("DETENER HOTSPOT")
 def stop_hotspot() -> tuple[bool, str]:
-    error_handler.DebugLogger.clear()
-    
     success, msg, debug_info = run_powershell("netsh wlan stop hostednetwork", "DETENER HOTSPOT")
     
     if success:
+        state_journal.record_state("powershell", "Off")
         if error_handler.DebugLogger.is_enabled():
             return True, f"Hotspot detenido.\n\n{error_handler.DebugLogger.get_full_report()}"
         return True, "Hotspot detenido exitosamente."
     
     return False, f"No se pudo detener el hotspot.\n\n{error_handler.format_error(msg, debug_info)}"
 
+@error_handler.traced("ELIMINAR HOTSPOT")
 def delete_hotspot() -> tuple[bool, str]:
-    error_handler.DebugLogger.clear()
-    
     stop_success, stop_msg = stop_hotspot()
-    error_handler.DebugLogger.clear()
     
     set_cmd = "netsh wlan set hostednetwork mode=disallow"
     success, msg, debug_info = run_powershell(set_cmd, "ELIMINAR HOTSPOT")
     
     if success:
+        state_journal.forget("powershell")
         if error_handler.DebugLogger.is_enabled():
             return True, f"Hotspot eliminado.\n\n{error_handler.DebugLogger.get_full_report()}"
         return True, "Hotspot eliminado exitosamente."
     
     return False, f"No se pudo eliminar el hotspot.\n\n{error_handler.format_error(msg, debug_info)}"
 
-def get_status() -> tuple[bool, str]:
-    error_handler.DebugLogger.clear()
-    
-    success, msg, debug_info = run_powershell("netsh wlan show hostednetwork", "OBTENER ESTADO")
-    
-    if success:
+@error_handler.traced("REINICIAR HOSTED NETWORK")
+def reset_hostednetwork() -> tuple[bool, str]:
+    # Accion correctiva entre reintentos: deshabilitar y volver a habilitar.
+    run_powershell("netsh wlan set hostednetwork mode=disallow", "DESHABILITAR HOSTED NETWORK")
+    return run_powershell("netsh wlan set hostednetwork mode=allow", "HABILITAR HOSTED NETWORK")[:2]
+
+@error_handler.traced("SNAPSHOT")
+def snapshot() -> hotspot_snapshot.HotspotSnapshot:
+    success, msg, debug_info = run_powershell(hostednetwork.snapshot_command("; "), "OBTENER SNAPSHOT")
+    return hotspot_snapshot.from_netsh("powershell", 0 if success else 1, msg, "" if success else msg, debug_info)
+
+def format_status(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    if snap.ok:
         if error_handler.DebugLogger.is_enabled():
-            return True, f"{msg}\n\n{error_handler.DebugLogger.get_full_report()}"
-        return True, msg
+            return True, f"{snap.detail}\n\n{error_handler.DebugLogger.get_full_report()}"
+        return True, snap.detail
     
-    return False, error_handler.format_error(msg, debug_info)
+    return False, error_handler.format_error(snap.error, snap.debug_info)
 
-def check_support() -> tuple[bool, str]:
-    error_handler.DebugLogger.clear()
-    
-    success, msg, debug_info = run_powershell("netsh wlan show drivers", "VERIFICAR COMPATIBILIDAD")
-    
-    if success:
-        if "hosted network supported" in msg.lower():
-            after_supported = msg.lower().split("hosted network supported")[1][:30]
-            if "yes" in after_supported:
+@error_handler.traced("ESTADO")
+def get_status() -> tuple[bool, str]:
+    return format_status(snapshot())
+
+def is_available() -> Optional[bool]:
+    return environment.available("hostednetwork")
+
+@error_handler.traced("SONDEO")
+def poll_state() -> Optional[dict]:
+    snap = snapshot()
+    if not snap.ok:
+        return None
+    return snap.to_monitor_state()
+
+def _fetch_clients() -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+    success, msg, _ = run_powershell("netsh wlan show hostednetwork; arp -a", "OBTENER CLIENTES")
+    if not success:
+        return False, []
+    return True, hotspot_clients.clients_from_netsh(msg, hotspot_clients.RESOLVE_TIMEOUT)
+
+_clients = hotspot_clients.ClientCache(_fetch_clients)
+
+@error_handler.traced("CLIENTES")
+def get_clients(force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+    return _clients.get(force)
+
+def format_support(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    if snap.ok:
+        if snap.supported is not None:
+            if snap.supported:
                 admin_note = ""
                 if not is_admin():
                     admin_note = "\n\nADVERTENCIA: No estas ejecutando como Administrador."
@@ -160,11 +240,7 @@ def check_support() -> tuple[bool, str]:
                     return True, f"Adaptador COMPATIBLE.{admin_note}\n\n{error_handler.DebugLogger.get_full_report()}"
                 return True, f"Tu adaptador WiFi es COMPATIBLE con Hosted Network.{admin_note}"
             
-            adapter_name = ""
-            for line in msg.split("\n"):
-                if "Interface name" in line:
-                    adapter_name = line.split(":")[-1].strip() if ":" in line else ""
-                    break
+            adapter_name = snap.adapter
             
             error_msg = f"""ADAPTADOR NO COMPATIBLE DETECTADO
 ================================
@@ -182,7 +258,14 @@ Usa Mobile Hotspot de Windows:
                 error_msg += f"\n{error_handler.DebugLogger.get_full_report()}"
             return False, error_msg
     
-    return False, f"No se pudo verificar compatibilidad.\n\n{error_handler.format_error(msg, debug_info)}"
+    return False, f"No se pudo verificar compatibilidad.\n\n{error_handler.format_error(snap.error or snap.detail, snap.debug_info)}"
+
+@error_handler.traced("VERIFICAR SOPORTE")
+def check_support() -> tuple[bool, str]:
+    return format_support(snapshot())
+
+def warm_up():
+    powershell_pool.plain_pool.warm_up()
 
 def diagnose() -> str:
-    return error_handler.diagnose_network()
+    return diagnostics.diagnose("powershell")
@@ -1,30 +1,38 @@
 import subprocess
-import ctypes
 import re
+import time
 from typing import Optional
 import error_handler
+import diagnostics
+import environment
+import hostednetwork
+import hotspot_fallback
+import hotspot_clients
+import hotspot_snapshot
+import state_journal
+import transcript
 
 def is_admin() -> bool:
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
+    return environment.is_admin()
 
 def run_command(cmd: str, step: str = "") -> tuple[int, str, str, error_handler.DebugInfo]:
+    start = time.perf_counter()
     try:
-        result = subprocess.run(
+        result = transcript.run(transcript.KIND_COMMAND, cmd, lambda: subprocess.run(
             cmd,
             shell=True,
             capture_output=True,
             text=True,
             creationflags=subprocess.CREATE_NO_WINDOW
-        )
+        ))
         debug_info = error_handler.DebugLogger.log(
             step=step,
             command=cmd,
             return_code=result.returncode,
             stdout=result.stdout,
-            stderr=result.stderr
+            stderr=result.stderr,
+            method="python",
+            duration=time.perf_counter() - start
         )
         return result.returncode, result.stdout, result.stderr, debug_info
     except Exception as e:
@@ -33,7 +41,9 @@ def run_command(cmd: str, step: str = "") -> tuple[int, str, str, error_handler.
             command=cmd,
             return_code=-1,
             stdout="",
-            stderr=str(e)
+            stderr=str(e),
+            method="python",
+            duration=time.perf_counter() - start
         )
         return -1, "", str(e), debug_info
 
@@ -42,6 +52,8 @@ class HotspotManager:
         self._ssid: Optional[str] = None
         self._password: Optional[str] = None
         self._is_running: bool = False
+        self._prepared = hotspot_fallback.PreparedPreflight()
+        self._clients = hotspot_clients.ClientCache(self._fetch_clients)
     
     @property
     def ssid(self) -> Optional[str]:
@@ -51,6 +63,12 @@ class HotspotManager:
     def is_running(self) -> bool:
         return self._is_running
     
+    def restore(self, ssid: str, password: Optional[str], running: bool):
+        # Estado provisional del diario hasta que la primera consulta lo confirme.
+        self._ssid = ssid
+        self._password = password
+        self._is_running = running
+    
     def validate_password(self, password: str) -> tuple[bool, str]:
         if len(password) < 8:
             return False, "La contrasena debe tener al menos 8 caracteres"
@@ -95,13 +113,15 @@ Usa el Mobile Hotspot de Windows:
   2. Activa "Compartir mi conexion a Internet"
 """
     
-    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
+    def _preflight(self, ssid: str, password: str) -> tuple[bool, str]:
         admin_warning = error_handler.check_admin_error()
         if admin_warning:
             return False, admin_warning
         
+        env_error = error_handler.check_environment_error()
+        if env_error:
+            return False, env_error
+        
         supported, support_msg = self._check_hosted_network_support()
         if not supported:
             if error_handler.DebugLogger.is_enabled():
@@ -116,35 +136,79 @@ Usa el Mobile Hotspot de Windows:
         if not valid_pwd:
             return False, pwd_msg
         
+        return True, "Preparado"
+    
+    @error_handler.traced("PREPARAR HOTSPOT")
+    def prepare_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        ok, msg = self._preflight(ssid, password)
+        self._prepared.store(ssid, password, ok, msg)
+        return ok, msg
+    
+    def discard_prepared(self):
+        self._prepared.clear()
+    
+    def _read_current(self) -> Optional[dict]:
+        code, out, err, _ = run_command(" & ".join(hostednetwork.READ_COMMANDS), "LEER CONFIGURACION")
+        if code != 0:
+            return None
+        return hostednetwork.parse_hostednetwork(out)
+    
+    @error_handler.traced("CREAR HOTSPOT")
+    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        current = self._read_current()
+        plan = hostednetwork.plan_apply(current, ssid, password)
+        path_note = f"Ruta: {hostednetwork.PLAN_DESCRIPTIONS[plan]}"
+        
+        if plan == hostednetwork.PLAN_NOOP:
+            self._ssid = ssid
+            self._password = password
+            self._is_running = True
+            state_journal.record_applied("python", ssid, password)
+            if error_handler.DebugLogger.is_enabled():
+                return True, f"Hotspot '{ssid}' ya estaba activo.\n{path_note}\n\n{error_handler.DebugLogger.get_full_report()}"
+            return True, f"Hotspot '{ssid}' ya estaba activo.\n{path_note}"
+        
+        preflight = self._prepared.take(ssid, password)
+        if preflight is None:
+            preflight = self._preflight(ssid, password)
+        ready, ready_msg = preflight
+        if not ready:
+            return False, ready_msg
+        
         self._ssid = ssid
         self._password = password
         
-        set_cmd = f'netsh wlan set hostednetwork mode=allow ssid="{ssid}" key="{password}"'
-        code, out, err, debug_info = run_command(set_cmd, "CONFIGURAR HOTSPOT")
-        
-        if code != 0:
-            error_msg = err if err else out
-            return False, f"Error al configurar el hotspot.\n\n{error_handler.format_error(error_msg, debug_info)}"
+        if plan == hostednetwork.PLAN_RECONFIGURE:
+            if current is not None and current["started"]:
+                run_command("netsh wlan stop hostednetwork", "DETENER PARA RECONFIGURAR")
+            
+            set_cmd = f'netsh wlan set hostednetwork mode=allow ssid="{ssid}" key="{password}"'
+            code, out, err, debug_info = run_command(set_cmd, "CONFIGURAR HOTSPOT")
+            
+            if code != 0:
+                error_msg = err if err else out
+                return False, f"Error al configurar el hotspot.\n\n{error_handler.format_error(error_msg, debug_info)}"
         
         start_cmd = "netsh wlan start hostednetwork"
         code, out, err, debug_info = run_command(start_cmd, "INICIAR HOTSPOT")
         
         if code == 0:
             self._is_running = True
+            state_journal.record_applied("python", ssid, password)
             if error_handler.DebugLogger.is_enabled():
-                return True, f"Hotspot '{ssid}' creado exitosamente.\n\n{error_handler.DebugLogger.get_full_report()}"
-            return True, f"Hotspot '{ssid}' creado exitosamente.\n\nNOTA: Para compartir internet:\n1. Centro de redes > Cambiar configuracion del adaptador\n2. Propiedades del adaptador con internet > Comargar\n3. Selecciona 'Conexion de area local*'"
+                return True, f"Hotspot '{ssid}' creado exitosamente.\n{path_note}\n\n{error_handler.DebugLogger.get_full_report()}"
+            return True, f"Hotspot '{ssid}' creado exitosamente.\n{path_note}\n\nNOTA: Para compartir internet:\n1. Centro de redes > Cambiar configuracion del adaptador\n2. Propiedades del adaptador con internet > Comargar\n3. Selecciona 'Conexion de area local*'"
         
         error_msg = err if err else out
         return False, f"No se pudo iniciar el hotspot.\n\n{error_handler.format_error(error_msg, debug_info)}"
     
+    @error_handler.traced("DETENER HOTSPOT")
     def stop_hotspot(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
         code, out, err, debug_info = run_command("netsh wlan stop hostednetwork", "DETENER HOTSPOT")
         
         if code == 0:
             self._is_running = False
+            state_journal.record_state("python", "Off")
             if error_handler.DebugLogger.is_enabled():
                 return True, f"Hotspot detenido.\n\n{error_handler.DebugLogger.get_full_report()}"
             return True, "Hotspot detenido exitosamente."
@@ -152,18 +216,17 @@ Usa el Mobile Hotspot de Windows:
         error_msg = err if err else out
         return False, f"No se pudo detener el hotspot.\n\n{error_handler.format_error(error_msg, debug_info)}"
     
+    @error_handler.traced("ELIMINAR HOTSPOT")
     def delete_hotspot(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
         if self._is_running:
             self.stop_hotspot()
-            error_handler.DebugLogger.clear()
         
         code, out, err, debug_info = run_command("netsh wlan set hostednetwork mode=disallow", "ELIMINAR HOTSPOT")
         
         if code == 0:
             self._ssid = None
             self._password = None
+            state_journal.forget("python")
             if error_handler.DebugLogger.is_enabled():
                 return True, f"Hotspot eliminado.\n\n{error_handler.DebugLogger.get_full_report()}"
             return True, "Hotspot eliminado exitosamente."
@@ -171,38 +234,58 @@ Usa el Mobile Hotspot de Windows:
         error_msg = err if err else out
         return False, f"No se pudo eliminar el hotspot.\n\n{error_handler.format_error(error_msg, debug_info)}"
     
-    def get_status(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
-        code, out, err, debug_info = run_command("netsh wlan show hostednetwork", "OBTENER ESTADO")
-        
-        if code != 0:
-            error_msg = err if err else out
-            return False, error_handler.format_error(error_msg, debug_info)
+    @error_handler.traced("REINICIAR HOSTED NETWORK")
+    def reset_hostednetwork(self) -> tuple[bool, str]:
+        # Accion correctiva entre reintentos: deshabilitar y volver a habilitar.
+        run_command("netsh wlan set hostednetwork mode=disallow", "DESHABILITAR HOSTED NETWORK")
+        code, out, err, _ = run_command("netsh wlan set hostednetwork mode=allow", "HABILITAR HOSTED NETWORK")
+        return code == 0, err if err else out
+    
+    @error_handler.traced("SNAPSHOT")
+    def snapshot(self) -> hotspot_snapshot.HotspotSnapshot:
+        code, out, err, debug_info = run_command(hostednetwork.snapshot_command(" & "), "OBTENER SNAPSHOT")
+        return hotspot_snapshot.from_netsh("python", code, out, err, debug_info)
+    
+    def format_status(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        if not snap.ok:
+            return False, error_handler.format_error(snap.error, snap.debug_info)
         
         if error_handler.DebugLogger.is_enabled():
-            return True, f"{out}\n\n{error_handler.DebugLogger.get_full_report()}"
-        return True, out
+            return True, f"{snap.detail}\n\n{error_handler.DebugLogger.get_full_report()}"
+        return True, snap.detail
     
-    def check_support(self) -> tuple[bool, str]:
-        error_handler.DebugLogger.clear()
-        
-        code, out, err, debug_info = run_command("netsh wlan show drivers", "VERIFICAR COMPATIBILIDAD")
-        
+    @error_handler.traced("ESTADO")
+    def get_status(self) -> tuple[bool, str]:
+        return self.format_status(self.snapshot())
+    
+    def is_available(self) -> Optional[bool]:
+        return environment.available("hostednetwork")
+    
+    @error_handler.traced("SONDEO")
+    def poll_state(self) -> Optional[dict]:
+        snap = self.snapshot()
+        if not snap.ok:
+            return None
+        return snap.to_monitor_state()
+    
+    def _fetch_clients(self) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+        code, out, err, _ = run_command("netsh wlan show hostednetwork & arp -a", "OBTENER CLIENTES")
         if code != 0:
-            return False, f"No se pudo verificar la compatibilidad.\n\n{error_handler.format_error(err if err else out, debug_info)}"
-        
-        output_lower = out.lower()
+            return False, []
+        return True, hotspot_clients.clients_from_netsh(out, hotspot_clients.RESOLVE_TIMEOUT)
+    
+    @error_handler.traced("CLIENTES")
+    def get_clients(self, force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+        return self._clients.get(force)
+    
+    def format_support(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        if not snap.ok:
+            return False, f"No se pudo verificar la compatibilidad.\n\n{error_handler.format_error(snap.error, snap.debug_info)}"
         
-        adapter_name = ""
-        for line in out.split("\n"):
-            if "Interface name" in line or "Nombre de interfaz" in line:
-                adapter_name = line.split(":")[-1].strip() if ":" in line else ""
-                break
+        adapter_name = snap.adapter
         
-        if "hosted network supported" in output_lower:
-            after_supported = output_lower.split("hosted network supported")[1][:30]
-            if "yes" in after_supported:
+        if snap.supported is not None:
+            if snap.supported:
                 admin_note = ""
                 if not is_admin():
                     admin_note = "\n\nADVERTENCIA: No estas ejecutando como Administrador."
@@ -239,23 +322,57 @@ SOLUCIONES ALTERNATIVAS:
             return False, error_msg
         
         return False, "No se pudo determinar la compatibilidad."
+    
+    @error_handler.traced("VERIFICAR SOPORTE")
+    def check_support(self) -> tuple[bool, str]:
+        return self.format_support(self.snapshot())
 
 _manager = HotspotManager()
 
 def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
     return _manager.create_hotspot(ssid, password)
 
+def prepare_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    return _manager.prepare_hotspot(ssid, password)
+
+def discard_prepared():
+    _manager.discard_prepared()
+
 def stop_hotspot() -> tuple[bool, str]:
     return _manager.stop_hotspot()
 
 def delete_hotspot() -> tuple[bool, str]:
     return _manager.delete_hotspot()
 
+def restore(ssid: str, password: Optional[str], running: bool):
+    _manager.restore(ssid, password, running)
+
+def reset_hostednetwork() -> tuple[bool, str]:
+    return _manager.reset_hostednetwork()
+
 def get_status() -> tuple[bool, str]:
     return _manager.get_status()
 
+def snapshot() -> hotspot_snapshot.HotspotSnapshot:
+    return _manager.snapshot()
+
+def format_status(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_status(snap)
+
+def format_support(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_support(snap)
+
 def check_support() -> tuple[bool, str]:
     return _manager.check_support()
 
+def is_available() -> Optional[bool]:
+    return _manager.is_available()
+
+def poll_state() -> Optional[dict]:
+    return _manager.poll_state()
+
+def get_clients(force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+    return _manager.get_clients(force)
+
 def diagnose() -> str:
-    return error_handler.diagnose_network()
+    return diagnostics.diagnose("python")
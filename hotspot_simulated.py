@@ -0,0 +1,352 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import diagnostics
+import error_handler
+import hotspot_clients
+import hotspot_fallback
+import hotspot_snapshot
+
+# Estados de TetheringOperationalState.
+STATE_OFF = "Off"
+STATE_ON = "On"
+STATE_TRANSITION = "InTransition"
+
+ADAPTER_NAME = "Simulated Wi-Fi Adapter"
+UPSTREAM_NAME = "Simulated Ethernet"
+
+
+@dataclass
+class SimulationConfig:
+    start_delay: float = float(os.environ.get("MYHOTSPOT_SIM_START_DELAY", "1.0"))
+    stop_delay: float = float(os.environ.get("MYHOTSPOT_SIM_STOP_DELAY", "0.5"))
+    # Espera dentro de cada llamada, como el coste de lanzar netsh o PowerShell.
+    command_latency: float = float(os.environ.get("MYHOTSPOT_SIM_LATENCY", "0"))
+    # Conexiones o desconexiones de clientes por segundo mientras esta encendido.
+    churn_rate: float = 0.2
+    max_clients: int = 8
+    # Probabilidad de que una operacion que modifica el hotspot falle.
+    error_rate: float = float(os.environ.get("MYHOTSPOT_SIM_ERROR_RATE", "0"))
+    # Claves de ERROR_SOLUTIONS que se pueden inyectar (None = todas).
+    errors: Optional[tuple[str, ...]] = None
+    supported: bool = True
+    upstream: bool = True
+    seed: int = 0
+
+
+class SimulatedHotspot:
+    def __init__(self, config: Optional[SimulationConfig] = None, clock: Callable[[], float] = time.monotonic):
+        self.config = config or SimulationConfig()
+        self._clock = clock
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.RLock()
+        self._state = STATE_OFF
+        self._target = STATE_OFF
+        self._transition_end = 0.0
+        self._ssid = ""
+        self._password = ""
+        self._allowed = True
+        self._clients: dict[str, hotspot_clients.ClientInfo] = {}
+        self._churn_at = clock()
+        self._next_client = 1
+        self._forced_errors: list[str] = []
+        self._prepared = hotspot_fallback.PreparedPreflight()
+        self.operations = 0
+
+    def inject_error(self, key: str):
+        # El siguiente cambio de estado falla con ese error de ERROR_SOLUTIONS.
+        with self._lock:
+            self._forced_errors.append(key)
+
+    def _advance(self, now: float):
+        if self._state == STATE_TRANSITION and now >= self._transition_end:
+            self._state = self._target
+            self._churn_at = now
+            if self._state == STATE_OFF:
+                self._clients.clear()
+        if self._state != STATE_ON or self.config.churn_rate <= 0:
+            self._churn_at = now
+            return
+
+        # Eventos de clientes deterministas segun la semilla y el reloj.
+        period = 1.0 / self.config.churn_rate
+        while self._churn_at + period <= now:
+            self._churn_at += period
+            join = not self._clients or (
+                len(self._clients) < self.config.max_clients and self._rng.random() < 0.6
+            )
+            if join:
+                number = self._next_client
+                self._next_client += 1
+                mac = f"02:00:00:00:{number // 256 % 256:02x}:{number % 256:02x}"
+                self._clients[mac] = hotspot_clients.ClientInfo(mac, f"sim-device-{number}", f"192.168.137.{number % 250 + 2}")
+            else:
+                self._clients.pop(self._rng.choice(list(self._clients)))
+
+    def _command(self, step: str, command: str) -> tuple[bool, str, error_handler.DebugInfo]:
+        # Cada operacion deja una entrada de log como si fuera un comando real.
+        start = time.perf_counter()
+        if self.config.command_latency > 0:
+            time.sleep(self.config.command_latency)
+
+        with self._lock:
+            self.operations += 1
+            error = ""
+            if self._forced_errors:
+                error = self._forced_errors.pop(0)
+            elif self.config.error_rate > 0 and self._rng.random() < self.config.error_rate:
+                keys = self.config.errors or tuple(error_handler.ERROR_SOLUTIONS)
+                error = self._rng.choice(keys)
+
+        if error:
+            stderr = f"{error[0].upper()}{error[1:]}."
+            debug_info = error_handler.DebugLogger.log(
+                step, command, 1, "", stderr, method="simulated", duration=time.perf_counter() - start
+            )
+            return False, stderr, debug_info
+        debug_info = error_handler.DebugLogger.log(
+            step, command, 0, "OK", "", method="simulated", duration=time.perf_counter() - start
+        )
+        return True, "", debug_info
+
+    def _report_suffix(self) -> str:
+        if error_handler.DebugLogger.is_enabled():
+            return f"\n\n{error_handler.DebugLogger.get_full_report()}"
+        return ""
+
+    def _preflight(self, ssid: str, password: str) -> tuple[bool, str]:
+        if not self.config.supported:
+            return False, "ADAPTADOR NO COMPATIBLE (simulado)"
+        if not ssid or len(ssid) > 32:
+            return False, "El SSID debe tener entre 1 y 32 caracteres"
+        if len(password) < 8:
+            return False, "La contrasena debe tener al menos 8 caracteres"
+        return True, "Preparado"
+
+    @error_handler.traced("PREPARAR HOTSPOT")
+    def prepare_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        ok, msg = self._preflight(ssid, password)
+        self._prepared.store(ssid, password, ok, msg)
+        return ok, msg
+
+    def discard_prepared(self):
+        self._prepared.clear()
+
+    @error_handler.traced("CREAR HOTSPOT")
+    def create_hotspot(self, ssid: str, password: str) -> tuple[bool, str]:
+        preflight = self._prepared.take(ssid, password)
+        if preflight is None:
+            preflight = self._preflight(ssid, password)
+        ready, ready_msg = preflight
+        if not ready:
+            return False, ready_msg
+
+        with self._lock:
+            now = self._clock()
+            self._advance(now)
+            if self._state == STATE_ON and (self._ssid, self._password) == (ssid, password):
+                return True, f"Hotspot '{ssid}' ya estaba activo.\nRuta: sin cambios{self._report_suffix()}"
+
+        ok, error, debug_info = self._command("INICIAR HOTSPOT", f'sim start ssid="{ssid}" key="{password}"')
+        if not ok:
+            return False, f"No se pudo iniciar el hotspot.\n\n{error_handler.format_error(error, debug_info)}"
+
+        with self._lock:
+            now = self._clock()
+            self._ssid, self._password, self._allowed = ssid, password, True
+            self._target = STATE_ON
+            self._state = STATE_TRANSITION
+            self._transition_end = now + self.config.start_delay
+            self._advance(now)
+        return True, f"Hotspot '{ssid}' creado exitosamente (simulado).{self._report_suffix()}"
+
+    @error_handler.traced("DETENER HOTSPOT")
+    def stop_hotspot(self) -> tuple[bool, str]:
+        ok, error, debug_info = self._command("DETENER HOTSPOT", "sim stop")
+        if not ok:
+            return False, f"No se pudo detener el hotspot.\n\n{error_handler.format_error(error, debug_info)}"
+
+        with self._lock:
+            now = self._clock()
+            self._advance(now)
+            if self._state != STATE_OFF:
+                self._target = STATE_OFF
+                self._state = STATE_TRANSITION
+                self._transition_end = now + self.config.stop_delay
+                self._advance(now)
+        return True, f"Hotspot detenido.{self._report_suffix()}"
+
+    @error_handler.traced("ELIMINAR HOTSPOT")
+    def delete_hotspot(self) -> tuple[bool, str]:
+        stop_ok, stop_msg = self.stop_hotspot()
+        if not stop_ok:
+            return False, stop_msg
+
+        ok, error, debug_info = self._command("ELIMINAR HOTSPOT", "sim disallow")
+        if not ok:
+            return False, f"No se pudo eliminar el hotspot.\n\n{error_handler.format_error(error, debug_info)}"
+        with self._lock:
+            self._ssid, self._password, self._allowed = "", "", False
+        return True, f"Hotspot eliminado.{self._report_suffix()}"
+
+    @error_handler.traced("REINICIAR HOSTED NETWORK")
+    def reset_hostednetwork(self) -> tuple[bool, str]:
+        ok, error, _ = self._command("REINICIAR ADAPTADOR", "sim reset")
+        return ok, error
+
+    @error_handler.traced("SNAPSHOT")
+    def snapshot(self) -> hotspot_snapshot.HotspotSnapshot:
+        ok, error, debug_info = self._command("SNAPSHOT", "sim snapshot")
+        if not ok:
+            return hotspot_snapshot.HotspotSnapshot("simulated", None, error=error, debug_info=debug_info)
+
+        with self._lock:
+            self._advance(self._clock())
+            snap = hotspot_snapshot.HotspotSnapshot(
+                method="simulated",
+                supported=self.config.supported,
+                adapter=ADAPTER_NAME,
+                ssid=self._ssid,
+                state=self._state,
+                clients=len(self._clients),
+                max_clients=self.config.max_clients,
+                upstream=UPSTREAM_NAME if self.config.upstream else "",
+                peers=list(self._clients.values()),
+                debug_info=debug_info,
+            )
+        snap.detail = (
+            "Estado Hotspot simulado:\n"
+            "========================\n"
+            f"SSID: {snap.ssid}\n"
+            f"Estado: {snap.state}\n"
+            f"Clientes: {snap.clients} / {snap.max_clients}\n"
+            f"Internet: {snap.upstream}"
+        )
+        return snap
+
+    def format_status(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        if not snap.ok:
+            return False, error_handler.format_error(snap.error, snap.debug_info)
+        return True, f"{snap.detail}{self._report_suffix()}"
+
+    def format_support(self, snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+        if not snap.ok:
+            return False, f"No se pudo verificar la compatibilidad.\n\n{error_handler.format_error(snap.error, snap.debug_info)}"
+        if not snap.supported:
+            return False, f"Adaptador simulado NO COMPATIBLE.{self._report_suffix()}"
+        return True, f"Backend simulado: COMPATIBLE\nEstado: {snap.state}\nClientes max: {snap.max_clients}{self._report_suffix()}"
+
+    @error_handler.traced("ESTADO")
+    def get_status(self) -> tuple[bool, str]:
+        return self.format_status(self.snapshot())
+
+    @error_handler.traced("VERIFICAR SOPORTE")
+    def check_support(self) -> tuple[bool, str]:
+        return self.format_support(self.snapshot())
+
+    def is_available(self) -> Optional[bool]:
+        return True
+
+    @error_handler.traced("SONDEO")
+    def poll_state(self) -> Optional[dict]:
+        snap = self.snapshot()
+        if not snap.ok:
+            return None
+        return snap.to_monitor_state()
+
+    def subscribe_state(self, emit, stop_event: threading.Event) -> bool:
+        while not stop_event.is_set():
+            with self._lock:
+                self._advance(self._clock())
+                state = {
+                    "state": self._state,
+                    "ssid": self._ssid,
+                    "clients": len(self._clients),
+                    "max_clients": self.config.max_clients,
+                    "peers": list(self._clients.values()),
+                }
+            emit(state)
+            stop_event.wait(0.25)
+        return True
+
+    @error_handler.traced("CLIENTES")
+    def get_clients(self, force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+        with self._lock:
+            self._advance(self._clock())
+            return True, list(self._clients.values())
+
+    def diagnose(self) -> str:
+        findings = []
+        if not self.config.supported:
+            findings.append(diagnostics.Finding("driver", diagnostics.ERROR, "El adaptador simulado no soporta hotspot"))
+        if not self.config.upstream:
+            findings.append(diagnostics.Finding("internet", diagnostics.WARNING, "Sin conexion a Internet (simulado)"))
+        if self.config.error_rate > 0:
+            findings.append(diagnostics.Finding(
+                "simulacion", diagnostics.INFO, f"Inyeccion de errores activa: {self.config.error_rate:.0%} de las operaciones"
+            ))
+        findings.sort(key=lambda finding: finding.severity, reverse=True)
+        return diagnostics.format_findings(findings)
+
+
+_manager = SimulatedHotspot()
+
+def configure(config: Optional[SimulationConfig] = None, clock: Callable[[], float] = time.monotonic) -> SimulatedHotspot:
+    global _manager
+    _manager = SimulatedHotspot(config, clock)
+    return _manager
+
+def manager() -> SimulatedHotspot:
+    return _manager
+
+def create_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    return _manager.create_hotspot(ssid, password)
+
+def prepare_hotspot(ssid: str, password: str) -> tuple[bool, str]:
+    return _manager.prepare_hotspot(ssid, password)
+
+def discard_prepared():
+    _manager.discard_prepared()
+
+def stop_hotspot() -> tuple[bool, str]:
+    return _manager.stop_hotspot()
+
+def delete_hotspot() -> tuple[bool, str]:
+    return _manager.delete_hotspot()
+
+def reset_hostednetwork() -> tuple[bool, str]:
+    return _manager.reset_hostednetwork()
+
+def get_status() -> tuple[bool, str]:
+    return _manager.get_status()
+
+def snapshot() -> hotspot_snapshot.HotspotSnapshot:
+    return _manager.snapshot()
+
+def format_status(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_status(snap)
+
+def format_support(snap: hotspot_snapshot.HotspotSnapshot) -> tuple[bool, str]:
+    return _manager.format_support(snap)
+
+def check_support() -> tuple[bool, str]:
+    return _manager.check_support()
+
+def is_available() -> Optional[bool]:
+    return _manager.is_available()
+
+def poll_state() -> Optional[dict]:
+    return _manager.poll_state()
+
+def subscribe_state(emit, stop_event: threading.Event) -> bool:
+    return _manager.subscribe_state(emit, stop_event)
+
+def get_clients(force: bool = False) -> tuple[bool, list[hotspot_clients.ClientInfo]]:
+    return _manager.get_clients(force)
+
+def diagnose() -> str:
+    return _manager.diagnose()
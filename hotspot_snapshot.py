@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import error_handler
+import hostednetwork
+import hotspot_clients
+
+
+@dataclass
+class HotspotSnapshot:
+    method: str
+    supported: Optional[bool]
+    adapter: str = ""
+    ssid: str = ""
+    state: str = "Unknown"
+    clients: int = 0
+    max_clients: int = 0
+    upstream: str = ""
+    # Banda configurada (wifi_band), solo Mobile Hotspot.
+    band: str = ""
+    # Clientes conectados; None si el backend no los incluye en el snapshot.
+    peers: Optional[list[hotspot_clients.ClientInfo]] = None
+    detail: str = ""
+    error: str = ""
+    debug_info: Optional[error_handler.DebugInfo] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def to_monitor_state(self) -> dict:
+        state = {
+            "state": self.state,
+            "ssid": self.ssid,
+            "clients": self.clients,
+            "max_clients": self.max_clients,
+        }
+        if self.peers is not None:
+            state["peers"] = list(self.peers)
+        return state
+
+
+def from_netsh(method: str, code: int, out: str, err: str, debug_info: error_handler.DebugInfo) -> HotspotSnapshot:
+    sections = hostednetwork.split_sections(out)
+    if code != 0 and not any(sections.values()):
+        return HotspotSnapshot(method, None, error=err if err else out, debug_info=debug_info)
+
+    supported, adapter = hostednetwork.parse_drivers(sections.get("drivers", ""))
+    status_text = sections.get("hostednetwork", "")
+    status = hostednetwork.parse_hostednetwork(status_text)
+    interfaces = hostednetwork.parse_interfaces(sections.get("interfaces", ""))
+
+    return HotspotSnapshot(
+        method=method,
+        supported=supported,
+        adapter=adapter,
+        ssid=status["ssid"],
+        state="On" if status["started"] else "Off",
+        clients=status["clients"],
+        max_clients=status["max_clients"],
+        upstream=interfaces["profile"] if interfaces["connected"] else "",
+        peers=hotspot_clients.clients_from_netsh(f"{status_text}\n{sections.get('arp', '')}"),
+        detail=status_text,
+        debug_info=debug_info,
+    )
@@ -0,0 +1,339 @@
+import argparse
+import atexit
+import datetime
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Iterator, Optional
+
+import error_handler
+
+# MYHOTSPOT_LOG=0 desactiva el registro en disco; MYHOTSPOT_LOG_FILE cambia la ruta.
+ENABLED = os.environ.get("MYHOTSPOT_LOG", "1") != "0"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.5
+FSYNC_INTERVAL = 5.0
+QUEUE_SIZE = 10000
+# Sin modo desarrollador solo se guarda el final de stderr de los pasos fallidos.
+SUMMARY_STDERR = 300
+
+_REDACTIONS = [
+    (re.compile(r'(key=)"[^"]*"', re.IGNORECASE), r'\1"***"'),
+    (re.compile(r'(Passphrase\s*(?:-ceq|=)\s*)"[^"]*"'), r'\1"***"'),
+    (re.compile(r'^(\s*(?:user security key|clave de seguridad de usuario)\s*:).*$', re.IGNORECASE | re.MULTILINE), r'\1 ***'),
+]
+
+
+def default_path() -> str:
+    path = os.environ.get("MYHOTSPOT_LOG_FILE")
+    if path:
+        return path
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "MyHotspot", "logs", "commands.jsonl")
+
+
+def redact(text: str) -> str:
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class LogSink:
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = MAX_BYTES,
+        backups: int = BACKUPS,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        fsync_interval: float = FSYNC_INTERVAL,
+        queue_size: int = QUEUE_SIZE
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._file = None
+        self._size = 0
+        self._scripts_written: set[str] = set()
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="myhotspot-log-sink", daemon=True)
+        self._thread.start()
+
+    def submit(self, info: error_handler.DebugInfo, verbose: bool):
+        # Nunca bloquea al llamador: si la cola esta llena se descarta y se cuenta.
+        try:
+            self._queue.put_nowait((info, verbose))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        # Un archivo nuevo debe poder leerse solo: los scripts se vuelven a escribir.
+        if self._size == 0:
+            self._scripts_written = set()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._scripts_written = set()
+        self._open()
+
+    def _lines(self, info: error_handler.DebugInfo, verbose: bool) -> list[str]:
+        lines = []
+        if info.script_id not in self._scripts_written:
+            self._scripts_written.add(info.script_id)
+            lines.append(json.dumps({"type": "script", "id": info.script_id, "body": redact(info.command)}, ensure_ascii=False))
+
+        record = {
+            "type": "cmd",
+            "t": round(info.wall_time, 3),
+            "op": info.operation,
+            "method": info.method,
+            "step": info.step,
+            "rc": info.return_code,
+            "script": info.script_id,
+        }
+        if info.duration:
+            record["dur"] = round(info.duration, 4)
+        if verbose:
+            record["stdout"] = redact(info.stdout)
+            record["stderr"] = redact(info.stderr)
+        elif not info.success and info.stderr:
+            record["stderr"] = redact(info.stderr[-SUMMARY_STDERR:])
+        if info.spill_paths:
+            record["spill"] = list(info.spill_paths)
+        lines.append(json.dumps(record, ensure_ascii=False))
+        return lines
+
+    def _write(self, batch: list):
+        try:
+            if self._file is None:
+                self._open()
+            text = "".join(line + "\n" for info, verbose in batch for line in self._lines(info, verbose))
+            self._file.write(text)
+            self._file.flush()
+            self._size += len(text.encode("utf-8"))
+            self.written += len(batch)
+
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+            if self._size >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self.dropped += len(batch)
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            if stop:
+                if self._file is not None:
+                    try:
+                        os.fsync(self._file.fileno())
+                    except OSError:
+                        pass
+                    self._file.close()
+                    self._file = None
+                return
+
+
+_sink: Optional[LogSink] = None
+
+
+def _on_log(info: error_handler.DebugInfo):
+    if _sink is not None:
+        _sink.submit(info, error_handler.DebugLogger.is_enabled())
+
+
+def install(path: Optional[str] = None) -> Optional[LogSink]:
+    global _sink
+    if _sink is not None or not ENABLED:
+        return _sink
+    _sink = LogSink(path or default_path())
+    error_handler.DebugLogger.add_listener(_on_log)
+    atexit.register(_sink.close)
+    return _sink
+
+
+def log_files(path: str) -> list[str]:
+    # De mas antiguo a mas reciente.
+    files = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        files.insert(0, f"{path}.{i}")
+        i += 1
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def _tail_lines(file_path: str, count: int, block_size: int = 65536) -> list[str]:
+    # Lee desde el final por bloques sin recorrer el archivo entero.
+    with open(file_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", "replace").splitlines()
+    if position > 0:
+        lines = lines[1:]
+    return lines[-count:]
+
+
+def read_log(
+    path: Optional[str] = None,
+    step: Optional[str] = None,
+    method: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    tail: Optional[int] = None,
+    with_commands: bool = False
+) -> Iterator[dict]:
+    path = path or default_path()
+    files = log_files(path)
+    if since is not None:
+        # Un archivo modificado antes de 'since' no tiene entradas que interesen.
+        files = [file_path for file_path in files if os.path.getmtime(file_path) >= since]
+
+    step_needle = f'"step": {json.dumps(step, ensure_ascii=False)}' if step else None
+    method_needle = f'"method": {json.dumps(method)}' if method else None
+    scripts: dict[str, str] = {}
+
+    def matches(line: str) -> Optional[dict]:
+        # Filtro por texto antes de decodificar el JSON.
+        if '"type": "script"' in line:
+            if with_commands:
+                record = json.loads(line)
+                scripts[record["id"]] = record["body"]
+            return None
+        if step_needle and step_needle not in line:
+            return None
+        if method_needle and method_needle not in line:
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if since is not None and record["t"] < since:
+            return None
+        if until is not None and record["t"] > until:
+            return None
+        return record
+
+    def with_command(record: dict) -> dict:
+        if with_commands:
+            record["command"] = scripts.get(record["script"], "")
+        return record
+
+    if tail is not None and files and not with_commands and step is None and method is None:
+        records = [record for record in map(matches, _tail_lines(files[-1], tail * 2)) if record is not None]
+        if len(records) >= tail:
+            yield from records[-tail:]
+            return
+
+    results: list[dict] = []
+    for file_path in files:
+        with open(file_path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                record = matches(line)
+                if record is None:
+                    continue
+                if tail is None:
+                    yield with_command(record)
+                else:
+                    results.append(with_command(record))
+                    if len(results) > tail:
+                        results.pop(0)
+    yield from results
+
+
+def format_record(record: dict) -> str:
+    when = datetime.datetime.fromtimestamp(record["t"]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    status = "OK" if record["rc"] == 0 else f"FALLO ({record['rc']})"
+    line = f"{when} [{record.get('method') or '-'}] {record.get('op') or '-'} / {record['step']}: {status}"
+    if record.get("stderr"):
+        line += f"\n    {record['stderr'].strip()[:200]}"
+    if record.get("command"):
+        line += f"\n    $ {record['command'].strip().splitlines()[0][:200]}"
+    return line
+
+
+def _parse_time(value: str) -> float:
+    # Minutos hacia atras ("30m", "2h") o fecha ISO ("2024-05-01 22:00").
+    if value[-1:] in ("m", "h") and value[:-1].replace(".", "", 1).isdigit():
+        factor = 60 if value[-1] == "m" else 3600
+        return time.time() - float(value[:-1]) * factor
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lee el log de comandos de MyHotspot")
+    parser.add_argument("--file", default=None, help="Ruta del log (por defecto la de la app)")
+    parser.add_argument("--step", default=None)
+    parser.add_argument("--method", choices=["mobile", "python", "powershell", "simulated"], default=None)
+    parser.add_argument("--since", type=_parse_time, default=None, help="'30m', '2h' o fecha ISO")
+    parser.add_argument("--until", type=_parse_time, default=None)
+    parser.add_argument("--tail", type=int, default=None)
+    parser.add_argument("--commands", action="store_true", help="Incluir el comando ejecutado")
+    args = parser.parse_args()
+
+    for record in read_log(args.file, args.step, args.method, args.since, args.until, args.tail, args.commands):
+        print(format_record(record))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,62 @@
+import startup_profile
+
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from typing import Callable
+import argparse
+import functools
 import threading
-import ctypes
+import time
 import subprocess
 
-import hotspot_powershell
-import hotspot_python
-import hotspot_mobile
+import backends
+import hotspot_fallback
+import retry_policy
+import hotspot_monitor
+import hotspot_clients
+import traffic_sampler
+import powershell_pool
+import powershell_launcher
+import environment
 import error_handler
+import log_sink
+import metrics
+import profiling
+import state_journal
+import wifi_band
+
+startup_profile.mark("imports")
 
 
 class HotspotApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, resume: bool = False, band: str = wifi_band.BAND_AUTO):
         self.root = root
         self.root.title("MyHotspot - Gestor de Punto de Acceso Wi-Fi")
-        self.root.geometry("650x650")
+        self.root.geometry("650x780")
         self.root.resizable(True, True)
-        self.root.minsize(580, 550)
+        self.root.minsize(580, 650)
         
         self.current_method = tk.StringVar(value="mobile")
         self.ssid_var = tk.StringVar()
         self.password_var = tk.StringVar()
+        self.band_var = tk.StringVar(value=wifi_band.LABELS.get(band, wifi_band.LABELS[wifi_band.BAND_AUTO]))
         self.developer_mode = tk.BooleanVar(value=False)
+        self.monitor_var = tk.BooleanVar(value=False)
+        self._monitor = None
+        self._monitor_state: dict = {}
+        self._client_rows: dict = {}
+        self.traffic_var = tk.BooleanVar(value=False)
+        self._sampler = None
+        self.prewarm_battery_var = tk.BooleanVar(value=True)
         
         self._setup_ui()
-        self._check_support()
+        self._restore_journal()
+        self.current_method.trace_add("write", lambda *args: self._on_method_changed())
+        # La primera verificacion lanza procesos: se hace con la ventana ya visible.
+        if resume:
+            self.root.after(1, lambda: self._resume_hotspot(from_launch=True))
+        else:
+            self.root.after(1, self._initial_check)
     
     def _setup_ui(self):
         style = ttk.Style()
@@ -89,6 +120,14 @@ class HotspotApp:
             value="powershell"
         ).pack(side=tk.LEFT, padx=5)
         
+        # Solo visible en modo desarrollador.
+        self.simulated_radio = ttk.Radiobutton(
+            row2_frame,
+            text="Simulado",
+            variable=self.current_method,
+            value="simulated"
+        )
+        
         row3_frame = ttk.Frame(method_frame)
         row3_frame.pack(fill=tk.X, pady=5)
         
@@ -103,6 +142,14 @@ class HotspotApp:
         )
         dev_check.pack(side=tk.LEFT, padx=5)
         
+        ttk.Checkbutton(
+            row3_frame,
+            text="Sin precalentar con bateria",
+            variable=self.prewarm_battery_var,
+            command=self._toggle_prewarm_battery,
+            style="Dev.TCheckbutton"
+        ).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(
             row3_frame,
             text="Abrir Hotspot de Windows",
@@ -146,6 +193,15 @@ class HotspotApp:
             font=("Segoe UI", 8)
         ).grid(row=2, column=1, sticky=tk.W)
         
+        ttk.Label(config_frame, text="Banda (Mobile Hotspot):").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Combobox(
+            config_frame,
+            textvariable=self.band_var,
+            values=[wifi_band.LABELS[band] for band in wifi_band.BANDS],
+            state="readonly",
+            width=12
+        ).grid(row=3, column=1, pady=5, padx=5, sticky=tk.W)
+        
         buttons_frame = ttk.Frame(self.root, padding="10")
         buttons_frame.pack(fill=tk.X)
         
@@ -177,6 +233,78 @@ class HotspotApp:
             width=15
         ).pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(
+            buttons_frame, 
+            text="Reanudar", 
+            command=self._resume_hotspot,
+            width=15
+        ).pack(side=tk.LEFT, padx=5)
+        
+        monitor_frame = ttk.Frame(self.root, padding=(10, 0))
+        monitor_frame.pack(fill=tk.X)
+        
+        ttk.Checkbutton(
+            monitor_frame,
+            text="Monitor en vivo",
+            variable=self.monitor_var,
+            command=self._toggle_monitor
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.monitor_label = ttk.Label(
+            monitor_frame,
+            text="",
+            font=("Segoe UI", 9)
+        )
+        self.monitor_label.pack(side=tk.LEFT, padx=10)
+        
+        traffic_frame = ttk.Frame(self.root, padding=(10, 2))
+        traffic_frame.pack(fill=tk.X)
+        
+        ttk.Checkbutton(
+            traffic_frame,
+            text="Trafico en vivo",
+            variable=self.traffic_var,
+            command=self._toggle_traffic
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.traffic_label = ttk.Label(
+            traffic_frame,
+            text="",
+            font=("Segoe UI", 9)
+        )
+        self.traffic_label.pack(side=tk.LEFT, padx=10)
+        
+        self.traffic_canvas = tk.Canvas(
+            traffic_frame,
+            width=240,
+            height=40,
+            background="white",
+            highlightthickness=1,
+            highlightbackground="#BDBDBD"
+        )
+        self.traffic_canvas.pack(side=tk.RIGHT, padx=5)
+        
+        clients_frame = ttk.LabelFrame(self.root, text="Clientes conectados", padding="5")
+        clients_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.clients_tree = ttk.Treeview(
+            clients_frame,
+            columns=("mac", "hostname", "ip"),
+            show="headings",
+            height=5
+        )
+        self.clients_tree.heading("mac", text="MAC")
+        self.clients_tree.heading("hostname", text="Nombre")
+        self.clients_tree.heading("ip", text="IP")
+        self.clients_tree.column("mac", width=150)
+        self.clients_tree.column("hostname", width=220)
+        self.clients_tree.column("ip", width=130)
+        
+        clients_scroll = ttk.Scrollbar(clients_frame, orient=tk.VERTICAL, command=self.clients_tree.yview)
+        self.clients_tree.configure(yscrollcommand=clients_scroll.set)
+        self.clients_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        clients_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
         status_frame = ttk.LabelFrame(self.root, text="Estado y Mensajes", padding="10")
         status_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
@@ -222,9 +350,14 @@ class HotspotApp:
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
             self.status_text.config(font=("Consolas", 8))
+            self.simulated_radio.pack(side=tk.LEFT, padx=5)
         else:
             error_handler.DebugLogger.disable()
             self.status_text.config(font=("Consolas", 9))
+            self.simulated_radio.pack_forget()
+            if self.current_method.get() == "simulated":
+                self.current_method.set("mobile")
+        profiling.set_developer_mode(self.developer_mode.get())
         self._update_dev_label()
     
     def _update_dev_label(self):
@@ -237,19 +370,18 @@ class HotspotApp:
             self.dev_label.config(text="", foreground="gray")
     
     def _check_admin_status(self):
-        try:
-            is_admin = ctypes.windll.shell32.IsUserAnAdmin()
-            if is_admin:
-                self.admin_label.config(
-                    text="Ejecutando como Administrador - OK",
-                    foreground="green"
-                )
-            else:
-                self.admin_label.config(
-                    text="ADVERTENCIA: No estas como Administrador. Algunas funciones fallaran.",
-                    foreground="#D32F2F"
-                )
-        except:
+        is_admin = environment.get_environment().is_admin
+        if is_admin:
+            self.admin_label.config(
+                text="Ejecutando como Administrador - OK",
+                foreground="green"
+            )
+        elif is_admin is False:
+            self.admin_label.config(
+                text="ADVERTENCIA: No estas como Administrador. Algunas funciones fallaran.",
+                foreground="#D32F2F"
+            )
+        else:
             self.admin_label.config(
                 text="No se pudo verificar el estado de administrador",
                 foreground="orange"
@@ -287,27 +419,44 @@ class HotspotApp:
                 )
     
     def _get_manager(self):
-        method = self.current_method.get()
-        if method == "powershell":
-            return hotspot_powershell
-        elif method == "python":
-            return hotspot_python
-        else:
-            return hotspot_mobile
+        return backends.get(self.current_method.get())
     
     def _get_method_description(self) -> str:
-        method = self.current_method.get()
-        if method == "powershell":
-            return "PowerShell (netsh)"
-        elif method == "python":
-            return "Python (netsh)"
-        else:
-            return "Mobile Hotspot (Windows API)"
+        return backends.description(self.current_method.get())
+    
+    def _toggle_prewarm_battery(self):
+        for pool in (powershell_pool.winrt_pool, powershell_pool.plain_pool):
+            pool.skip_on_battery = self.prewarm_battery_var.get()
+        self._warm_up()
     
-    def _run_async(self, func: Callable):
+    def _on_method_changed(self):
+        self._restart_monitor()
+        self._warm_up()
+    
+    def _warm_up(self):
+        # PowerShell listo (a baja prioridad) para la primera accion del metodo elegido.
+        warm_up = getattr(self._get_manager(), "warm_up", None)
+        if warm_up is not None:
+            threading.Thread(target=warm_up, daemon=True).start()
+    
+    def _run_async(self, func: Callable, name: str = "ACCION"):
         def wrapper():
             try:
+                # Sin cProfile aqui: cada operacion del backend se perfila en el hilo
+                # que la ejecuta (el del fallback, por ejemplo) y su perfil ya va en
+                # el reporte; la accion agrega su tiempo total y el de cada operacion.
+                started = time.perf_counter()
                 success, message = func()
+                elapsed = time.perf_counter() - started
+                method = self.current_method.get()
+                if self.developer_mode.get() and method in ("mobile", "powershell"):
+                    pool = powershell_pool.winrt_pool if method == "mobile" else powershell_pool.plain_pool
+                    message = f"{message}\n\n{pool.latency_report()}"
+                if self.developer_mode.get() and profiling.enabled():
+                    lines = [f"PERFIL ACCION: {name} - {elapsed * 1000:.1f} ms"]
+                    for op_profile in profiling.recent(since=started):
+                        lines.append(f"  {op_profile.elapsed * 1000:8.1f} ms  {op_profile.name}")
+                    message = f"{message}\n\n" + "\n".join(lines)
                 self.root.after(0, lambda: self._update_status(message))
                 if not success:
                     self.root.after(0, lambda: self._show_error_dialog(message))
@@ -378,13 +527,55 @@ class HotspotApp:
         self.status_text.insert(tk.END, message)
         self.status_text.config(state=tk.DISABLED)
     
+    def _restore_journal(self):
+        # Ultima configuracion y estado conocidos: la ventana arranca con ellos
+        # y la primera verificacion los confirma o corrige.
+        journal = state_journal.load()
+        if not journal.configured or journal.method not in backends.ORDER:
+            return
+        self.current_method.set(journal.method)
+        self.ssid_var.set(journal.ssid)
+        if journal.password is not None:
+            self.password_var.set(journal.password)
+        
+        restore = getattr(backends.get(journal.method), "restore", None)
+        if restore is not None:
+            restore(journal.ssid, journal.password, journal.state == "On")
+        
+        self._monitor_state = {"state": journal.state, "ssid": journal.ssid}
+        for key in ("clients", "max_clients"):
+            if getattr(journal, key) is not None:
+                self._monitor_state[key] = getattr(journal, key)
+        state = self._monitor_state
+        self.monitor_label.config(
+            text=f"Estado: {state['state']} (sin confirmar) | SSID: {state['ssid']} | "
+                 f"Clientes: {state.get('clients', '?')} / {state.get('max_clients', '?')}"
+        )
+    
+    def _initial_check(self):
+        self._warm_up()
+        self._check_support()
+        startup_profile.mark("first_probe")
+        if startup_profile.EXIT_AFTER_PROBE:
+            self.root.after(0, self.root.destroy)
+    
     def _check_support(self):
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
         
         manager = self._get_manager()
-        success, message = manager.check_support()
         method_desc = self._get_method_description()
+        method = self.current_method.get()
+        # La misma comprobacion de entorno que hacen crear y detener.
+        env_error = error_handler.check_environment_error(mobile_hotspot=method == "mobile") if method in backends.ORDER else ""
+        if env_error:
+            self._update_status(f"Verificacion de compatibilidad [{method_desc}]:\n\n{env_error}")
+            return
+        
+        with error_handler.operation("VERIFICAR SOPORTE"):
+            snap = manager.snapshot()
+            success, message = manager.format_support(snap)
+        self._apply_snapshot(snap)
         
         if success:
             self._update_status(f"Verificacion de compatibilidad [{method_desc}]:\n\n{message}")
@@ -395,16 +586,18 @@ class HotspotApp:
         if self.current_method.get() == "mobile" and "ERROR_WINRT_BRIDGE" in message:
             fallback_results: list[str] = [f"Verificacion de compatibilidad [{method_desc}]:\n\n{message}"]
             
-            for fallback_method, fallback_desc, fallback_manager in [
-                ("python", "Python (netsh)", hotspot_python),
-                ("powershell", "PowerShell (netsh)", hotspot_powershell),
-            ]:
-                ok, fallback_msg = fallback_manager.check_support()
+            for fallback_method in ("python", "powershell"):
+                fallback_desc = backends.description(fallback_method)
+                fallback_manager = backends.get(fallback_method)
+                with error_handler.operation("VERIFICAR SOPORTE"):
+                    fallback_snap = fallback_manager.snapshot()
+                    ok, fallback_msg = fallback_manager.format_support(fallback_snap)
                 fallback_results.append(
                     f"\n\nVerificacion de compatibilidad [{fallback_desc}]:\n\n{fallback_msg}"
                 )
                 if ok:
                     self.current_method.set(fallback_method)
+                    self._apply_snapshot(fallback_snap)
                     fallback_results.append(
                         f"\n\nSe selecciono automaticamente el metodo [{fallback_desc}] por compatibilidad."
                     )
@@ -417,18 +610,141 @@ class HotspotApp:
     
     def _diagnose(self):
         manager = self._get_manager()
-        diagnosis = manager.diagnose()
+        show_launcher = self.current_method.get() in ("mobile", "powershell")
+        developer = self.developer_mode.get()
+        self._update_status("Diagnosticando...")
+        
+        def diagnose():
+            # Los adaptadores o permisos pueden haber cambiado desde el arranque.
+            env = environment.get_environment(refresh=True)
+            self.root.after(0, self._check_admin_status)
+            with error_handler.operation("DIAGNOSTICO") as op:
+                diagnosis = manager.diagnose()
+            
+            if diagnosis:
+                msg = f"Diagnostico del sistema:\n\n{diagnosis}"
+            else:
+                msg = "Diagnostico del sistema:\n\nNo se detectaron problemas obvios.\n\nSi el hotspot no funciona:\n1. Ejecuta como Administrador\n2. Verifica que el WiFi este encendido\n3. Cierra VPNs y firewalls temporalmente"
+            
+            msg += f"\n\n{env.describe()}"
+            
+            if show_launcher:
+                msg += f"\n\n{powershell_launcher.launcher.describe()}"
+            
+            if developer:
+                msg += f"\n\n{op.report()}"
+            
+            return True, msg
         
-        if diagnosis:
-            msg = f"Diagnostico del sistema:\n\n{diagnosis}\n\nEjecuta como Administrador para usar el hotspot."
+        self._run_async(diagnose, "DIAGNOSTICO")
+    
+    def _toggle_monitor(self):
+        if self.monitor_var.get():
+            self._start_monitor()
         else:
-            msg = "Diagnostico del sistema:\n\nNo se detectaron problemas obvios.\n\nSi el hotspot no funciona:\n1. Ejecuta como Administrador\n2. Verifica que el WiFi este encendido\n3. Cierra VPNs y firewalls temporalmente"
+            self._stop_monitor()
+            self.monitor_label.config(text="")
+    
+    def _start_monitor(self):
+        self._monitor_state = {}
+        self.monitor_label.config(text="Monitor: esperando estado...")
+        monitor = hotspot_monitor.HotspotMonitor.for_backend(
+            self._get_manager(),
+            lambda changed: self.root.after(0, lambda: self._apply_monitor_change(monitor, changed))
+        )
+        self._monitor = monitor
+        monitor.start()
+    
+    def _stop_monitor(self):
+        if self._monitor is not None:
+            self._monitor.stop(timeout=0)
+            self._monitor = None
+    
+    def _restart_monitor(self):
+        if self._monitor is not None:
+            self._stop_monitor()
+            self._start_monitor()
+    
+    def _apply_snapshot(self, snap):
+        if snap.ok:
+            self._show_monitor_fields(snap.to_monitor_state())
+    
+    def _apply_monitor_change(self, monitor, changed: dict):
+        if monitor is not self._monitor:
+            return
+        self._show_monitor_fields(changed)
+    
+    def _show_monitor_fields(self, changed: dict):
+        self._monitor_state.update(changed)
+        state = self._monitor_state
+        metrics.observe_state(state)
+        if "peers" in changed:
+            self._show_clients(changed["peers"])
+        if "state" in changed:
+            state_journal.record_state(
+                self.current_method.get(), state["state"], state.get("clients"), state.get("max_clients")
+            )
+        self.monitor_label.config(
+            text=f"Estado: {state.get('state', '?')} | SSID: {state.get('ssid', '')} | "
+                 f"Clientes: {state.get('clients', '?')} / {state.get('max_clients', '?')}"
+        )
+    
+    def _toggle_traffic(self):
+        if self.traffic_var.get():
+            self._sampler = traffic_sampler.TrafficSampler()
+            self._sampler.start()
+            self._draw_traffic(self._sampler)
+        else:
+            if self._sampler is not None:
+                self._sampler.stop()
+                self._sampler = None
+            self.traffic_label.config(text="")
+            self.traffic_canvas.delete("all")
+    
+    def _draw_traffic(self, sampler):
+        if sampler is not self._sampler:
+            return
         
-        if self.developer_mode.get():
-            report = error_handler.DebugLogger.get_full_report()
-            msg += f"\n\n{report}"
+        hotspot_mbps = sampler.current_mbps("hotspot")
+        upstream_mbps = sampler.current_mbps("upstream")
+        self.traffic_label.config(
+            text=f"Hotspot: {hotspot_mbps:.1f} Mbps, {sampler.current_pps('hotspot'):.0f} paq/s | "
+                 f"Internet: {upstream_mbps:.1f} Mbps (media {sampler.average_mbps('upstream'):.1f}), "
+                 f"{sampler.current_pps('upstream'):.0f} paq/s"
+        )
         
-        self._update_status(msg)
+        canvas = self.traffic_canvas
+        canvas.delete("all")
+        width = int(canvas.cget("width"))
+        height = int(canvas.cget("height"))
+        series = {label: sampler.series_mbps(label) for label in ("upstream", "hotspot")}
+        peak = max([1.0] + [value for values in series.values() for value in values])
+        step = width / (sampler.size - 1)
+        
+        for label, color in [("upstream", "#1976D2"), ("hotspot", "#388E3C")]:
+            values = series[label]
+            if len(values) < 2:
+                continue
+            offset = width - step * (len(values) - 1)
+            points = []
+            for i, value in enumerate(values):
+                points.extend([offset + i * step, height - 2 - value / peak * (height - 4)])
+            canvas.create_line(*points, fill=color)
+        
+        self.root.after(int(sampler.interval * 1000), lambda: self._draw_traffic(sampler))
+    
+    def _show_clients(self, clients: list):
+        # La lista llega en el snapshot o en el monitor: no hace falta otro proceso.
+        added, removed, updated = hotspot_clients.diff_clients(self._client_rows, clients)
+        for mac in removed:
+            self.clients_tree.delete(mac)
+            del self._client_rows[mac]
+        for client in updated:
+            self.clients_tree.item(client.mac, values=(client.mac, client.hostname, client.ip))
+            self._client_rows[client.mac] = client
+        for client in added:
+            self.clients_tree.insert("", tk.END, iid=client.mac, values=(client.mac, client.hostname, client.ip))
+            self._client_rows[client.mac] = client
     
     def _create_hotspot(self):
         ssid = self.ssid_var.get().strip()
@@ -444,76 +760,143 @@ class HotspotApp:
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
         
+        band = self._selected_band()
+        
         def create():
-            métodos = ["mobile", "python", "powershell"]
-            metodo_seleccionado = self.current_method.get()
+            orden = backends.fallback_order(self.current_method.get())
+            if "mobile" in orden:
+                backends.get("mobile").set_band(band)
+            metodos = [(backends.description(metodo), backends.get(metodo)) for metodo in orden]
             
-            if metodo_seleccionado in métodos:
-                start_index = métodos.index(metodo_seleccionado)
-                orden = métodos[start_index:] + métodos[:start_index]
-            else:
-                orden = métodos
-            
-            mensajes: list[str] = []
-            exito_general = False
-            
-            for metodo in orden:
-                if metodo == "mobile":
-                    manager = hotspot_mobile
-                    descripcion = "Mobile Hotspot (Windows API)"
-                elif metodo == "python":
-                    manager = hotspot_python
-                    descripcion = "Python (netsh)"
-                else:
-                    manager = hotspot_powershell
-                    descripcion = "PowerShell (netsh)"
-                
-                encabezado = f"[METODO: {descripcion}]"
-                mensajes.append(encabezado)
-                
-                ok, msg = manager.create_hotspot(ssid, password)
-                mensajes.append(msg)
-                
-                if ok:
-                    exito_general = True
-                    break
-                else:
-                    mensajes.append("\n--- Intentando siguiente metodo...\n")
+            exito_general, mensajes = hotspot_fallback.create_with_fallback(metodos, ssid, password)
             
             mensaje_final = f"Creando hotspot '{ssid}' con multiples metodos...\n\n" + "\n\n".join(mensajes)
             return exito_general, mensaje_final
         
-        self._run_async(create)
+        self._run_async(create, "CREAR HOTSPOT")
+    
+    def _resume_hotspot(self, from_launch: bool = False):
+        # Ultima configuracion que funciono: se arranca directamente con su metodo,
+        # sin la verificacion de compatibilidad, y solo si falla se usa la ruta completa.
+        journal = state_journal.load()
+        if not journal.configured or journal.method not in backends.ORDER:
+            self._update_status("No hay una configuracion anterior para reanudar.\n\nCrea el hotspot una vez con 'Crear Hotspot'.")
+            return
+        
+        ssid = journal.ssid
+        # Sin contrasena guardada (sin DPAPI) se usa la del formulario.
+        password = journal.password if journal.password is not None else self.password_var.get().strip()
+        if not password:
+            messagebox.showerror("Error", "No hay contrasena guardada: escribela y pulsa Reanudar")
+            return
+        
+        if self.developer_mode.get():
+            error_handler.DebugLogger.enable()
+        
+        method = journal.method
+        self.current_method.set(method)
+        self.ssid_var.set(ssid)
+        self._update_status(f"Reanudando hotspot '{ssid}' [{backends.description(method)}]...")
+        started = time.perf_counter()
+        launch_age = startup_profile.process_age() if from_launch else None
+        
+        band = self._selected_band()
+        
+        def resume():
+            if "mobile" in backends.fallback_order(method):
+                backends.get("mobile").set_band(band)
+            manager = backends.get(method)
+            mensajes = [f"[METODO: {backends.description(method)}]"]
+            ok, msg = retry_policy.call(lambda: manager.create_hotspot(ssid, password), manager)
+            mensajes.append(msg)
+            
+            # El metodo guardado ya se intento (con reintentos): la ruta completa sigue con los demas.
+            orden = backends.fallback_order(method)[1:]
+            if not ok and orden:
+                mensajes.append("\n--- Reanudacion rapida fallida, probando los demas metodos...\n")
+                metodos = [(backends.description(metodo), backends.get(metodo)) for metodo in orden]
+                ok, resto = hotspot_fallback.create_with_fallback(metodos, ssid, password)
+                mensajes.extend(resto)
+            
+            elapsed = time.perf_counter() - started
+            tiempo = f"Tiempo de reanudacion: {elapsed:.2f} s"
+            if ok:
+                startup_profile.mark("hotspot_on")
+                if launch_age is not None:
+                    tiempo += f" ({launch_age + elapsed:.2f} s desde el inicio del proceso)"
+            
+            mensaje_final = f"Reanudando hotspot '{ssid}'...\n\n" + "\n\n".join(mensajes) + f"\n\n{tiempo}"
+            return ok, mensaje_final
+        
+        self._run_async(resume, "REANUDAR HOTSPOT")
+    
+    def _selected_band(self) -> str:
+        label = self.band_var.get()
+        return next((band for band, text in wifi_band.LABELS.items() if text == label), wifi_band.BAND_AUTO)
+    
+    def _teardown_backends(self) -> list:
+        # El hotspot pudo quedar encendido por otro metodo tras el cambio automatico.
+        # Los backends se importan en los hilos de hotspot_fallback, no aqui.
+        orden = backends.teardown_order(self.current_method.get())
+        return [(backends.description(metodo), functools.partial(backends.get, metodo)) for metodo in orden]
     
     def _stop_hotspot(self):
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
         
-        manager = self._get_manager()
         self._update_status("Deteniendo hotspot...")
+        metodos = self._teardown_backends()
+        
+        def stop():
+            exito_general, mensajes = hotspot_fallback.stop_all(metodos)
+            return exito_general, "Deteniendo hotspot en todos los metodos...\n\n" + "\n\n".join(mensajes)
         
-        self._run_async(manager.stop_hotspot)
+        self._run_async(stop, "DETENER HOTSPOT")
     
     def _delete_hotspot(self):
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
         
-        manager = self._get_manager()
         self._update_status("Eliminando hotspot...")
+        metodos = self._teardown_backends()
+        
+        def delete():
+            exito_general, mensajes = hotspot_fallback.delete_all(metodos)
+            return exito_general, "Eliminando hotspot en todos los metodos...\n\n" + "\n\n".join(mensajes)
         
-        self._run_async(manager.delete_hotspot)
+        self._run_async(delete, "ELIMINAR HOTSPOT")
     
     def _show_status(self):
         if self.developer_mode.get():
             error_handler.DebugLogger.enable()
         
         manager = self._get_manager()
-        self._run_async(manager.get_status)
+        
+        def status():
+            with error_handler.operation("ESTADO"):
+                snap = manager.snapshot()
+                self.root.after(0, lambda: self._apply_snapshot(snap))
+                return manager.format_status(snap)
+        
+        self._run_async(status, "ESTADO")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="MyHotspot - Gestor de Punto de Acceso Wi-Fi")
+    parser.add_argument("--resume", action="store_true", help="Reanuda al arrancar la ultima configuracion que funciono")
+    parser.add_argument("--band", choices=wifi_band.BANDS, default=wifi_band.BAND_AUTO, help="Banda Wi-Fi del Mobile Hotspot en GHz")
+    args = parser.parse_args()
+    
+    log_sink.install()
+    metrics.install()
     root = tk.Tk()
-    app = HotspotApp(root)
+    
+    def on_map(event):
+        if event.widget is root:
+            startup_profile.mark("window")
+    
+    root.bind("<Map>", on_map, add="+")
+    app = HotspotApp(root, resume=args.resume, band=args.band)
     root.mainloop()
 
 
@@ -0,0 +1,195 @@
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import backends
+import error_handler
+import powershell_launcher
+import transcript
+
+# MYHOTSPOT_METRICS_PORT activa el endpoint (solo en 127.0.0.1); sin valor no se abre nada.
+PORT = int(os.environ.get("MYHOTSPOT_METRICS_PORT", "0") or 0)
+HOST = "127.0.0.1"
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Metodos cuyos comandos se lanzan con cmd.exe ("" = sondas de diagnostico).
+CMD_METHODS = ("python", "")
+STATES = ("Off", "On", "InTransition", "Unknown")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values, amount: float = 1.0):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_labels(self.labels, values)} {value:g}" for values, value in items)
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # etiquetas -> (conteo por cubeta, suma, total)
+        self._values: dict[tuple, tuple[list[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(values) or ([0] * len(self.buckets), 0.0, 0)
+            if index < len(counts):
+                counts[index] += 1
+            self._values[values] = (counts, total + value, count + 1)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((values, (list(counts), total, count)) for values, (counts, total, count) in self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {count}")
+        return lines
+
+
+operations_total = Counter("myhotspot_operations_total", "Operaciones del backend terminadas", ("operation", "method", "result"))
+operation_seconds = Histogram("myhotspot_operation_duration_seconds", "Duracion de las operaciones del backend", ("operation", "method"))
+commands_total = Counter("myhotspot_commands_total", "Comandos netsh/PowerShell ejecutados", ("step", "method", "result"))
+command_seconds = Histogram("myhotspot_command_duration_seconds", "Duracion de cada comando", ("step", "method"))
+errors_total = Counter("myhotspot_errors_total", "Comandos fallidos por categoria de error", ("category",))
+cmd_spawns_total = Counter("myhotspot_cmd_spawns_total", "Procesos cmd.exe lanzados para netsh")
+
+_METRICS = [operations_total, operation_seconds, commands_total, command_seconds, errors_total, cmd_spawns_total]
+
+_state: dict = {}
+_state_lock = threading.Lock()
+_module_methods = {module_name: method for method, (module_name, _) in backends.BACKENDS.items()}
+
+
+def observe_state(state: dict):
+    # Ultimo estado conocido (monitor o snapshot); el scrape nunca consulta al sistema.
+    with _state_lock:
+        _state.update({key: value for key, value in state.items() if key in ("state", "clients", "max_clients")})
+
+
+def _on_log(info: error_handler.DebugInfo):
+    result = "ok" if info.success else "error"
+    commands_total.inc(info.step, info.method, result)
+    if info.duration:
+        command_seconds.observe(info.duration, info.step, info.method)
+    if not info.success:
+        errors_total.inc(error_handler.error_category(info.stderr or info.stdout))
+    if info.method in CMD_METHODS and not transcript.replaying():
+        cmd_spawns_total.inc()
+
+
+def _on_operation(name: str, module: str, elapsed: float, ok: bool):
+    method = _module_methods.get(module, "")
+    operations_total.inc(name, method, "ok" if ok else "error")
+    operation_seconds.observe(elapsed, name, method)
+
+
+def render() -> str:
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+
+    lines.append("# HELP myhotspot_powershell_spawns_total Procesos de PowerShell lanzados (incluye precalentados)")
+    lines.append("# TYPE myhotspot_powershell_spawns_total counter")
+    lines.append(f"myhotspot_powershell_spawns_total {powershell_launcher.launcher.spawns}")
+
+    with _state_lock:
+        state = dict(_state)
+    lines.append("# HELP myhotspot_hotspot_state Estado de tethering observado (1 = actual)")
+    lines.append("# TYPE myhotspot_hotspot_state gauge")
+    current = state.get("state", "Unknown")
+    for name in STATES if current in STATES else STATES + (current,):
+        lines.append(f'myhotspot_hotspot_state{{state="{_escape(name)}"}} {1 if name == current else 0}')
+    for key, help_text in [("clients", "Clientes conectados"), ("max_clients", "Maximo de clientes")]:
+        value = state.get(key)
+        lines.append(f"# HELP myhotspot_hotspot_{key} {help_text}")
+        lines.append(f"# TYPE myhotspot_hotspot_{key} gauge")
+        if isinstance(value, int):
+            lines.append(f"myhotspot_hotspot_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_installed = False
+
+
+def install(port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    global _server, _installed
+    port = PORT if port is None else port
+    if not port:
+        return None
+    if not _installed:
+        _installed = True
+        error_handler.DebugLogger.add_listener(_on_log)
+        error_handler.add_operation_listener(_on_operation)
+    if _server is not None:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((HOST, port), _Handler)
+    except OSError:
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="myhotspot-metrics", daemon=True).start()
+    return _server
+
+
+def shutdown():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
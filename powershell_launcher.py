@@ -0,0 +1,226 @@
+import base64
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# Sin perfil, sin banner y sin host interactivo.
+LEAN_ARGS = ["-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass"]
+
+# Limite de la linea de comandos de Windows (32767) con margen para el ejecutable y los argumentos.
+MAX_ENCODED_LENGTH = 30000
+
+BENCHMARK_RUNS = 2
+CANDIDATES = ["powershell", "pwsh"]
+
+_PREAMBLE = "$ProgressPreference = 'SilentlyContinue'\n"
+_PROBE_SCRIPT = "$PSVersionTable.PSVersion.ToString()"
+_WINRT_PROBE_SCRIPT = (
+    "[Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime] > $null\n"
+    "Write-Output 'WINRT_OK'"
+)
+
+
+@dataclass
+class Interpreter:
+    name: str
+    path: str
+    version: str = ""
+    startup_ms: float = 0.0
+    winrt: bool = False
+
+
+def _cache_path() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "MyHotspot", "powershell.json")
+
+
+def encode_command(script: str) -> str:
+    return base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+
+
+def clean_stderr(stderr: str) -> str:
+    # Con -EncodedCommand, Windows PowerShell puede serializar stderr como CLIXML.
+    if not stderr.startswith("#< CLIXML"):
+        return stderr
+    messages = re.findall(r'<S S="Error">(.*?)</S>', stderr, re.DOTALL)
+    text = "".join(messages).replace("_x000D_", "").replace("_x000A_", "\n")
+    return html.unescape(text)
+
+
+def _creationflags() -> int:
+    return getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _remove(path: Optional[str]):
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PowerShellLauncher:
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path or _cache_path()
+        self._lock = threading.Lock()
+        self._interpreters: Optional[list[Interpreter]] = None
+        self._measuring: Optional[threading.Thread] = None
+        # Procesos de PowerShell lanzados (mediciones, comandos y precalentados).
+        self.spawns = 0
+
+    def _load_cache(self) -> Optional[list[Interpreter]]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            interpreters = [Interpreter(**item) for item in data["interpreters"]]
+        except Exception:
+            return None
+        # Descarta la cache si algun interprete ya no existe.
+        if any(not os.path.exists(item.path) for item in interpreters):
+            return None
+        return interpreters
+
+    def _save_cache(self, interpreters: list[Interpreter]):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"interpreters": [asdict(item) for item in interpreters]}, f, indent=2)
+        except OSError:
+            pass
+
+    def _probe(self, path: str, script: str) -> Optional[subprocess.CompletedProcess]:
+        self.spawns += 1
+        try:
+            return subprocess.run(
+                [path] + LEAN_ARGS + ["-EncodedCommand", encode_command(script)],
+                capture_output=True,
+                text=True,
+                timeout=60,
+                creationflags=_creationflags()
+            )
+        except Exception:
+            return None
+
+    def benchmark(self) -> list[Interpreter]:
+        interpreters = []
+        for name in CANDIDATES:
+            path = shutil.which(name)
+            if path is None:
+                continue
+
+            timings = []
+            version = ""
+            for _ in range(BENCHMARK_RUNS):
+                start = time.perf_counter()
+                result = self._probe(path, _PROBE_SCRIPT)
+                if result is None or result.returncode != 0:
+                    break
+                timings.append((time.perf_counter() - start) * 1000)
+                version = result.stdout.strip()
+            if len(timings) < BENCHMARK_RUNS:
+                continue
+
+            winrt_result = self._probe(path, _WINRT_PROBE_SCRIPT)
+            winrt = winrt_result is not None and "WINRT_OK" in winrt_result.stdout
+            interpreters.append(Interpreter(name, path, version, min(timings), winrt))
+
+        interpreters.sort(key=lambda item: item.startup_ms)
+        return interpreters
+
+    def _measure(self):
+        interpreters = self.benchmark()
+        if interpreters:
+            self._save_cache(interpreters)
+        with self._lock:
+            self._interpreters = interpreters
+            self._measuring = None
+
+    def measuring(self) -> bool:
+        with self._lock:
+            return self._measuring is not None
+
+    def interpreters(self, refresh: bool = False) -> list[Interpreter]:
+        if refresh:
+            self._measure()
+        with self._lock:
+            if self._interpreters is None:
+                self._interpreters = self._load_cache()
+            if self._interpreters is not None:
+                return list(self._interpreters)
+            # Sin cache: se mide en segundo plano (varios arranques de PowerShell) y
+            # mientras tanto se usa el interprete por defecto.
+            if self._measuring is None:
+                self._measuring = threading.Thread(target=self._measure, name="myhotspot-ps-benchmark", daemon=True)
+                self._measuring.start()
+            return []
+
+    def select(self, requires_winrt: bool = False) -> Interpreter:
+        for interpreter in self.interpreters():
+            if interpreter.winrt or not requires_winrt:
+                return interpreter
+        # Sin interpretes detectados: se mantiene el comportamiento clasico.
+        return Interpreter("powershell", "powershell")
+
+    def build_command(self, script: str, requires_winrt: bool = False) -> tuple[list[str], Optional[str]]:
+        interpreter = self.select(requires_winrt)
+        script = _PREAMBLE + script
+        encoded = encode_command(script)
+
+        if len(encoded) <= MAX_ENCODED_LENGTH:
+            return [interpreter.path] + LEAN_ARGS + ["-EncodedCommand", encoded], None
+
+        # Scripts largos: archivo temporal (UTF-8 con BOM para Windows PowerShell 5.1).
+        fd, path = tempfile.mkstemp(prefix="myhotspot_", suffix=".ps1")
+        with os.fdopen(fd, "w", encoding="utf-8-sig") as f:
+            f.write("& {\n" + script + "\n}\nif (-not $?) { exit 1 }\n")
+        return [interpreter.path] + LEAN_ARGS + ["-File", path], path
+
+    def run(self, script: str, requires_winrt: bool = False) -> subprocess.CompletedProcess:
+        args, temp_path = self.build_command(script, requires_winrt)
+        self.spawns += 1
+        try:
+            result = subprocess.run(
+                args,
+                capture_output=True,
+                text=True,
+                creationflags=_creationflags()
+            )
+        finally:
+            _remove(temp_path)
+        result.stderr = clean_stderr(result.stderr)
+        return result
+
+    def popen(self, script: str, requires_winrt: bool = False, creationflags: int = 0, **kwargs) -> subprocess.Popen:
+        args, temp_path = self.build_command(script, requires_winrt)
+        self.spawns += 1
+        process = subprocess.Popen(args, creationflags=_creationflags() | creationflags, **kwargs)
+        if temp_path is not None:
+            threading.Thread(target=lambda: (process.wait(), _remove(temp_path)), daemon=True).start()
+        return process
+
+    def describe(self) -> str:
+        interpreters = self.interpreters()
+        if not interpreters:
+            if self.measuring():
+                return "Interprete PowerShell: midiendo en segundo plano (se usa powershell mientras tanto)"
+            return "Interprete PowerShell: no detectado"
+
+        lines = ["Interpretes PowerShell (medidos al primer uso):"]
+        for item in interpreters:
+            winrt = "si" if item.winrt else "no"
+            lines.append(f"  {item.name} {item.version} - arranque {item.startup_ms:.0f} ms - WinRT: {winrt} ({item.path})")
+        lines.append(f"  Elegido para netsh: {self.select().name}")
+        lines.append(f"  Elegido para Mobile Hotspot: {self.select(requires_winrt=True).name}")
+        return "\n".join(lines)
+
+
+launcher = PowerShellLauncher()
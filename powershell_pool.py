@@ -0,0 +1,201 @@
+import atexit
+import ctypes
+import os
+import subprocess
+import threading
+import time
+from typing import Optional
+
+import powershell_launcher
+import transcript
+
+READY_MARKER = "__MYHOTSPOT_READY__"
+READY_TIMEOUT = 30.0
+
+BELOW_NORMAL_PRIORITY_CLASS = 0x00004000
+NORMAL_PRIORITY_CLASS = 0x00000020
+
+WINRT_PRELOAD = """
+[Windows.Networking.Connectivity.NetworkInformation,Windows.Networking.Connectivity,ContentType=WindowsRuntime] > $null
+[Windows.Networking.NetworkOperators.NetworkOperatorTetheringManager,Windows.Networking.NetworkOperators,ContentType=WindowsRuntime] > $null
+[Windows.Foundation.AsyncStatus,Windows,ContentType=WindowsRuntime] > $null
+"""
+
+# El proceso carga .NET (y los tipos indicados), avisa que esta listo y espera
+# el script por stdin. Se ejecuta como scriptblock para respetar 'return'.
+_BOOTSTRAP = """
+{preload}
+[Console]::Out.WriteLine('{marker}')
+[Console]::Out.Flush()
+$__script = [Console]::In.ReadToEnd()
+try {{
+    & ([scriptblock]::Create($__script))
+}} catch {{
+    [Console]::Error.WriteLine($_.Exception.Message)
+    exit 1
+}}
+if (-not $?) {{ exit 1 }}
+exit 0
+"""
+
+
+def on_battery() -> bool:
+    class SYSTEM_POWER_STATUS(ctypes.Structure):
+        _fields_ = [
+            ("ACLineStatus", ctypes.c_ubyte),
+            ("BatteryFlag", ctypes.c_ubyte),
+            ("BatteryLifePercent", ctypes.c_ubyte),
+            ("SystemStatusFlag", ctypes.c_ubyte),
+            ("BatteryLifeTime", ctypes.c_ulong),
+            ("BatteryFullLifeTime", ctypes.c_ulong),
+        ]
+
+    try:
+        status = SYSTEM_POWER_STATUS()
+        if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+            return False
+        return status.ACLineStatus == 0
+    except:
+        return False
+
+
+class WarmProcess:
+    def __init__(self, preload: str, requires_winrt: bool):
+        self.spawned_at = time.perf_counter()
+        self.ready_after: Optional[float] = None
+        self._ready = threading.Event()
+        self.process = powershell_launcher.launcher.popen(
+            _BOOTSTRAP.format(preload=preload, marker=READY_MARKER),
+            requires_winrt,
+            creationflags=BELOW_NORMAL_PRIORITY_CLASS,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        threading.Thread(target=self._wait_ready, daemon=True).start()
+
+    def _wait_ready(self):
+        try:
+            line = self.process.stdout.readline()
+        except Exception:
+            line = ""
+        if READY_MARKER in line:
+            self.ready_after = time.perf_counter() - self.spawned_at
+        self._ready.set()
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, script: str) -> Optional[subprocess.CompletedProcess]:
+        if not self._ready.wait(READY_TIMEOUT) or self.ready_after is None:
+            self.kill()
+            return None
+
+        try:
+            ctypes.windll.kernel32.SetPriorityClass(int(self.process._handle), NORMAL_PRIORITY_CLASS)
+        except:
+            pass
+
+        stdout, stderr = self.process.communicate(script)
+        return subprocess.CompletedProcess(
+            self.process.args, self.process.returncode, stdout, powershell_launcher.clean_stderr(stderr)
+        )
+
+    def kill(self):
+        try:
+            self.process.kill()
+        except Exception:
+            pass
+
+
+class PowerShellPool:
+    def __init__(self, preload: str = "", requires_winrt: bool = False):
+        self.preload = preload
+        self.requires_winrt = requires_winrt
+        self.enabled = os.environ.get("MYHOTSPOT_PREWARM", "1") != "0"
+        self.skip_on_battery = True
+        self._lock = threading.Lock()
+        self._warm: Optional[WarmProcess] = None
+        self.first_action: Optional[tuple[bool, float]] = None
+        self.timings: dict[bool, list[float]] = {True: [], False: []}
+
+    def _allowed(self) -> bool:
+        if transcript.replaying():
+            return False
+        return self.enabled and not (self.skip_on_battery and on_battery())
+
+    def warm_up(self):
+        if not self._allowed():
+            return
+        with self._lock:
+            if self._warm is not None and self._warm.is_alive():
+                return
+            try:
+                self._warm = WarmProcess(self.preload, self.requires_winrt)
+            except Exception:
+                self._warm = None
+
+    def take(self) -> Optional[WarmProcess]:
+        with self._lock:
+            warm, self._warm = self._warm, None
+        if warm is not None and not warm.is_alive():
+            warm = None
+
+        # Reponer en segundo plano para la siguiente operacion.
+        threading.Thread(target=self.warm_up, daemon=True).start()
+        return warm
+
+    def record(self, warm: bool, elapsed: float):
+        with self._lock:
+            if self.first_action is None:
+                self.first_action = (warm, elapsed)
+            self.timings[warm].append(elapsed)
+
+    def shutdown(self):
+        with self._lock:
+            warm, self._warm = self._warm, None
+        if warm is not None:
+            warm.kill()
+
+    def latency_report(self) -> str:
+        with self._lock:
+            first = self.first_action
+            timings = {key: list(values) for key, values in self.timings.items()}
+
+        lines = ["Latencia de PowerShell:"]
+        if first is not None:
+            kind = "en caliente" if first[0] else "en frio"
+            lines.append(f"  Primera accion: {first[1] * 1000:.0f} ms ({kind})")
+        for warm, label in [(False, "En frio"), (True, "En caliente")]:
+            values = timings[warm]
+            if values:
+                lines.append(f"  {label}: media {sum(values) / len(values) * 1000:.0f} ms ({len(values)} llamadas)")
+        if len(lines) == 1:
+            lines.append("  Sin llamadas todavia")
+        return "\n".join(lines)
+
+
+winrt_pool = PowerShellPool(WINRT_PRELOAD, requires_winrt=True)
+plain_pool = PowerShellPool()
+
+
+def run(pool: PowerShellPool, command: str) -> subprocess.CompletedProcess:
+    start = time.perf_counter()
+    result = None
+    warm = pool.take()
+    if warm is not None:
+        result = warm.run(command)
+
+    if result is None:
+        result = powershell_launcher.launcher.run(command, pool.requires_winrt)
+        pool.record(False, time.perf_counter() - start)
+    else:
+        pool.record(True, time.perf_counter() - start)
+    return result
+
+
+@atexit.register
+def _shutdown():
+    winrt_pool.shutdown()
+    plain_pool.shutdown()
@@ -0,0 +1,218 @@
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TypeVar
+
+import error_handler
+
+# MYHOTSPOT_PROFILE=1 perfila cada operacion aunque el modo desarrollador este apagado;
+# MYHOTSPOT_PROFILE_MEMORY=1 agrega instantaneas de tracemalloc antes y despues.
+ENABLED = os.environ.get("MYHOTSPOT_PROFILE", "0") == "1"
+MEMORY = os.environ.get("MYHOTSPOT_PROFILE_MEMORY", "0") == "1"
+# Archivos que se conservan en la carpeta (los mas antiguos se borran).
+KEEP = int(os.environ.get("MYHOTSPOT_PROFILE_KEEP", "40"))
+TOP_FUNCTIONS = 8
+TOP_ALLOCATIONS = 25
+
+T = TypeVar("T")
+
+
+def default_dir() -> str:
+    path = os.environ.get("MYHOTSPOT_PROFILE_DIR")
+    if path:
+        return path
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "MyHotspot", "profiles")
+
+
+@dataclass
+class OperationProfile:
+    name: str
+    elapsed: float
+    # time.perf_counter() al terminar, para saber que perfiles cayeron dentro de una accion.
+    finished: float = 0.0
+    profile_path: Optional[str] = None
+    allocation_path: Optional[str] = None
+    functions: list[str] = field(default_factory=list)
+    allocated_kb: Optional[float] = None
+
+    def summary(self) -> str:
+        lines = [f"PERFIL: {self.name} - {self.elapsed * 1000:.1f} ms"]
+        if self.allocated_kb is not None:
+            lines[0] += f", {self.allocated_kb:+.1f} KB"
+        lines.append("  Acumulado  Llamadas  Funcion")
+        lines.extend(f"  {line}" for line in self.functions)
+        for path in (self.profile_path, self.allocation_path):
+            if path:
+                lines.append(f"  Archivo: {path}")
+        return "\n".join(lines)
+
+
+_enabled = False
+_memory = MEMORY
+_directory = default_dir()
+# cProfile admite un solo perfilador activo: las operaciones anidadas o
+# simultaneas quedan dentro (o fuera) del perfil de la que lo tiene.
+_busy = threading.Lock()
+_recent: deque = deque(maxlen=5)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(memory: bool = MEMORY, directory: Optional[str] = None):
+    global _enabled, _memory, _directory
+    _memory = memory
+    _directory = directory or default_dir()
+    _enabled = True
+    error_handler.set_profiler(_traced_profile)
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    error_handler.set_profiler(None)
+
+
+def set_developer_mode(developer: bool):
+    if developer or ENABLED:
+        enable(_memory, _directory)
+    else:
+        disable()
+
+
+def recent(since: float = 0.0) -> list[OperationProfile]:
+    return [op_profile for op_profile in list(_recent) if op_profile.finished >= since]
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "operacion"
+
+
+def _top_functions(profiler: cProfile.Profile) -> list[str]:
+    stats = pstats.Stats(profiler).stats
+    own_file = os.path.abspath(__file__)
+    rows = []
+    for (filename, line, function), (_, calls, _, cumulative, _) in stats.items():
+        if filename == own_file or function.startswith("<built-in method builtins.exec"):
+            continue
+        where = f"{os.path.basename(filename)}:{line}({function})" if line else function
+        rows.append((cumulative, calls, where))
+    rows.sort(reverse=True)
+    return [f"{cumulative * 1000:8.1f} ms {calls:8}  {where}" for cumulative, calls, where in rows[:TOP_FUNCTIONS]]
+
+
+def _prune(directory: str):
+    try:
+        entries = [os.path.join(directory, name) for name in os.listdir(directory)]
+    except OSError:
+        return
+    files = sorted((path for path in entries if os.path.isfile(path)), key=os.path.getmtime)
+    for path in files[:max(0, len(files) - KEEP)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _write_allocations(path: str, name: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> float:
+    stats = after.compare_to(before, "lineno")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Asignaciones durante {name}\n")
+        for stat in stats[:TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
+    return sum(stat.size_diff for stat in stats) / 1024
+
+
+def profile(name: str, func: Callable[[], T],
+            watch: Optional[Callable[[Callable[[], OperationProfile]], None]] = None) -> tuple[T, Optional[OperationProfile]]:
+    # watch recibe una funcion que devuelve el perfil parcial mientras func sigue corriendo.
+    if not _enabled or not _busy.acquire(blocking=False):
+        return func(), None
+
+    try:
+        started_tracing = False
+        before = None
+        if _memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        if watch is not None:
+            owner = threading.get_ident()
+            watch(lambda: _partial(name, profiler, start, owner))
+        profiler.enable()
+        try:
+            result = func()
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot() if before is not None else None
+            if started_tracing:
+                tracemalloc.stop()
+
+        op_profile = OperationProfile(name, elapsed, start + elapsed, functions=_top_functions(profiler))
+        prefix = os.path.join(_directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(start * 1000) % 1000:03d}-{_slug(name)}")
+        try:
+            os.makedirs(_directory, exist_ok=True)
+            profiler.dump_stats(f"{prefix}.prof")
+            op_profile.profile_path = f"{prefix}.prof"
+            if before is not None:
+                op_profile.allocated_kb = _write_allocations(f"{prefix}.alloc.txt", name, before, after)
+                op_profile.allocation_path = f"{prefix}.alloc.txt"
+            _prune(_directory)
+        except OSError:
+            pass
+    finally:
+        _busy.release()
+
+    _recent.append(op_profile)
+    return result, op_profile
+
+
+def _partial(name: str, profiler: cProfile.Profile, start: float, owner: int) -> OperationProfile:
+    elapsed = time.perf_counter() - start
+    if threading.get_ident() != owner:
+        # Desde otro hilo no se puede pausar el perfilador: solo el tiempo.
+        return OperationProfile(f"{name} (hasta el reporte)", elapsed)
+    # Se pausa el perfilador para que el propio calculo no cuente en el perfil.
+    profiler.disable()
+    try:
+        return OperationProfile(f"{name} (hasta el reporte)", elapsed, functions=_top_functions(profiler))
+    finally:
+        profiler.enable()
+
+
+def _traced_profile(name: str, func: Callable[[], T]) -> T:
+    # Los backends arman su reporte dentro de func: el perfil en curso entra en el
+    # reporte como nota calculada y el definitivo queda como nota al terminar.
+    op = error_handler.current_operation()
+    reporters = []
+
+    def watch(partial: Callable[[], OperationProfile]):
+        if op is not None:
+            reporters.append(lambda: partial().summary())
+            op.add_reporter(reporters[0])
+
+    try:
+        result, op_profile = profile(name, func, watch)
+    finally:
+        for reporter in reporters:
+            op.remove_reporter(reporter)
+    if op_profile is not None:
+        error_handler.DebugLogger.add_note(op_profile.summary())
+    return result
+
+
+if ENABLED:
+    enable()
@@ -0,0 +1,99 @@
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import error_handler
+
+MAX_ATTEMPTS = int(os.environ.get("MYHOTSPOT_RETRY_ATTEMPTS", "3"))
+RETRY_DEADLINE = float(os.environ.get("MYHOTSPOT_RETRY_DEADLINE", "20"))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = MAX_ATTEMPTS
+    base_delay: float = 1.0
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+    # Fraccion de variacion aleatoria para no reintentar en sincronia.
+    jitter: float = 0.5
+    deadline: float = RETRY_DEADLINE
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter + 2 * self.jitter * rng())
+
+
+DEFAULT_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+@dataclass
+class RetryResult:
+    ok: bool
+    message: str
+    attempts: int = 1
+    retry_time: float = 0.0
+    actions: list[str] = field(default_factory=list)
+
+    def report(self) -> str:
+        if self.attempts <= 1:
+            return ""
+        line = f"Reintentos: {self.attempts} intentos, {self.retry_time:.1f}s reintentando"
+        if self.actions:
+            line += f" (acciones: {', '.join(self.actions)})"
+        return line
+
+
+def run_with_retry(
+    func: Callable[[], tuple[bool, str]],
+    policy: RetryPolicy = DEFAULT_POLICY,
+    manager=None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic
+) -> RetryResult:
+    started = clock()
+    first_failure: Optional[float] = None
+    actions: list[str] = []
+    attempt = 0
+
+    while True:
+        attempt += 1
+        try:
+            ok, msg = func()
+        except Exception as e:
+            ok, msg = False, f"Error inesperado: {str(e)}"
+
+        retry_time = clock() - first_failure if first_failure is not None else 0.0
+        if ok:
+            return RetryResult(True, msg, attempt, retry_time, actions)
+
+        retryable, corrective = error_handler.classify_error(msg)
+        if not retryable or attempt >= policy.max_attempts:
+            return RetryResult(False, msg, attempt, retry_time, actions)
+
+        delay = policy.delay(attempt)
+        if clock() + delay - started > policy.deadline:
+            return RetryResult(False, msg, attempt, retry_time, actions)
+
+        if first_failure is None:
+            first_failure = clock()
+
+        action = getattr(manager, corrective, None) if corrective else None
+        if action is not None:
+            actions.append(corrective)
+            try:
+                action()
+            except Exception:
+                pass
+
+        sleep(delay)
+
+
+def call(func: Callable[[], tuple[bool, str]], manager=None, policy: RetryPolicy = DEFAULT_POLICY) -> tuple[bool, str]:
+    result = run_with_retry(func, policy, manager)
+    report = result.report()
+    if report:
+        return result.ok, f"{result.message}\n\n{report}"
+    return result.ok, result.message
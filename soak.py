@@ -0,0 +1,326 @@
+import argparse
+import csv
+import ctypes
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import weakref
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Optional
+
+import error_handler
+import hotspot_simulated
+import log_sink
+
+SSID = "Soak"
+PASSWORD = "soakpass1"
+
+
+@dataclass
+class Sample:
+    t: float
+    phase: str
+    cycle: int
+    rss_kb: int
+    traced_kb: int
+    threads: int
+    handles: int
+    # Dialogos ya cerrados que siguen vivos en memoria.
+    windows: int = 0
+
+
+@dataclass(frozen=True)
+class Budget:
+    # Crecimiento maximo entre la linea base (tras el calentamiento) y el final.
+    rss_kb: int = 20 * 1024
+    traced_kb: int = 4 * 1024
+    threads: int = 4
+    handles: int = 16
+    windows: int = 0
+
+
+def _rss_kb() -> int:
+    if sys.platform == "win32":
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.c_ulong),
+                ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize // 1024
+        return 0
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def _handles() -> int:
+    # Descriptores abiertos (Linux) o handles del proceso (Windows).
+    if sys.platform == "win32":
+        count = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetProcessHandleCount(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(count))
+        return count.value
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return 0
+
+
+class SoakRecorder:
+    def __init__(self, budget: Budget, top: int = 10):
+        self.budget = budget
+        self.top = top
+        self.samples: list[Sample] = []
+        self._start = time.perf_counter()
+        self._baseline: dict[str, Sample] = {}
+        self._baseline_snapshot: dict[str, tracemalloc.Snapshot] = {}
+
+    def sample(self, phase: str, cycle: int, windows: int = 0) -> Sample:
+        sample = Sample(
+            t=round(time.perf_counter() - self._start, 3),
+            phase=phase,
+            cycle=cycle,
+            rss_kb=_rss_kb(),
+            traced_kb=tracemalloc.get_traced_memory()[0] // 1024,
+            threads=threading.active_count(),
+            handles=_handles(),
+            windows=windows,
+        )
+        self.samples.append(sample)
+        return sample
+
+    def mark_baseline(self, phase: str, cycle: int, windows: int = 0):
+        self._baseline[phase] = self.sample(phase, cycle, windows)
+        self._baseline_snapshot[phase] = tracemalloc.take_snapshot()
+
+    def check(self, phase: str) -> list[str]:
+        baseline = self._baseline.get(phase)
+        final = next((sample for sample in reversed(self.samples) if sample.phase == phase), None)
+        if baseline is None or final is None:
+            return []
+
+        violations = []
+        for name in ("rss_kb", "traced_kb", "threads", "handles", "windows"):
+            growth = getattr(final, name) - getattr(baseline, name)
+            limit = getattr(self.budget, name)
+            status = "OK" if growth <= limit else "EXCEDIDO"
+            print(f"  {name:<10} {getattr(baseline, name):>8} -> {getattr(final, name):>8}  (+{growth}, limite +{limit}) {status}")
+            if growth > limit:
+                violations.append(f"{phase}: {name} crecio {growth} (limite {limit})")
+
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline_snapshot[phase], "lineno")
+        growing = [stat for stat in stats if stat.size_diff > 0][:self.top]
+        if growing:
+            print("  Asignaciones que mas crecieron:")
+            for stat in growing:
+                frame = stat.traceback[0]
+                print(f"    +{stat.size_diff / 1024:8.1f} KB  {os.path.basename(frame.filename)}:{frame.lineno}")
+        return violations
+
+    def export(self, path: str):
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([asdict(sample) for sample in self.samples], f, indent=1)
+            return
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(Sample)])
+            writer.writeheader()
+            for sample in self.samples:
+                writer.writerow(asdict(sample))
+
+
+def _configure_backend(error_rate: float, seed: int):
+    # Reloj que avanza en cada lectura: las transiciones terminan sin esperar.
+    now = [0.0]
+
+    def clock() -> float:
+        now[0] += 0.25
+        return now[0]
+
+    config = hotspot_simulated.SimulationConfig(
+        start_delay=0.5, stop_delay=0.25, churn_rate=4.0, error_rate=error_rate, seed=seed
+    )
+    return hotspot_simulated.configure(config, clock)
+
+
+def soak_backend(recorder: SoakRecorder, cycles: int, warmup: int, sample_every: int):
+    module = hotspot_simulated
+    print(f"Backend: {cycles} ciclos crear/estado/sondeo/clientes/soporte/detener")
+    for cycle in range(1, cycles + 1):
+        module.create_hotspot(SSID, PASSWORD)
+        module.get_status()
+        module.poll_state()
+        module.get_clients(force=True)
+        module.check_support()
+        module.stop_hotspot()
+        if cycle % 10 == 0:
+            module.delete_hotspot()
+
+        if cycle == warmup:
+            recorder.mark_baseline("backend", cycle)
+        elif cycle % sample_every == 0:
+            recorder.sample("backend", cycle)
+    recorder.sample("backend", cycles)
+
+
+def _start_virtual_display() -> Optional[subprocess.Popen]:
+    if sys.platform == "win32" or os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+    display = f":{90 + os.getpid() % 100}"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1.0)
+    if process.poll() is not None:
+        return None
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def _pump(root, idle_threads: int, timeout: float = 5.0):
+    # Procesa eventos hasta que terminan los hilos de _run_async y sus 'after'.
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        root.update()
+        if threading.active_count() <= idle_threads:
+            break
+        time.sleep(0.001)
+    root.update()
+
+
+def soak_app(recorder: SoakRecorder, cycles: int, warmup: int, sample_every: int) -> bool:
+    display = _start_virtual_display()
+    try:
+        import tkinter as tk
+        import main
+
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            print(f"App: sin pantalla disponible ({e}); instala Xvfb para esta fase")
+            return False
+        root.withdraw()
+        app = main.HotspotApp(root)
+        app.current_method.set("simulated")
+        app.ssid_var.set(SSID)
+        app.password_var.set(PASSWORD)
+        _pump(root, threading.active_count())
+        idle_threads = threading.active_count()
+        print(f"App: {cycles} ciclos crear/estado/detener en HotspotApp")
+
+        closed: list[weakref.ref] = []
+        dialogs = 0
+
+        def leaked_windows() -> int:
+            # Tras destroy() nadie deberia retener el dialogo.
+            nonlocal closed
+            gc.collect()
+            closed = [ref for ref in closed if ref() is not None]
+            return len(closed)
+
+        actions: list[Callable[[], None]] = [app._create_hotspot, app._show_status, app._stop_hotspot]
+        for cycle in range(1, cycles + 1):
+            for action in actions:
+                action()
+                _pump(root, idle_threads)
+            # Como haria el operador: cerrar los dialogos de error que aparecieron.
+            for window in root.winfo_children():
+                if isinstance(window, tk.Toplevel):
+                    dialogs += 1
+                    closed.append(weakref.ref(window))
+                    window.destroy()
+            root.update()
+
+            if cycle == warmup:
+                recorder.mark_baseline("app", cycle, leaked_windows())
+            elif cycle % sample_every == 0:
+                recorder.sample("app", cycle, leaked_windows())
+        recorder.sample("app", cycles, leaked_windows())
+        print(f"App: {dialogs} dialogos cerrados")
+        root.destroy()
+        return True
+    finally:
+        if display is not None:
+            display.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de resistencia: fugas de hilos, memoria y handles")
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--app-cycles", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--developer", action="store_true", help="Con el modo desarrollador (logs en memoria)")
+    parser.add_argument("--skip-app", action="store_true")
+    parser.add_argument("--output", default="soak.csv", help="Serie temporal (.csv o .json)")
+    parser.add_argument("--rss-mb", type=float, default=Budget.rss_kb / 1024)
+    parser.add_argument("--traced-mb", type=float, default=Budget.traced_kb / 1024)
+    parser.add_argument("--threads", type=int, default=Budget.threads)
+    parser.add_argument("--handles", type=int, default=Budget.handles)
+    args = parser.parse_args()
+
+    budget = Budget(int(args.rss_mb * 1024), int(args.traced_mb * 1024), args.threads, args.handles)
+    log_dir = tempfile.mkdtemp(prefix="myhotspot_soak_")
+    sink = log_sink.install(os.path.join(log_dir, "commands.jsonl"))
+    # La fase de la app no debe tocar el diario de estado del usuario.
+    os.environ["MYHOTSPOT_STATE_FILE"] = os.path.join(log_dir, "state.jsonl")
+    if args.developer:
+        error_handler.DebugLogger.enable()
+    _configure_backend(args.error_rate, args.seed)
+
+    tracemalloc.start(5)
+    recorder = SoakRecorder(budget)
+    violations: list[str] = []
+
+    soak_backend(recorder, args.cycles, min(args.warmup, args.cycles), args.sample_every)
+    violations += recorder.check("backend")
+
+    if not args.skip_app and args.app_cycles > 0:
+        warmup = min(args.warmup // 10 or 1, args.app_cycles)
+        if soak_app(recorder, args.app_cycles, warmup, max(1, args.sample_every // 10)):
+            violations += recorder.check("app")
+        else:
+            violations.append("app: la fase no se pudo ejecutar (usa --skip-app para omitirla)")
+
+    tracemalloc.stop()
+    recorder.export(args.output)
+    print(f"Serie temporal: {args.output} ({len(recorder.samples)} muestras)")
+    if sink is not None:
+        sink.close()
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    if violations:
+        print("FALLO:")
+        for violation in violations:
+            print(f"  {violation}")
+        sys.exit(1)
+    print("OK: sin crecimiento por encima del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import atexit
+import ctypes
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+# MYHOTSPOT_STARTUP_PROFILE=ruta.json guarda los tiempos de arranque al salir.
+PROFILE_PATH = os.environ.get("MYHOTSPOT_STARTUP_PROFILE", "")
+# MYHOTSPOT_STARTUP_EXIT=1 cierra la app tras la primera verificacion (para benchmarks).
+EXIT_AFTER_PROBE = os.environ.get("MYHOTSPOT_STARTUP_EXIT") == "1"
+
+
+def _process_age() -> Optional[float]:
+    # Segundos desde que se creo el proceso: incluye el bootloader de PyInstaller.
+    try:
+        if sys.platform == "win32":
+            creation = ctypes.c_ulonglong()
+            unused = ctypes.c_ulonglong()
+            now = ctypes.c_ulonglong()
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(
+                kernel32.GetCurrentProcess(),
+                ctypes.byref(creation), ctypes.byref(unused), ctypes.byref(unused), ctypes.byref(unused)
+            ):
+                return None
+            kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+            return (now.value - creation.value) / 1e7
+
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except Exception:
+        return None
+
+
+class _TimedLoader:
+    def __init__(self, loader, profile: "StartupProfile"):
+        self._loader = loader
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile.imports.append((module.__name__, time.perf_counter() - start))
+
+
+class _ImportTimer:
+    # Envuelve el loader de cada modulo nuevo; el tiempo incluye sus propios imports.
+    def __init__(self, profile: "StartupProfile"):
+        self._profile = profile
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profile)
+            return spec
+        return None
+
+
+class StartupProfile:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.enabled = bool(path)
+        self.started = time.perf_counter()
+        self.process_age = _process_age() if self.enabled else None
+        self.imports: list[tuple[str, float]] = []
+        self.marks: dict[str, float] = {}
+        if self.enabled:
+            sys.meta_path.insert(0, _ImportTimer(self))
+            atexit.register(self.dump)
+
+    def mark(self, name: str):
+        if self.enabled and name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        offset = self.process_age or 0.0
+        return {
+            "process_age_at_profiler": self.process_age,
+            "marks_ms": {name: round((offset + value) * 1000, 1) for name, value in self.marks.items()},
+            "imports_ms": sorted(
+                ({"module": name, "ms": round(value * 1000, 2)} for name, value in self.imports),
+                key=lambda item: item["ms"],
+                reverse=True
+            ),
+        }
+
+    def dump(self):
+        if not self.enabled:
+            return
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError:
+            pass
+
+
+profile = StartupProfile(PROFILE_PATH)
+
+
+def process_age() -> Optional[float]:
+    return _process_age()
+
+
+def mark(name: str):
+    profile.mark(name)
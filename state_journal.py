@@ -0,0 +1,238 @@
+import base64
+import ctypes
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import backends
+
+# Registro de solo anexado: ultima configuracion aplicada y ultimo estado observado.
+COMPACT_AFTER = 200
+
+
+def default_path() -> str:
+    path = os.environ.get("MYHOTSPOT_STATE_FILE")
+    if path:
+        return path
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "MyHotspot", "state.jsonl")
+
+
+def _same_mechanism(journaled: Optional[str], forgotten: Optional[str]) -> bool:
+    # Eliminar con un metodo solo olvida la configuracion si comparten mecanismo
+    # (python y powershell usan la misma red hospedada).
+    if journaled == forgotten:
+        return True
+    mechanism = backends.MECHANISMS.get(journaled)
+    return mechanism is not None and mechanism == backends.MECHANISMS.get(forgotten)
+
+
+class _DATA_BLOB(ctypes.Structure):
+    _fields_ = [("cbData", ctypes.c_ulong), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+
+def _dpapi(data: bytes, protect: bool) -> Optional[bytes]:
+    # La contrasena solo se guarda cifrada con DPAPI (usuario actual de Windows).
+    if sys.platform != "win32":
+        return None
+    try:
+        buffer = ctypes.create_string_buffer(data, len(data))
+        blob_in = _DATA_BLOB(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+        blob_out = _DATA_BLOB()
+        function = ctypes.windll.crypt32.CryptProtectData if protect else ctypes.windll.crypt32.CryptUnprotectData
+        if not function(ctypes.byref(blob_in), None, None, None, None, 0, ctypes.byref(blob_out)):
+            return None
+        try:
+            return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+        finally:
+            ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+    except Exception:
+        return None
+
+
+def protect_password(password: str) -> str:
+    data = _dpapi(password.encode("utf-8"), protect=True)
+    return "dpapi:" + base64.b64encode(data).decode("ascii") if data else ""
+
+
+def unprotect_password(value: str) -> Optional[str]:
+    if not value.startswith("dpapi:"):
+        return None
+    data = _dpapi(base64.b64decode(value[6:]), protect=False)
+    return data.decode("utf-8") if data is not None else None
+
+
+@dataclass
+class JournalState:
+    method: str = ""
+    ssid: str = ""
+    password: Optional[str] = None
+    state: str = "Unknown"
+    clients: Optional[int] = None
+    max_clients: Optional[int] = None
+    # Momento (time.time) de la ultima configuracion aplicada y del ultimo estado.
+    configured_at: float = 0.0
+    observed_at: float = 0.0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.method and self.ssid)
+
+
+class StateJournal:
+    def __init__(self, path: str, compact_after: int = COMPACT_AFTER):
+        self.path = path
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._records = 0
+        self._config: Optional[dict] = None
+        self._last_state: Optional[dict] = None
+        self._loaded = False
+        self._torn = False
+
+    def _apply(self, record: dict):
+        if record.get("type") == "config":
+            self._config = record
+        elif record.get("type") == "forget":
+            if self._config is not None and _same_mechanism(self._config.get("method"), record.get("method")):
+                self._config = None
+        elif record.get("type") == "state":
+            self._last_state = record
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Ultima linea a medias tras un cierre brusco.
+                        self._torn = True
+                        continue
+                    self._torn = not line.endswith("\n")
+                    self._records += 1
+                    self._apply(record)
+        except OSError:
+            pass
+
+    def _append_locked(self, record: dict):
+        self._apply(record)
+        if self._torn:
+            # No se anexa detras de una linea rota: se reescribe el archivo.
+            self._compact_locked()
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._records += 1
+        except OSError:
+            return
+        if self._records > self.compact_after:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        # Se reescribe con lo unico que importa y se reemplaza de forma atomica.
+        records = [record for record in (self._config, self._last_state) if record is not None]
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self._records = len(records)
+            self._torn = False
+        except OSError:
+            pass
+
+    def load(self) -> JournalState:
+        with self._lock:
+            self._load_locked()
+            config, last = self._config, self._last_state
+
+        result = JournalState()
+        if config is not None:
+            result.method = config["method"]
+            result.ssid = config["ssid"]
+            result.password = unprotect_password(config.get("password", ""))
+            result.configured_at = config["t"]
+        if last is not None and (config is None or last["method"] == config["method"]):
+            result.method = result.method or last["method"]
+            result.state = last["state"]
+            result.clients = last.get("clients")
+            result.max_clients = last.get("max_clients")
+            result.observed_at = last["t"]
+        return result
+
+    def record_config(self, method: str, ssid: str, password: str):
+        with self._lock:
+            self._load_locked()
+            self._append_locked({
+                "type": "config", "t": time.time(), "method": method, "ssid": ssid,
+                "password": protect_password(password),
+            })
+
+    def record_state(self, method: str, state: str, clients: Optional[int] = None, max_clients: Optional[int] = None):
+        with self._lock:
+            self._load_locked()
+            last = self._last_state
+            if last is not None and (last["method"], last["state"], last.get("clients"), last.get("max_clients")) == (
+                method, state, clients, max_clients
+            ):
+                return
+            record = {"type": "state", "t": time.time(), "method": method, "state": state}
+            if clients is not None:
+                record["clients"] = clients
+            if max_clients is not None:
+                record["max_clients"] = max_clients
+            self._append_locked(record)
+
+    def forget(self, method: str):
+        with self._lock:
+            self._load_locked()
+            self._append_locked({"type": "forget", "t": time.time(), "method": method})
+
+
+_journal: Optional[StateJournal] = None
+_journal_lock = threading.Lock()
+
+
+def journal() -> StateJournal:
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = StateJournal(default_path())
+        return _journal
+
+
+def load() -> JournalState:
+    return journal().load()
+
+
+def record_config(method: str, ssid: str, password: str):
+    journal().record_config(method, ssid, password)
+
+
+def record_state(method: str, state: str, clients: Optional[int] = None, max_clients: Optional[int] = None):
+    journal().record_state(method, state, clients, max_clients)
+
+
+def record_applied(method: str, ssid: str, password: str):
+    # Hotspot encendido con esta configuracion.
+    record_config(method, ssid, password)
+    record_state(method, "On")
+
+
+def forget(method: str):
+    journal().forget(method)
@@ -0,0 +1,356 @@
+import ctypes
+import math
+import os
+import threading
+import time
+from array import array
+from typing import Callable, Optional
+
+SAMPLE_INTERVAL = float(os.environ.get("MYHOTSPOT_SAMPLE_INTERVAL", "1"))
+RING_SIZE = 120
+# Mayor avance que se acepta como desborde de un contador de 32 bits (256 MB por muestra).
+WRAP_LIMIT = 1 << 28
+
+HOTSPOT_DESCRIPTIONS = ("wi-fi direct virtual adapter", "hosted network virtual adapter")
+
+# Contadores: (bytes_rx, bytes_tx, paquetes_rx, paquetes_tx)
+Counters = tuple[int, int, int, int]
+
+
+def counter_delta(current: int, previous: int, bits: int) -> int:
+    delta = current - previous
+    if delta >= 0:
+        return delta
+    # Un desborde de 32 bits entre dos muestras deja un avance pequeno (menos de
+    # WRAP_LIMIT); cualquier otra bajada es un adaptador reiniciado y no suma nada.
+    if bits == 32 and delta + (1 << 32) < WRAP_LIMIT:
+        return delta + (1 << 32)
+    return 0
+
+
+class ProcNetDevSource:
+    counter_bits = 64
+
+    def __init__(self, interfaces: dict[str, str], path: str = "/proc/net/dev"):
+        self.interfaces = interfaces
+        self.path = path
+
+    def read(self) -> dict[str, Counters]:
+        by_name: dict[str, Counters] = {}
+        with open(self.path) as f:
+            for line in f.readlines()[2:]:
+                name, _, data = line.partition(":")
+                fields = data.split()
+                if len(fields) < 10:
+                    continue
+                by_name[name.strip()] = (int(fields[0]), int(fields[8]), int(fields[1]), int(fields[9]))
+
+        return {label: by_name[name] for label, name in self.interfaces.items() if name in by_name}
+
+
+class _MIB_IFROW(ctypes.Structure):
+    _fields_ = [
+        ("wszName", ctypes.c_wchar * 256),
+        ("dwIndex", ctypes.c_uint32),
+        ("dwType", ctypes.c_uint32),
+        ("dwMtu", ctypes.c_uint32),
+        ("dwSpeed", ctypes.c_uint32),
+        ("dwPhysAddrLen", ctypes.c_uint32),
+        ("bPhysAddr", ctypes.c_ubyte * 8),
+        ("dwAdminStatus", ctypes.c_uint32),
+        ("dwOperStatus", ctypes.c_uint32),
+        ("dwLastChange", ctypes.c_uint32),
+        ("dwInOctets", ctypes.c_uint32),
+        ("dwInUcastPkts", ctypes.c_uint32),
+        ("dwInNUcastPkts", ctypes.c_uint32),
+        ("dwInDiscards", ctypes.c_uint32),
+        ("dwInErrors", ctypes.c_uint32),
+        ("dwInUnknownProtos", ctypes.c_uint32),
+        ("dwOutOctets", ctypes.c_uint32),
+        ("dwOutUcastPkts", ctypes.c_uint32),
+        ("dwOutNUcastPkts", ctypes.c_uint32),
+        ("dwOutDiscards", ctypes.c_uint32),
+        ("dwOutErrors", ctypes.c_uint32),
+        ("dwOutQLen", ctypes.c_uint32),
+        ("dwDescrLen", ctypes.c_uint32),
+        ("bDescr", ctypes.c_ubyte * 256),
+    ]
+
+
+class WindowsIfTableSource:
+    # GetIfTable no lanza procesos. Sus contadores son de 32 bits: se calcula el delta de
+    # cada adaptador (dwIndex) con su propio desbordamiento y se acumula en totales de 64 bits.
+    counter_bits = 64
+
+    def __init__(self, upstream: Optional[str] = None):
+        self.upstream = upstream
+        # Adaptador de subida ya elegido: se mantiene mientras siga conectado.
+        self.upstream_index: Optional[int] = None
+        self._raw: dict[int, Counters] = {}
+        self._totals: dict[str, list[int]] = {}
+
+    def _rows(self) -> list[_MIB_IFROW]:
+        get_if_table = ctypes.windll.iphlpapi.GetIfTable
+        size = ctypes.c_ulong(0)
+        get_if_table(None, ctypes.byref(size), False)
+        buffer = ctypes.create_string_buffer(size.value)
+        if get_if_table(buffer, ctypes.byref(size), False) != 0:
+            return []
+
+        count = ctypes.c_uint32.from_buffer(buffer).value
+        offset = ctypes.sizeof(ctypes.c_uint32)
+        return [
+            _MIB_IFROW.from_buffer_copy(buffer, offset + i * ctypes.sizeof(_MIB_IFROW))
+            for i in range(count)
+        ]
+
+    def _accumulate(self, label: str, indexes: list[int], raw: dict[int, Counters], previous: dict[int, Counters]) -> Counters:
+        totals = self._totals.setdefault(label, [0, 0, 0, 0])
+        for index in indexes:
+            before = previous.get(index)
+            if before is None:
+                # Adaptador nuevo: su primera lectura solo sirve de referencia.
+                continue
+            for i in range(4):
+                totals[i] += counter_delta(raw[index][i], before[i], 32)
+        return tuple(totals)
+
+    def _pick_upstream(self, candidates: list[int], raw: dict[int, Counters]) -> Optional[int]:
+        if self.upstream_index in candidates:
+            return self.upstream_index
+        if not candidates:
+            self.upstream_index = None
+        elif self.upstream is not None:
+            self.upstream_index = candidates[0]
+        else:
+            self.upstream_index = max(candidates, key=lambda index: raw[index][0] + raw[index][1])
+        return self.upstream_index
+
+    def read(self) -> dict[str, Counters]:
+        raw: dict[int, Counters] = {}
+        hotspot: list[int] = []
+        candidates: list[int] = []
+
+        for row in self._rows():
+            descr = bytes(row.bDescr[:row.dwDescrLen]).rstrip(b"\0").decode("mbcs", "replace")
+            raw[row.dwIndex] = (
+                row.dwInOctets,
+                row.dwOutOctets,
+                (row.dwInUcastPkts + row.dwInNUcastPkts) & 0xFFFFFFFF,
+                (row.dwOutUcastPkts + row.dwOutNUcastPkts) & 0xFFFFFFFF,
+            )
+
+            if any(name in descr.lower() for name in HOTSPOT_DESCRIPTIONS):
+                hotspot.append(row.dwIndex)
+                continue
+
+            # 4/5 = MIB_IF_OPER_STATUS_CONNECTED/OPERATIONAL, 24 = loopback
+            if row.dwType == 24 or row.dwOperStatus not in (4, 5):
+                continue
+            if self.upstream is None or self.upstream.lower() in descr.lower():
+                candidates.append(row.dwIndex)
+
+        upstream = self._pick_upstream(candidates, raw)
+        previous, self._raw = self._raw, raw
+        result: dict[str, Counters] = {"hotspot": self._accumulate("hotspot", hotspot, raw, previous)}
+        if upstream is not None:
+            result["upstream"] = self._accumulate("upstream", [upstream], raw, previous)
+        return result
+
+
+class SyntheticSource:
+    counter_bits = 64
+
+    def __init__(self, rates_bps: dict[str, Callable[[float], float]], clock: Callable[[], float] = time.monotonic):
+        self.rates_bps = rates_bps
+        self.clock = clock
+        self._totals = {label: [0.0, 0.0] for label in rates_bps}
+        self._last = clock()
+
+    def read(self) -> dict[str, Counters]:
+        now = self.clock()
+        elapsed = now - self._last
+        self._last = now
+
+        result: dict[str, Counters] = {}
+        for label, rate in self.rates_bps.items():
+            totals = self._totals[label]
+            totals[0] += rate(now) / 8 * elapsed
+            totals[1] += rate(now) / 16 * elapsed
+            result[label] = (int(totals[0]), int(totals[1]), int(totals[0] / 1400), int(totals[1] / 1400))
+        return result
+
+
+def default_source():
+    if os.name == "nt":
+        return WindowsIfTableSource()
+
+    upstream = None
+    try:
+        with open("/proc/net/route") as f:
+            for line in f.readlines()[1:]:
+                fields = line.split()
+                if len(fields) > 1 and fields[1] == "00000000":
+                    upstream = fields[0]
+                    break
+    except OSError:
+        pass
+    return ProcNetDevSource({"upstream": upstream} if upstream else {})
+
+
+class RateRing:
+    # Valores en arrays de tamano fijo: no se crea un objeto por muestra.
+    def __init__(self, size: int = RING_SIZE):
+        self.size = size
+        self.timestamps = array("d", bytes(8 * size))
+        self.rx_bps = array("d", bytes(8 * size))
+        self.tx_bps = array("d", bytes(8 * size))
+        self.rx_pps = array("d", bytes(8 * size))
+        self.tx_pps = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def append(self, timestamp: float, rx_bps: float, tx_bps: float, rx_pps: float = 0.0, tx_pps: float = 0.0):
+        i = self.index
+        self.timestamps[i] = timestamp
+        self.rx_bps[i] = rx_bps
+        self.tx_bps[i] = tx_bps
+        self.rx_pps[i] = rx_pps
+        self.tx_pps[i] = tx_pps
+        self.index = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def last(self) -> tuple[float, float]:
+        if not self.count:
+            return 0.0, 0.0
+        i = (self.index - 1) % self.size
+        return self.rx_bps[i], self.tx_bps[i]
+
+    def last_pps(self) -> tuple[float, float]:
+        if not self.count:
+            return 0.0, 0.0
+        i = (self.index - 1) % self.size
+        return self.rx_pps[i], self.tx_pps[i]
+
+    def moving_average(self, window: int) -> tuple[float, float]:
+        window = min(window, self.count)
+        if not window:
+            return 0.0, 0.0
+        rx = tx = 0.0
+        for k in range(1, window + 1):
+            i = (self.index - k) % self.size
+            rx += self.rx_bps[i]
+            tx += self.tx_bps[i]
+        return rx / window, tx / window
+
+    def series(self) -> list[float]:
+        start = (self.index - self.count) % self.size
+        return [
+            self.rx_bps[(start + k) % self.size] + self.tx_bps[(start + k) % self.size]
+            for k in range(self.count)
+        ]
+
+
+class TrafficSampler:
+    def __init__(self, source=None, interval: float = SAMPLE_INTERVAL, size: int = RING_SIZE):
+        self.source = source if source is not None else default_source()
+        self.interval = interval
+        self.size = size
+        self.rings: dict[str, RateRing] = {}
+        self._previous: dict[str, tuple[float, Counters]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _delta(self, current: int, previous: int) -> int:
+        return counter_delta(current, previous, self.source.counter_bits)
+
+    def sample(self, now: Optional[float] = None) -> bool:
+        try:
+            counters = self.source.read()
+        except Exception:
+            return False
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            for label, values in counters.items():
+                previous = self._previous.get(label)
+                self._previous[label] = (now, values)
+                if previous is None or now <= previous[0]:
+                    continue
+
+                elapsed = now - previous[0]
+                ring = self.rings.get(label)
+                if ring is None:
+                    ring = self.rings[label] = RateRing(self.size)
+                ring.append(
+                    now,
+                    self._delta(values[0], previous[1][0]) * 8 / elapsed,
+                    self._delta(values[1], previous[1][1]) * 8 / elapsed,
+                    self._delta(values[2], previous[1][2]) / elapsed,
+                    self._delta(values[3], previous[1][3]) / elapsed,
+                )
+        return True
+
+    def current_mbps(self, label: str) -> float:
+        with self._lock:
+            ring = self.rings.get(label)
+            if ring is None:
+                return 0.0
+            rx, tx = ring.last()
+        return (rx + tx) / 1e6
+
+    def current_pps(self, label: str) -> float:
+        with self._lock:
+            ring = self.rings.get(label)
+            if ring is None:
+                return 0.0
+            rx, tx = ring.last_pps()
+        return rx + tx
+
+    def average_mbps(self, label: str, window: int = 10) -> float:
+        with self._lock:
+            ring = self.rings.get(label)
+            if ring is None:
+                return 0.0
+            rx, tx = ring.moving_average(window)
+        return (rx + tx) / 1e6
+
+    def series_mbps(self, label: str) -> list[float]:
+        with self._lock:
+            ring = self.rings.get(label)
+            if ring is None:
+                return []
+            return [value / 1e6 for value in ring.series()]
+
+    def labels(self) -> list[str]:
+        with self._lock:
+            return list(self.rings)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        # Se espera al hilo: si no, un start() inmediato dejaria dos hilos muestreando.
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        next_at = time.monotonic()
+        while not self._stop_event.is_set():
+            self.sample()
+            next_at += self.interval
+            self._stop_event.wait(max(0.0, next_at - time.monotonic()))
+
+
+def sine_rate(peak_bps: float, period: float = 20.0) -> Callable[[float], float]:
+    return lambda now: peak_bps * (0.5 + 0.5 * math.sin(2 * math.pi * now / period))
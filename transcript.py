@@ -0,0 +1,267 @@
+import argparse
+import builtins
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict
+from typing import Callable, Optional
+
+import environment
+import hostednetwork
+import log_sink
+
+# MYHOTSPOT_TRANSCRIPT_RECORD=ruta graba cada comando; MYHOTSPOT_TRANSCRIPT_REPLAY=ruta
+# responde con lo grabado sin ejecutar nada. MYHOTSPOT_TRANSCRIPT_SPEED=1 reproduce la
+# duracion original (0 = sin esperas, 2 = el doble de rapido).
+RECORD_PATH = os.environ.get("MYHOTSPOT_TRANSCRIPT_RECORD", "")
+REPLAY_PATH = os.environ.get("MYHOTSPOT_TRANSCRIPT_REPLAY", "")
+REPLAY_SPEED = float(os.environ.get("MYHOTSPOT_TRANSCRIPT_SPEED", "0"))
+
+KIND_COMMAND = "cmd"
+KIND_POWERSHELL = "powershell"
+
+
+_KEY_LINE = re.compile(
+    r"^(\s*(?:user security key|clave de seguridad de usuario)\s*:)[ \t]*(.*?)[ \t\r]*$", re.IGNORECASE | re.MULTILINE
+)
+
+
+class TranscriptMiss(LookupError):
+    pass
+
+
+class RecordedError(RuntimeError):
+    # Excepcion grabada cuyo tipo no se puede reconstruir al reproducir.
+    pass
+
+
+def _error_record(error: Exception) -> dict:
+    record = {"type": type(error).__name__, "message": log_sink.redact(str(error))}
+    if isinstance(error, subprocess.TimeoutExpired):
+        record["timeout"] = error.timeout
+    return record
+
+
+def _rebuild_error(command: str, record: dict) -> Exception:
+    name, message = record["type"], record["message"]
+    if name == "TimeoutExpired":
+        return subprocess.TimeoutExpired(command, record.get("timeout") or 0)
+    error_type = getattr(builtins, name, None)
+    if isinstance(error_type, type) and issubclass(error_type, Exception):
+        try:
+            return error_type(message)
+        except Exception:
+            pass
+    return RecordedError(f"{name}: {message}")
+
+
+def command_key(kind: str, command: str) -> str:
+    # Se calcula sobre el comando ya censurado: la grabacion no guarda contrasenas.
+    return hashlib.sha256(f"{kind}\0{log_sink.redact(command)}".encode("utf-8")).hexdigest()[:16]
+
+
+def _redact_output(text: str, salt: str) -> str:
+    # Como log_sink.redact, pero la clave de la Hosted Network queda como resumen con sal:
+    # asi hostednetwork.plan_apply elige la misma ruta al reproducir.
+    keys = [match.group(2).strip('"') for match in _KEY_LINE.finditer(text)]
+    redacted = log_sink.redact(text)
+    if not keys:
+        return redacted
+    remaining = iter(keys)
+
+    def digest(match: re.Match) -> str:
+        key = next(remaining, "")
+        return f"{match.group(1)} {hostednetwork.key_digest(key, salt) if key else ''}"
+
+    return _KEY_LINE.sub(digest, redacted)
+
+
+class Recorder:
+    def __init__(self, path: str, executor: Optional[Callable[[str, str], subprocess.CompletedProcess]] = None):
+        self.path = path
+        # executor(kind, comando) sustituye la ejecucion real (p. ej. un netsh simulado).
+        self.executor = executor
+        self.calls = 0
+        self._salt = os.urandom(8).hex()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._needs_header = self._file.tell() == 0
+
+    def _write(self, record: dict):
+        # Una linea por llamada y flush inmediato: sobrevive a un cierre brusco.
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def run(self, kind: str, command: str, execute: Callable[[], subprocess.CompletedProcess]) -> subprocess.CompletedProcess:
+        if self.executor is not None:
+            execute = lambda: self.executor(kind, command)
+        start = time.perf_counter()
+        try:
+            result = execute()
+        except Exception as e:
+            # Tambien se graban los fallos (p. ej. TimeoutExpired) para repetirlos al reproducir.
+            self._record(kind, command, None, time.perf_counter() - start, e)
+            raise
+        self._record(kind, command, result, time.perf_counter() - start)
+        return result
+
+    def _record(self, kind: str, command: str, result: Optional[subprocess.CompletedProcess], duration: float, error: Optional[Exception] = None):
+        record = {
+            "type": "call",
+            "kind": kind,
+            "key": command_key(kind, command),
+            "command": log_sink.redact(command),
+            "rc": result.returncode if result is not None else None,
+            "stdout": _redact_output(result.stdout or "", self._salt) if result is not None else "",
+            "stderr": _redact_output(result.stderr or "", self._salt) if result is not None else "",
+            "duration": round(duration, 4),
+        }
+        if error is not None:
+            record["error"] = _error_record(error)
+        with self._lock:
+            if self._needs_header:
+                self._needs_header = False
+                self._write({"type": "env", **_environment_record()})
+            self.calls += 1
+            self._write(record)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Player:
+    def __init__(self, path: str, speed: float = 0.0, sleep: Callable[[float], None] = time.sleep):
+        self.path = path
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self.environment: Optional[dict] = None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._responses: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["type"] == "env":
+                    self.environment = record
+                elif record["type"] == "call":
+                    self._responses.setdefault(record["key"], []).append(record)
+
+    def run(self, kind: str, command: str, execute: Callable[[], subprocess.CompletedProcess]) -> subprocess.CompletedProcess:
+        key = command_key(kind, command)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                self.misses += 1
+                raise TranscriptMiss(f"Comando no grabado en {os.path.basename(self.path)}: {log_sink.redact(command).strip()[:120]}")
+            # Las respuestas se sirven en el orden grabado; la ultima se repite.
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            record = responses[min(index, len(responses) - 1)]
+            self.served += 1
+
+        if self.speed > 0:
+            self._sleep(record["duration"] / self.speed)
+        if "error" in record:
+            raise _rebuild_error(command, record["error"])
+        return subprocess.CompletedProcess(command, record["rc"], record["stdout"], record["stderr"])
+
+    def rewind(self):
+        with self._lock:
+            self._cursor.clear()
+
+
+def _environment_record() -> dict:
+    record = asdict(environment.get_environment())
+    if record["wireless_adapters"] is not None:
+        record["wireless_adapters"] = list(record["wireless_adapters"])
+    return record
+
+
+def _recorded_environment(record: dict) -> environment.EnvironmentInfo:
+    fields = {key: value for key, value in record.items() if key != "type"}
+    if fields["wireless_adapters"] is not None:
+        fields["wireless_adapters"] = tuple(fields["wireless_adapters"])
+    return environment.EnvironmentInfo(**fields)
+
+
+_active: Optional[Recorder | Player] = None
+
+
+def start_recording(path: str, executor: Optional[Callable[[str, str], subprocess.CompletedProcess]] = None) -> Recorder:
+    global _active
+    stop()
+    _active = Recorder(path, executor)
+    return _active
+
+
+def start_replay(path: str, speed: float = REPLAY_SPEED) -> Player:
+    global _active
+    stop()
+    _active = Player(path, speed)
+    # Mismo entorno que el equipo grabado, para que se sigan las mismas ramas.
+    if _active.environment is not None:
+        environment.set_override(_recorded_environment(_active.environment))
+    return _active
+
+
+def stop():
+    global _active
+    active, _active = _active, None
+    if isinstance(active, Recorder):
+        active.close()
+    elif isinstance(active, Player):
+        environment.set_override(None)
+
+
+def replaying() -> bool:
+    return isinstance(_active, Player)
+
+
+def run(kind: str, command: str, execute: Callable[[], subprocess.CompletedProcess]) -> subprocess.CompletedProcess:
+    active = _active
+    if active is None:
+        return execute()
+    return active.run(kind, command, execute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Muestra una transcripcion grabada de MyHotspot")
+    parser.add_argument("file")
+    parser.add_argument("--output", action="store_true", help="Incluir stdout/stderr")
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["type"] == "env":
+                print(f"Entorno: {record['os_version']} (build {record['os_build']}), adaptadores: {', '.join(record['wireless_adapters'] or []) or 'ninguno'}")
+                continue
+            first_line = record["command"].strip().splitlines()[0] if record["command"].strip() else ""
+            outcome = f"error={record['error']['type']}" if "error" in record else f"rc={record['rc']}"
+            print(f"[{record['kind']}] {record['key']} {outcome} {record['duration'] * 1000:.0f} ms  {first_line[:100]}")
+            if args.output:
+                if "error" in record:
+                    print(f"    {record['error']['message']}")
+                for text in (record["stdout"], record["stderr"]):
+                    if text.strip():
+                        print("    " + text.strip().replace("\n", "\n    "))
+
+
+if RECORD_PATH:
+    start_recording(RECORD_PATH)
+elif REPLAY_PATH:
+    start_replay(REPLAY_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Optional
+
+BAND_AUTO = "auto"
+BAND_24 = "2.4"
+BAND_5 = "5"
+BAND_6 = "6"
+
+BANDS = [BAND_AUTO, BAND_24, BAND_5, BAND_6]
+# Banda de la subida Wi-Fi ("" = sin subida Wi-Fi o desconocida).
+UPSTREAM_BANDS = ["", BAND_24, BAND_5, BAND_6]
+# De la mas rapida a la mas lenta.
+FASTEST_FIRST = [BAND_6, BAND_5, BAND_24]
+
+# Valores de Windows.Networking.NetworkOperators.TetheringWiFiBand.
+WINRT_NAMES = {
+    BAND_AUTO: "Auto",
+    BAND_24: "TwoPointFourGigahertz",
+    BAND_5: "FiveGigahertz",
+    BAND_6: "SixGigahertz",
+}
+_FROM_WINRT = {name: band for band, name in WINRT_NAMES.items()}
+
+LABELS = {
+    BAND_AUTO: "Automatica",
+    BAND_24: "2.4 GHz",
+    BAND_5: "5 GHz",
+    BAND_6: "6 GHz",
+}
+
+
+@dataclass
+class BandChoice:
+    band: str
+    reason: str
+    ok: bool = True
+
+    def describe(self) -> str:
+        return f"{LABELS.get(self.band, self.band)} ({self.reason})"
+
+
+def from_winrt(name: str) -> str:
+    return _FROM_WINRT.get(name.strip(), "")
+
+
+def parse_bands(value: str) -> list[str]:
+    # "TwoPointFourGigahertz,FiveGigahertz" -> ["2.4", "5"]
+    return [band for band in (from_winrt(name) for name in value.split(",")) if band]
+
+
+def band_for_channel(channel: int) -> str:
+    # Los canales de 6 GHz se solapan en numero con los demas: solo sirve sin la linea "Banda".
+    if 1 <= channel <= 14:
+        return BAND_24
+    if 32 <= channel <= 177:
+        return BAND_5
+    return ""
+
+
+def parse_interfaces(text: str) -> tuple[str, Optional[int]]:
+    # Banda y canal de la conexion Wi-Fi actual segun "netsh wlan show interfaces".
+    band = ""
+    channel = None
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip().lower()
+        value = value.strip()
+        if key in ("channel", "canal") and value.isdigit() and channel is None:
+            channel = int(value)
+        elif key in ("band", "banda") and not band:
+            number = value.split()[0].replace(",", ".") if value else ""
+            if number in (BAND_24, BAND_5, BAND_6):
+                band = number
+    if not band and channel is not None:
+        band = band_for_channel(channel)
+    return band, channel
+
+
+def choose_band(requested: str, supported: list[str], upstream_band: str = "", upstream_channel: Optional[int] = None) -> BandChoice:
+    if requested != BAND_AUTO:
+        if supported and requested not in supported:
+            available = ", ".join(LABELS[band] for band in supported)
+            return BandChoice(requested, f"el adaptador no la admite; admitidas: {available}", ok=False)
+        if upstream_band and upstream_band != requested:
+            return BandChoice(requested, f"elegida por el usuario; la subida Wi-Fi va por {LABELS[upstream_band]} y algunos adaptadores no pueden usar dos bandas a la vez")
+        return BandChoice(requested, "elegida por el usuario")
+
+    if not supported:
+        return BandChoice(BAND_AUTO, "Windows no informa las bandas admitidas; la elige el sistema")
+
+    if upstream_band:
+        # Con una sola radio el hotspot tiene que ir en la misma banda (y canal) que la subida.
+        where = f"canal {upstream_channel}" if upstream_channel is not None else LABELS[upstream_band]
+        if upstream_band in supported:
+            return BandChoice(upstream_band, f"misma banda que la conexion Wi-Fi de subida, {where}")
+        fastest = next(band for band in FASTEST_FIRST if band in supported)
+        return BandChoice(fastest, f"el hotspot no admite la banda de la subida Wi-Fi ({where}); la mas rapida admitida")
+
+    fastest = next(band for band in FASTEST_FIRST if band in supported)
+    return BandChoice(fastest, "la mas rapida admitida por el adaptador (subida sin Wi-Fi)")